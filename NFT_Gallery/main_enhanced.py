@@ -91,6 +91,13 @@ Examples:
         help="Firestore database name (defaults to FIRESTORE_DATABASE env var or 'develop')"
     )
     
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=int(os.getenv("FIRESTORE_POOL_SIZE", "4")),
+        help="Number of pooled Firestore clients (defaults to FIRESTORE_POOL_SIZE env var or 4)"
+    )
+    
     parser.add_argument(
         "--firestore-only",
         action="store_true",
@@ -428,7 +435,8 @@ def main():
             args.wallet, 
             args.output,
             args.project_id,
-            args.database
+            args.database,
+            args.pool_size
         )
         
         # Validate wallet address
@@ -0,0 +1,236 @@
+"""
+Asyncio Helius API client for concurrent DAS (Digital Asset Standard) calls.
+"""
+import asyncio
+import itertools
+from typing import Dict, List, Optional, Any
+
+import aiohttp
+import orjson
+
+from .helius_api import HeliusAPIClient, HeliusAPIError
+
+
+class AsyncHeliusAPIClient:
+    """
+    Asyncio counterpart of HeliusAPIClient.
+    
+    Requests share one aiohttp connection pool, so fan-out helpers such as
+    gather_metadata keep up to LIMIT_PER_HOST calls in flight at once.
+    Validation and error mapping are shared with the synchronous client.
+    """
+    
+    BASE_URL = HeliusAPIClient.BASE_URL
+    DEFAULT_TIMEOUT = HeliusAPIClient.DEFAULT_TIMEOUT
+    DEFAULT_HEADERS = HeliusAPIClient.DEFAULT_HEADERS
+    
+    # Concurrent connections to the RPC host and how long idle ones are kept
+    LIMIT_PER_HOST = 64
+    KEEPALIVE_TIMEOUT = 60
+    
+    def __init__(self, api_key: str, timeout: int = DEFAULT_TIMEOUT):
+        """
+        Initialize async Helius API client.
+        
+        Args:
+            api_key: Helius API key
+            timeout: Request timeout in seconds
+            
+        Raises:
+            HeliusAPIError: If API key is invalid
+        """
+        if not api_key or not isinstance(api_key, str):
+            raise HeliusAPIError("API key must be a non-empty string")
+        
+        self.api_key = api_key
+        self.timeout = timeout
+        self._url = f"{self.BASE_URL}/?api-key={api_key}"
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._id_counter = itertools.count(1)
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the HTTP session, creating it on first use inside the running event loop."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=self.LIMIT_PER_HOST,
+                    keepalive_timeout=self.KEEPALIVE_TIMEOUT
+                ),
+                headers=self.DEFAULT_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the HTTP session and release its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def __aenter__(self) -> "AsyncHeliusAPIClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+    
+    async def _make_request(self, method: str, params: Any) -> Dict[str, Any]:
+        """
+        Make JSON-RPC 2.0 request to Helius DAS API.
+        
+        Args:
+            method: JSON-RPC method name
+            params: Method parameters
+            
+        Returns:
+            API response as dictionary
+            
+        Raises:
+            HeliusAPIError: If request fails
+        """
+        payload = {
+            "jsonrpc": "2.0",
+            "id": next(self._id_counter),
+            "method": method,
+            "params": params
+        }
+        
+        try:
+            async with self._get_session().post(self._url, data=orjson.dumps(payload)) as response:
+                if response.status >= 400:
+                    text = await response.text()
+                    raise HeliusAPIClient._http_error(response.status, text, response.headers, response.reason)
+                result = orjson.loads(await response.read())
+        except asyncio.TimeoutError:
+            raise HeliusAPIError(f"Request timeout after {self.timeout} seconds")
+        except aiohttp.ClientConnectionError:
+            raise HeliusAPIError("Connection error - check network connectivity")
+        except orjson.JSONDecodeError:
+            raise HeliusAPIError("Invalid JSON response from API")
+        except aiohttp.ClientError as e:
+            raise HeliusAPIError(f"Request failed: {str(e)}")
+        
+        HeliusAPIClient._check_rpc_error(result)
+        return result.get("result", {})
+    
+    async def get_nfts_by_owner(self, wallet_address: str) -> Dict[str, Any]:
+        """
+        Get all NFTs owned by a Solana wallet address using DAS API.
+        
+        Args:
+            wallet_address: Solana wallet address
+            
+        Returns:
+            NFT data from API
+            
+        Raises:
+            HeliusAPIError: If request fails or wallet is invalid
+        """
+        if not wallet_address or not isinstance(wallet_address, str):
+            raise HeliusAPIError("Wallet address must be a non-empty string")
+        
+        if not HeliusAPIClient._is_valid_solana_address(wallet_address):
+            raise HeliusAPIError(f"Invalid Solana wallet address format: {wallet_address}")
+        
+        return await self._make_request("getAssetsByOwner", HeliusAPIClient._owner_assets_params(wallet_address))
+    
+    async def get_nft_metadata(self, asset_id: str) -> Dict[str, Any]:
+        """
+        Get metadata for a specific NFT using DAS API.
+        
+        Args:
+            asset_id: NFT asset ID (mint address)
+            
+        Returns:
+            NFT metadata from API
+            
+        Raises:
+            HeliusAPIError: If request fails
+        """
+        if not asset_id or not isinstance(asset_id, str):
+            raise HeliusAPIError("Asset ID must be a non-empty string")
+        
+        if not HeliusAPIClient._is_valid_solana_address(asset_id):
+            raise HeliusAPIError(f"Invalid asset ID format: {asset_id}")
+        
+        return await self._make_request("getAsset", {"id": asset_id})
+    
+    async def gather_metadata(self, asset_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch metadata for many assets concurrently.
+        
+        Args:
+            asset_ids: NFT asset IDs (mint addresses)
+            
+        Returns:
+            Dictionary mapping asset ID to its metadata
+            
+        Raises:
+            HeliusAPIError: If any request fails
+        """
+        results = await asyncio.gather(*(self.get_nft_metadata(asset_id) for asset_id in asset_ids))
+        return dict(zip(asset_ids, results))
+    
+    async def search_assets(self, owner_address: str, compressed: bool = False, page: int = 1,
+                            limit: int = 1000) -> Dict[str, Any]:
+        """
+        Search for assets owned by an address with pagination support.
+        
+        Args:
+            owner_address: Owner wallet address
+            compressed: Whether to include compressed NFTs
+            page: Page number for pagination
+            limit: Number of results per page
+            
+        Returns:
+            Search results from API
+            
+        Raises:
+            HeliusAPIError: If request fails
+        """
+        if not owner_address or not isinstance(owner_address, str):
+            raise HeliusAPIError("Owner address must be a non-empty string")
+        
+        if not HeliusAPIClient._is_valid_solana_address(owner_address):
+            raise HeliusAPIError(f"Invalid owner address format: {owner_address}")
+        
+        params = {
+            "ownerAddress": owner_address,
+            "page": page,
+            "limit": limit
+        }
+        
+        return await self._make_request("searchAssets", params)
+    
+    async def get_wallet_balance(self, wallet_address: str) -> Dict[str, Any]:
+        """
+        Get Solana wallet balance using RPC endpoint.
+        
+        Args:
+            wallet_address: Wallet address
+            
+        Returns:
+            Balance data from API
+            
+        Raises:
+            HeliusAPIError: If request fails
+        """
+        if not wallet_address:
+            raise HeliusAPIError("Wallet address is required")
+        
+        if not HeliusAPIClient._is_valid_solana_address(wallet_address):
+            raise HeliusAPIError(f"Invalid wallet address format: {wallet_address}")
+        
+        return await self._make_request("getBalance", [wallet_address])
+    
+    async def check_api_connectivity(self) -> bool:
+        """
+        Check if Helius API is accessible.
+        
+        Returns:
+            True if accessible, False otherwise
+        """
+        try:
+            await self._make_request("getSlot", [])
+            return True
+        except Exception:
+            return False
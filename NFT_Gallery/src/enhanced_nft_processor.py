@@ -19,7 +19,8 @@ class EnhancedNFTProcessor:
     """Enhanced processor that uses Firestore as a middle layer between Helius and local storage."""
     
     def __init__(self, wallet_address: str, output_dir: str = "~/Pictures/NFTs", 
-                 project_id: Optional[str] = None, database_name: Optional[str] = None):
+                 project_id: Optional[str] = None, database_name: Optional[str] = None,
+                 pool_size: Optional[int] = None):
         """
         Initialize enhanced NFT processor.
         
@@ -28,6 +29,7 @@ class EnhancedNFTProcessor:
             output_dir: Directory to store NFT images
             project_id: Google Cloud project ID for Firestore
             database_name: Firestore database name (defaults to FIRESTORE_DATABASE env var or "develop")
+            pool_size: Number of pooled Firestore clients (defaults to FIRESTORE_POOL_SIZE env var or 4)
             
         Raises:
             EnhancedNFTProcessorError: If initialization fails
@@ -46,7 +48,8 @@ class EnhancedNFTProcessor:
             
             # Get database name from parameter, environment, or use default
             db_name = database_name or os.getenv("FIRESTORE_DATABASE", "develop")
-            self.firestore_manager = FirestoreManager(project_id, db_name)
+            pool_size = pool_size or int(os.getenv("FIRESTORE_POOL_SIZE", "4"))
+            self.firestore_manager = FirestoreManager(project_id, db_name, pool_size=pool_size)
             self.file_manager = FileManager(output_dir)
         except (HeliusAPIError, FirestoreManagerError, FileManagerError) as e:
             raise EnhancedNFTProcessorError(f"Failed to initialize enhanced NFT processor: {str(e)}")
@@ -108,23 +111,14 @@ class EnhancedNFTProcessor:
             if sync_results['failed'] > 0:
                 self.logger.warning(f"Some NFTs failed to sync to Firestore: {sync_results['failed']}")
             
-            # Get NFTs from Firestore
-            nfts_from_firestore = self.firestore_manager.get_nfts_by_wallet(self.wallet_address)
-            
-            if not nfts_from_firestore:
-                self.logger.warning("No NFTs found in Firestore for this wallet")
-                return {
-                    "total_nfts": 0,
-                    "synced_to_firestore": 0,
-                    "downloaded": 0,
-                    "skipped": 0,
-                    "failed": 0,
-                    "errors": []
-                }
+            # Stream NFTs from Firestore, projecting only the fields used for downloads
+            nfts_from_firestore = self.firestore_manager.get_nfts_by_wallet(
+                self.wallet_address, fields=["asset_id", "name", "image_url"]
+            )
             
-            # Process each NFT for local download
+            # Process each NFT for local download as it arrives
             results = {
-                "total_nfts": len(nfts_from_firestore),
+                "total_nfts": 0,
                 "synced_to_firestore": sync_results['stored'],
                 "downloaded": 0,
                 "skipped": 0,
@@ -132,19 +126,26 @@ class EnhancedNFTProcessor:
                 "errors": []
             }
             
-            if download_images:
-                for nft in nfts_from_firestore:
-                    try:
-                        success = self._process_single_nft_from_firestore(nft)
-                        if success:
-                            results["downloaded"] += 1
-                        else:
-                            results["skipped"] += 1
-                    except Exception as e:
-                        results["failed"] += 1
-                        error_msg = f"Failed to process NFT {nft.get('asset_id', 'unknown')}: {str(e)}"
-                        results["errors"].append(error_msg)
-                        self.logger.error(error_msg)
+            for nft in nfts_from_firestore:
+                results["total_nfts"] += 1
+                if not download_images:
+                    continue
+                try:
+                    success = self._process_single_nft_from_firestore(nft)
+                    if success:
+                        results["downloaded"] += 1
+                    else:
+                        results["skipped"] += 1
+                except Exception as e:
+                    results["failed"] += 1
+                    error_msg = f"Failed to process NFT {nft.get('asset_id', 'unknown')}: {str(e)}"
+                    results["errors"].append(error_msg)
+                    self.logger.error(error_msg)
+            
+            if results["total_nfts"] == 0:
+                self.logger.warning("No NFTs found in Firestore for this wallet")
+                results["synced_to_firestore"] = 0
+                return results
             
             self.logger.info(f"Processing complete: {results['downloaded']} downloaded, {results['skipped']} skipped, {results['failed']} failed")
             return results
@@ -181,12 +182,12 @@ class EnhancedNFTProcessor:
             List of matching NFTs
         """
         try:
-            return self.firestore_manager.search_nfts(
+            return list(self.firestore_manager.search_nfts(
                 wallet_address=self.wallet_address,
                 collection_name=collection_name,
                 compressed=compressed,
                 limit=limit
-            )
+            ))
         except Exception as e:
             self.logger.error(f"Failed to search NFTs in Firestore: {str(e)}")
             return []
@@ -1,8 +1,10 @@
 """
 Local file system operations for NFT image management.
 """
+import asyncio
 import os
 import shutil
+import aiohttp
 import requests
 from pathlib import Path
 from typing import Optional, List, Tuple
@@ -18,6 +20,35 @@ class FileManagerError(Exception):
 class FileManager:
     """Manages local file operations for NFT images."""
     
+    DOWNLOAD_TIMEOUT = 30
+    # Large stream chunks keep per-chunk allocations and write calls low for big images
+    DOWNLOAD_CHUNK_SIZE = 256 * 1024
+    DOWNLOAD_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    
+    # Content types accepted without sniffing the body
+    ALLOWED_CONTENT_TYPES = (
+        'image/',  # Standard image types
+        'application/octet-stream',  # Some servers send this for images
+        'text/html',  # Some image URLs redirect to HTML pages
+        'application/json',  # Some servers send JSON with image data
+        'text/plain',  # Some servers send plain text
+        'binary/octet-stream'  # Generic binary data
+    )
+    IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.bmp', '.tiff', '.ico')
+    IMAGE_SIGNATURES = (b'\xff\xd8\xff', b'\x89PNG', b'GIF8', b'RIFF')
+    
+    # IPFS gateway URL prefixes tried for ipfs:// URLs, and the alternatives to nftstorage.link
+    IPFS_GATEWAYS = (
+        'https://ipfs.io/ipfs/',
+        'https://cloudflare-ipfs.com/ipfs/',
+        'https://gateway.pinata.cloud/ipfs/',
+        'https://dweb.link/ipfs/',
+        'https://nftstorage.link/ipfs/'
+    )
+    NFTSTORAGE_FALLBACK_GATEWAYS = IPFS_GATEWAYS[:4]
+    
     def __init__(self, output_dir: str = "~/Pictures/SolanaNFTs"):
         """
         Initialize file manager.
@@ -153,15 +184,11 @@ class FileManager:
             for attempt in range(max_retries):
                 try:
                     # Download image with more flexible settings
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                    }
-                    
                     response = requests.get(
                         url_to_try, 
                         stream=True, 
-                        timeout=30,
-                        headers=headers,
+                        timeout=self.DOWNLOAD_TIMEOUT,
+                        headers=self.DOWNLOAD_HEADERS,
                         allow_redirects=True,
                         verify=False  # Disable SSL verification for problematic sites
                     )
@@ -170,46 +197,27 @@ class FileManager:
                     # Check content type - be more flexible
                     content_type = response.headers.get('content-type', '').lower()
                     
-                    # Allow common image types and some edge cases
-                    allowed_types = [
-                        'image/',  # Standard image types
-                        'application/octet-stream',  # Some servers send this for images
-                        'text/html',  # Some image URLs redirect to HTML pages
-                        'application/json',  # Some servers send JSON with image data
-                        'text/plain',  # Some servers send plain text
-                        'binary/octet-stream'  # Generic binary data
-                    ]
-                    
-                    is_allowed_type = any(content_type.startswith(t) for t in allowed_types)
-                    
                     # Additional check: if content type is not clearly an image, check the URL and content
-                    if not is_allowed_type:
-                        # Check if URL has image extension
-                        url_lower = url_to_try.lower()
-                        image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.bmp', '.tiff', '.ico']
-                        has_image_extension = any(ext in url_lower for ext in image_extensions)
+                    if not self._is_expected_content(content_type, url_to_try):
+                        # For JSON responses, try to extract image URL from the JSON
+                        if content_type.startswith('application/json'):
+                            try:
+                                json_data = response.json()
+                                # Look for common image URL fields in JSON
+                                image_url = self._extract_image_from_json(json_data)
+                                if image_url:
+                                    # Recursively try to download from the extracted URL
+                                    return self.download_image(image_url, filename, max_retries - 1)
+                            except (ValueError, KeyError):
+                                pass
                         
-                        if not has_image_extension:
-                            # For JSON responses, try to extract image URL from the JSON
-                            if content_type.startswith('application/json'):
-                                try:
-                                    json_data = response.json()
-                                    # Look for common image URL fields in JSON
-                                    image_url = self._extract_image_from_json(json_data)
-                                    if image_url:
-                                        # Recursively try to download from the extracted URL
-                                        return self.download_image(image_url, filename, max_retries - 1)
-                                except (ValueError, KeyError):
-                                    pass
-                            
-                            # If we still can't determine it's an image, check the first few bytes
-                            content = response.content[:10]
-                            if not any(magic in content for magic in [b'\xff\xd8\xff', b'\x89PNG', b'GIF8', b'RIFF']):
-                                raise FileManagerError(f"URL does not point to an image: {content_type}")
+                        # If we still can't determine it's an image, check the first few bytes
+                        if not self._has_image_signature(response.content[:10]):
+                            raise FileManagerError(f"URL does not point to an image: {content_type}")
                     
                     # Save file
                     with open(file_path, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
+                        for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
                             f.write(chunk)
                     
                     # Verify the file was actually saved and has content
@@ -233,6 +241,126 @@ class FileManager:
         
         return False
     
+    async def download_image_async(self, session: aiohttp.ClientSession, url: str, filename: str,
+                                   max_retries: int = 3) -> bool:
+        """
+        Download image from URL on an aiohttp session and save to output directory.
+        
+        Uses the same gateway fallbacks, content checks and retry rules as
+        download_image, so many downloads can share one connection pool.
+        Unlike download_image, a JSON response is not searched for an image
+        URL to follow. File writes run in worker threads to keep the event
+        loop free.
+        
+        Args:
+            session: HTTP session to download with
+            url: Image URL to download
+            filename: Target filename
+            max_retries: Maximum number of retry attempts
+            
+        Returns:
+            True if download successful, False otherwise
+            
+        Raises:
+            FileManagerError: If download fails
+        """
+        if not url or not filename:
+            raise FileManagerError("URL and filename are required")
+        
+        file_path = self.output_dir / filename
+        
+        # Handle problematic domains and get alternative URLs
+        fixed_url = self._handle_problematic_domains(url)
+        urls_to_try = [fixed_url] if isinstance(fixed_url, str) else fixed_url
+        
+        for url_to_try in urls_to_try:
+            for attempt in range(max_retries):
+                try:
+                    async with session.get(
+                        url_to_try,
+                        timeout=aiohttp.ClientTimeout(total=self.DOWNLOAD_TIMEOUT),
+                        headers=self.DOWNLOAD_HEADERS,
+                        ssl=False  # Disable SSL verification for problematic sites
+                    ) as response:
+                        response.raise_for_status()
+                        
+                        content_type = response.headers.get('content-type', '').lower()
+                        
+                        body = None
+                        if not self._is_expected_content(content_type, url_to_try):
+                            # Sniffing needs the body, so read it whole instead of streaming
+                            body = await response.read()
+                            if not self._has_image_signature(body[:10]):
+                                raise FileManagerError(f"URL does not point to an image: {content_type}")
+                        
+                        # Save file, keeping blocking disk I/O off the event loop
+                        f = await asyncio.to_thread(open, file_path, 'wb')
+                        try:
+                            if body is not None:
+                                await asyncio.to_thread(f.write, body)
+                            else:
+                                async for chunk in response.content.iter_chunked(self.DOWNLOAD_CHUNK_SIZE):
+                                    await asyncio.to_thread(f.write, chunk)
+                        finally:
+                            await asyncio.to_thread(f.close)
+                    
+                    # Verify the file was actually saved and has content
+                    if file_path.stat().st_size == 0:
+                        raise FileManagerError("Downloaded file is empty")
+                    
+                    return True
+                    
+                except asyncio.TimeoutError:
+                    # aiohttp raises a bare TimeoutError whose message is empty
+                    if attempt < max_retries - 1:
+                        continue
+                    else:
+                        raise FileManagerError(
+                            f"Failed to download image from {url_to_try}: timeout after {self.DOWNLOAD_TIMEOUT}s"
+                        )
+                except aiohttp.ClientError as e:
+                    if attempt < max_retries - 1 and self._should_retry_error(e):
+                        continue
+                    else:
+                        raise FileManagerError(f"Failed to download image from {url_to_try}: {str(e)}")
+                except IOError as e:
+                    raise FileManagerError(f"Failed to save image to {file_path}: {str(e)}")
+                except Exception as e:
+                    if attempt < max_retries - 1 and self._should_retry_error(e):
+                        continue
+                    else:
+                        raise FileManagerError(f"Unexpected error downloading image: {str(e)}")
+        
+        return False
+    
+    def _is_expected_content(self, content_type: str, url: str) -> bool:
+        """
+        Check whether a response can be saved without sniffing its bytes.
+        
+        Args:
+            content_type: Lowercased Content-Type header
+            url: URL the response came from
+            
+        Returns:
+            True if the content type is allowed or the URL has an image extension
+        """
+        if content_type.startswith(self.ALLOWED_CONTENT_TYPES):
+            return True
+        url_lower = url.lower()
+        return any(ext in url_lower for ext in self.IMAGE_EXTENSIONS)
+    
+    def _has_image_signature(self, head: bytes) -> bool:
+        """
+        Check the leading bytes of a response for a known image signature.
+        
+        Args:
+            head: First bytes of the response body
+            
+        Returns:
+            True if a JPEG, PNG, GIF or RIFF (WebP) signature is present
+        """
+        return any(magic in head for magic in self.IMAGE_SIGNATURES)
+    
     def _extract_image_from_json(self, json_data: dict) -> str:
         """
         Extract image URL from JSON response.
@@ -403,30 +531,19 @@ class FileManager:
             if 'ipfs/' in url:
                 # Extract IPFS hash and try different gateways
                 ipfs_hash = url.split('ipfs/')[-1].split('/')[0]
-                gateways = [
-                    f'https://ipfs.io/ipfs/{ipfs_hash}',
-                    f'https://cloudflare-ipfs.com/ipfs/{ipfs_hash}',
-                    f'https://gateway.pinata.cloud/ipfs/{ipfs_hash}',
-                    f'https://dweb.link/ipfs/{ipfs_hash}'
-                ]
+                gateways = [gateway + ipfs_hash for gateway in self.NFTSTORAGE_FALLBACK_GATEWAYS]
                 return gateways  # Return list for retry attempts
         
         # Handle IPFS protocol URLs
         if url.startswith('ipfs://'):
-            ipfs_hash = url.replace('ipfs://', '')
+            ipfs_hash = url[7:]
             # Try multiple IPFS gateways
-            gateways = [
-                f'https://ipfs.io/ipfs/{ipfs_hash}',
-                f'https://cloudflare-ipfs.com/ipfs/{ipfs_hash}',
-                f'https://gateway.pinata.cloud/ipfs/{ipfs_hash}',
-                f'https://dweb.link/ipfs/{ipfs_hash}',
-                f'https://nftstorage.link/ipfs/{ipfs_hash}'
-            ]
+            gateways = [gateway + ipfs_hash for gateway in self.IPFS_GATEWAYS]
             return gateways  # Return list for retry attempts
         
         # Handle Arweave protocol URLs
         if url.startswith('ar://'):
-            ar_hash = url.replace('ar://', '')
+            ar_hash = url[5:]
             return f'https://arweave.net/{ar_hash}'
         
         return url
@@ -4,7 +4,7 @@ Firestore Image Downloader - Downloads images from Firestore documents and updat
 import os
 import logging
 import time
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, Optional, Any, Tuple
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Semaphore
@@ -67,19 +67,13 @@ class FirestoreImageDownloader:
             self.logger.info(f"Starting download of pending images for wallet: {wallet_address or 'all'}")
             self._reset_stats()
             
-            # Get pending documents
+            # Stream pending documents straight into the download workers
             pending_docs = self.firestore_manager.get_nfts_by_download_status(
                 "pending", wallet_address, batch_size
             )
             
-            if not pending_docs:
+            if not self._process_download_batch(pending_docs):
                 self.logger.info("No pending downloads found")
-                return self._get_results_summary()
-            
-            self.logger.info(f"Found {len(pending_docs)} pending downloads")
-            
-            # Process downloads
-            self._process_download_batch(pending_docs)
             
             return self._get_results_summary()
             
@@ -102,12 +96,13 @@ class FirestoreImageDownloader:
             self.logger.info(f"Starting download for wallet {wallet_address} with status filter: {status_filter}")
             self._reset_stats()
             
-            # Get documents by status for specific wallet
+            # Stream documents by status for specific wallet into the download workers
             docs = self.firestore_manager.get_nfts_by_download_status(
                 status_filter, wallet_address, 1000
             )
+            processed = self._process_download_batch(docs)
             
-            if not docs:
+            if not processed:
                 self.logger.info(f"No documents found for wallet {wallet_address} with status {status_filter}")
                 self.logger.info("Trying to download from all available documents...")
                 
@@ -115,17 +110,15 @@ class FirestoreImageDownloader:
                 docs = self.firestore_manager.get_nfts_by_download_status(
                     status_filter, None, 1000
                 )
+                processed = self._process_download_batch(docs)
                 
-                if not docs:
+                if not processed:
                     self.logger.info(f"No documents found with status {status_filter} in any wallet")
                     return self._get_results_summary()
                 
-                self.logger.info(f"Found {len(docs)} documents from all wallets to process")
+                self.logger.info(f"Processed {processed} documents from all wallets")
             else:
-                self.logger.info(f"Found {len(docs)} documents for wallet {wallet_address} to process")
-            
-            # Process downloads
-            self._process_download_batch(docs)
+                self.logger.info(f"Processed {processed} documents for wallet {wallet_address}")
             
             return self._get_results_summary()
             
@@ -149,9 +142,9 @@ class FirestoreImageDownloader:
             self._reset_stats()
             
             # Get failed documents
-            failed_docs = self.firestore_manager.get_nfts_by_download_status(
+            failed_docs = list(self.firestore_manager.get_nfts_by_download_status(
                 "failed", wallet_address, 1000
-            )
+            ))
             
             if not failed_docs:
                 self.logger.info("No failed downloads found to retry")
@@ -228,22 +221,27 @@ class FirestoreImageDownloader:
             self.logger.error(f"Failed to get download progress: {str(e)}")
             return {}
     
-    def _process_download_batch(self, docs: List[Dict[str, Any]]) -> None:
+    def _process_download_batch(self, docs: Iterable[Dict[str, Any]]) -> int:
         """
         Process a batch of documents for download.
         
+        Downloads start as soon as each document arrives, so a streamed query
+        overlaps with the downloads it feeds.
+        
         Args:
-            docs: List of NFT documents to process
+            docs: NFT documents to process
+            
+        Returns:
+            Number of documents submitted for download
         """
-        self.stats["total_processed"] = len(docs)
-        
         # Use ThreadPoolExecutor for concurrent downloads
         with ThreadPoolExecutor(max_workers=self.max_concurrent_downloads) as executor:
             # Submit download tasks
-            future_to_doc = {
-                executor.submit(self._download_single_nft, doc): doc 
-                for doc in docs
-            }
+            future_to_doc = {}
+            for doc in docs:
+                future_to_doc[executor.submit(self._download_single_nft, doc)] = doc
+            
+            self.stats["total_processed"] = len(future_to_doc)
             
             # Process completed downloads
             for future in as_completed(future_to_doc):
@@ -257,6 +255,8 @@ class FirestoreImageDownloader:
                 except Exception as e:
                     self.logger.error(f"Download failed for {doc.get('asset_id', 'unknown')}: {str(e)}")
                     self.stats["failed_downloads"] += 1
+        
+        return len(future_to_doc)
     
     def _download_single_nft(self, nft_data: Dict[str, Any]) -> bool:
         """
@@ -2,13 +2,26 @@
 Firestore manager for storing and managing NFT data from Helius API.
 """
 import os
+import asyncio
+import copy
 import logging
-from typing import Dict, List, Optional, Any, Union
+import functools
+import gzip
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple, Union
 from datetime import datetime, timezone
 import json
+import orjson
+from google.api_core import exceptions as google_exceptions
+from google.api_core.retry import AsyncRetry, Retry, if_exception_type
 from google.cloud import firestore
 from google.cloud.firestore_v1.base_document import DocumentSnapshot
 from google.cloud.firestore_v1.base_query import FieldFilter
+from google.cloud.firestore_v1.services.firestore import client as firestore_client
 
 
 class FirestoreManagerError(Exception):
@@ -16,10 +29,245 @@ class FirestoreManagerError(Exception):
     pass
 
 
+# Retry batch commits on transient contention and availability errors
+COMMIT_RETRY = Retry(
+    predicate=if_exception_type(
+        google_exceptions.Aborted,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.ServiceUnavailable
+    ),
+    initial=0.5,
+    maximum=10.0,
+    multiplier=2.0
+)
+
+# Same policy for commits made through the async client
+ASYNC_COMMIT_RETRY = AsyncRetry(
+    predicate=if_exception_type(
+        google_exceptions.Aborted,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.ServiceUnavailable
+    ),
+    initial=0.5,
+    maximum=10.0,
+    multiplier=2.0
+)
+
+
+def decode_raw_data(raw_data: Union[bytes, Dict[str, Any], None]) -> Dict[str, Any]:
+    """
+    Decode a stored raw Helius payload.
+    
+    Args:
+        raw_data: Stored payload (gzip-compressed or plain JSON bytes, or a dict for legacy documents)
+        
+    Returns:
+        Raw Helius data as a dictionary
+    """
+    if raw_data is None:
+        return {}
+    if isinstance(raw_data, (bytes, bytearray)):
+        if raw_data[:2] == b"\x1f\x8b":
+            raw_data = gzip.decompress(raw_data)
+        return orjson.loads(raw_data)
+    return raw_data
+
+
+# Transports accepted by get_firestore_client
+FIRESTORE_TRANSPORTS = ("grpc", "rest")
+
+
+class RestFirestoreClient(firestore.Client):
+    """
+    Firestore client that talks to the REST API instead of opening a gRPC channel.
+    
+    Suited to short-lived processes doing a handful of reads, where the gRPC
+    channel handshake dominates. The emulator only speaks gRPC, so it is kept
+    when FIRESTORE_EMULATOR_HOST is set.
+    """
+    
+    @property
+    def _firestore_api(self):
+        if self._emulator_host is not None:
+            return super()._firestore_api
+        if self._firestore_api_internal is None:
+            self._firestore_api_internal = firestore_client.FirestoreClient(
+                credentials=self._credentials,
+                transport="rest",
+                client_options=self._client_options,
+                client_info=self._client_info
+            )
+        return self._firestore_api_internal
+
+
+@functools.lru_cache(maxsize=None)
+def get_firestore_client(project_id: Optional[str], database_name: str, slot: int = 0,
+                         transport: str = "grpc") -> firestore.Client:
+    """
+    Get a process-wide shared Firestore client.
+    
+    Clients are cached per (project_id, database_name, slot, transport) so every
+    manager in the process reuses the same channels instead of opening new ones.
+    
+    Args:
+        project_id: Google Cloud project ID (defaults to GOOGLE_CLOUD_PROJECT env var)
+        database_name: Firestore database name
+        slot: Pool slot, distinct slots get distinct clients
+        transport: "grpc" for streaming and batch workloads, "rest" for one-shot reads
+        
+    Returns:
+        Shared Firestore client
+        
+    Raises:
+        FirestoreManagerError: If the transport is not supported
+    """
+    if transport not in FIRESTORE_TRANSPORTS:
+        raise FirestoreManagerError(f"Unsupported Firestore transport: {transport}")
+    
+    client_class = RestFirestoreClient if transport == "rest" else firestore.Client
+    if project_id:
+        return client_class(project=project_id, database=database_name)
+    return client_class(database=database_name)
+
+
+class FirestoreClientPool:
+    """Round-robin pool of Firestore clients, each owning its own gRPC channel."""
+    
+    def __init__(self, project_id: Optional[str] = None, database_name: str = "develop", pool_size: int = 1,
+                 transport: str = "grpc"):
+        """
+        Initialize the client pool.
+        
+        Args:
+            project_id: Google Cloud project ID (defaults to GOOGLE_CLOUD_PROJECT env var)
+            database_name: Firestore database name
+            pool_size: Number of clients (gRPC channels) to preallocate
+            transport: Client transport, "grpc" or "rest"
+            
+        Raises:
+            FirestoreManagerError: If pool_size is invalid
+        """
+        if pool_size < 1:
+            raise FirestoreManagerError("pool_size must be at least 1")
+        
+        self.clients = [
+            get_firestore_client(project_id, database_name, slot, transport) for slot in range(pool_size)
+        ]
+        self._cycle = itertools.cycle(self.clients)
+        self._lock = threading.Lock()
+    
+    def next_client(self) -> firestore.Client:
+        """Return the next client in round-robin order."""
+        with self._lock:
+            return next(self._cycle)
+    
+    def __len__(self) -> int:
+        return len(self.clients)
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed time-to-live."""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries before the least recently used is evicted
+            ttl: Seconds an entry stays valid, 0 disables caching
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any) -> None:
+        """Cache value under key, evicting the least recently used entry if full."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def pop(self, key: str) -> None:
+        """Invalidate key."""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        """Invalidate every entry."""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 class FirestoreManager:
     """Firestore manager for NFT data storage and retrieval."""
     
-    def __init__(self, project_id: Optional[str] = None, database_name: str = "develop", collection_name: str = "nfts"):
+    # Maximum writes in a single batch commit (Firestore limit)
+    WRITE_BATCH_SIZE = 500
+    
+    # NFTs per batch, each NFT writes its document and its raw payload,
+    # leaving room for the wallet summary in the final batch
+    NFTS_PER_BATCH = (WRITE_BATCH_SIZE - 1) // 2
+    
+    # Maximum batch commits in flight at once
+    MAX_COMMIT_WORKERS = 10
+    
+    # Maximum batch commits in flight at once on the async client
+    MAX_ASYNC_COMMITS = 40
+    
+    # Maximum document references sent in a single get_all request
+    GET_ALL_CHUNK_SIZE = 300
+    
+    # Estimated document size above which writes are trimmed or rejected,
+    # leaving headroom under Firestore's 1 MiB document limit
+    MAX_DOCUMENT_BYTES = 900_000
+    
+    # Array fields blanked from oversized NFT documents, full copies stay in the raw payload
+    OVERFLOW_FIELDS = ("attributes", "creators", "royalties")
+    
+    # Documents kept by the get_nft_by_asset_id read cache
+    READ_CACHE_SIZE = 4096
+    
+    # Download statuses reported by get_download_statistics
+    DOWNLOAD_STATUSES = ("pending", "downloading", "completed", "failed")
+    
+    # Download fields cleared by reset_download_status
+    DOWNLOAD_RESET_FIELDS = {
+        "download_status": "pending",
+        "download_attempts": 0,
+        "download_error": None,
+        "local_file_path": None,
+        "file_size": None,
+        "download_completed_at": None
+    }
+    
+    # Download fields every newly stored NFT document starts with
+    INITIAL_DOWNLOAD_FIELDS = {**DOWNLOAD_RESET_FIELDS, "last_download_attempt": None}
+    
+    # Fields read by get_collection_stats
+    COLLECTION_STATS_FIELDS = ["asset_id", "name", "collection.name", "compressed", "sync_status", "created_at"]
+    
+    def __init__(self, project_id: Optional[str] = None, database_name: str = "develop", collection_name: str = "nfts",
+                 pool_size: int = 1, transport: str = "grpc", read_cache_ttl: float = 60.0):
         """
         Initialize Firestore manager.
         
@@ -27,20 +275,28 @@ class FirestoreManager:
             project_id: Google Cloud project ID (defaults to GOOGLE_CLOUD_PROJECT env var)
             database_name: Firestore database name (defaults to "develop")
             collection_name: Firestore collection name for NFTs
+            pool_size: Number of Firestore clients used to fan out writes (defaults to a single channel)
+            transport: "grpc" (default) for batch writers, "rest" for short-lived processes
+                doing a few single-document reads, which skips the gRPC channel setup
+            read_cache_ttl: Seconds get_nft_by_asset_id results are served from memory, 0 disables
             
         Raises:
             FirestoreManagerError: If initialization fails
         """
         self.collection_name = collection_name
+        self.project_id = project_id
+        self.database_name = database_name
+        self._async_client = None
+        self._async_loop = None
         
         try:
-            # Initialize Firestore client with specific database
-            if project_id:
-                self.db = firestore.Client(project=project_id, database=database_name)
-            else:
-                self.db = firestore.Client(database=database_name)
+            # Initialize Firestore client(s) with specific database
+            self.pool = FirestoreClientPool(project_id, database_name, pool_size, transport)
+            self.db = self.pool.clients[0]
             
             self.collection = self.db.collection(collection_name)
+            self.raw_collection = self.db.collection(f"{collection_name}_raw")
+            self._read_cache = TTLCache(self.READ_CACHE_SIZE, read_cache_ttl)
             self.logger = logging.getLogger(__name__)
             
         except Exception as e:
@@ -66,41 +322,14 @@ class FirestoreManager:
             if not asset_id:
                 raise FirestoreManagerError("NFT data missing required 'id' field")
             
-            # Prepare document data
-            doc_data = {
-                "asset_id": asset_id,
-                "wallet_address": wallet_address,
-                "name": self._extract_name(nft_data),
-                "symbol": self._extract_symbol(nft_data),
-                "description": self._extract_description(nft_data),
-                "image_url": self._extract_image_url(nft_data),
-                "metadata_uri": self._extract_metadata_uri(nft_data),
-                "attributes": self._extract_attributes(nft_data),
-                "collection": self._extract_collection_info(nft_data),
-                "compressed": nft_data.get("compression", {}).get("compressed", False),
-                "royalties": self._extract_royalties(nft_data),
-                "creators": self._extract_creators(nft_data),
-                "supply": self._extract_supply(nft_data),
-                "decimals": nft_data.get("content", {}).get("metadata", {}).get("decimals", 0),
-                "token_standard": nft_data.get("content", {}).get("metadata", {}).get("tokenStandard", "Unknown"),
-                "raw_data": nft_data,  # Store complete raw data for reference
-                "created_at": datetime.now(timezone.utc),
-                "updated_at": datetime.now(timezone.utc),
-                "last_synced": datetime.now(timezone.utc),
-                "sync_status": "synced",
-                # Download status fields
-                "download_status": "pending",
-                "download_attempts": 0,
-                "download_error": None,
-                "local_file_path": None,
-                "file_size": None,
-                "download_completed_at": None,
-                "last_download_attempt": None
-            }
+            now = datetime.now(timezone.utc)
             
-            # Use asset_id as document ID for easy lookup
-            doc_ref = self.collection.document(asset_id)
-            doc_ref.set(doc_data, merge=True)
+            # Use asset_id as document ID for easy lookup, raw payload goes to the sibling collection
+            batch = self.pool.next_client().batch()
+            batch.set(self.collection.document(asset_id), self._build_doc_data(wallet_address, asset_id, nft_data, now), merge=True)
+            batch.set(self.raw_collection.document(asset_id), self._build_raw_doc(nft_data, now))
+            batch.commit()
+            self._read_cache.pop(asset_id)
             
             self.logger.info(f"Stored NFT data for asset {asset_id}")
             return asset_id
@@ -108,6 +337,74 @@ class FirestoreManager:
         except Exception as e:
             raise FirestoreManagerError(f"Failed to store NFT data: {str(e)}")
     
+    def _build_doc_data(self, wallet_address: str, asset_id: str, nft_data: Dict[str, Any],
+                        now: datetime) -> Dict[str, Any]:
+        """
+        Build the Firestore document for an NFT.
+        
+        Args:
+            wallet_address: Owner wallet address
+            asset_id: NFT asset ID
+            nft_data: NFT data from Helius API
+            now: Timestamp used for the created/updated/synced fields
+            
+        Returns:
+            Document data ready to be written
+            
+        Raises:
+            FirestoreManagerError: If the document exceeds MAX_DOCUMENT_BYTES even after trimming
+        """
+        doc_data = {
+            "asset_id": asset_id,
+            "wallet_address": wallet_address,
+            **self._extract_all(nft_data),
+            "overflow_fields": [],
+            "created_at": now,
+            "updated_at": now,
+            "last_synced": now,
+            "sync_status": "synced",
+            **self.INITIAL_DOWNLOAD_FIELDS
+        }
+        
+        if self._estimate_size(doc_data) > self.MAX_DOCUMENT_BYTES:
+            # Blank the large arrays rather than fail the whole batch commit
+            for field in self.OVERFLOW_FIELDS:
+                doc_data[field] = []
+            doc_data["overflow_fields"] = list(self.OVERFLOW_FIELDS)
+            self.logger.warning(f"NFT {asset_id} exceeds document size limit, {self.OVERFLOW_FIELDS} kept in raw payload only")
+            
+            if self._estimate_size(doc_data) > self.MAX_DOCUMENT_BYTES:
+                raise FirestoreManagerError(f"NFT {asset_id} document exceeds {self.MAX_DOCUMENT_BYTES} bytes")
+        
+        return doc_data
+    
+    @staticmethod
+    def _estimate_size(doc_data: Dict[str, Any]) -> int:
+        """Estimate the stored size of a document from its JSON encoding."""
+        return len(orjson.dumps(doc_data, default=str))
+    
+    def _build_raw_doc(self, nft_data: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        """
+        Build the raw payload document stored alongside an NFT.
+        
+        Args:
+            nft_data: NFT data from Helius API
+            now: Timestamp of the write
+            
+        Returns:
+            Raw document with the gzip-compressed JSON payload
+            
+        Raises:
+            FirestoreManagerError: If the compressed payload exceeds MAX_DOCUMENT_BYTES
+        """
+        raw = gzip.compress(orjson.dumps(nft_data), compresslevel=6)
+        if len(raw) > self.MAX_DOCUMENT_BYTES:
+            raise FirestoreManagerError(f"Raw payload of {len(raw)} bytes exceeds {self.MAX_DOCUMENT_BYTES} bytes")
+        return {
+            "raw": raw,
+            "updated_at": now
+        }
+    
     def store_wallet_nfts(self, wallet_address: str, nfts_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Store multiple NFTs for a wallet in Firestore.
@@ -130,29 +427,189 @@ class FirestoreManager:
                 "errors": []
             }
             
-            # Store each NFT
+            batches = self._build_wallet_batches(
+                wallet_address, nfts_data, results, lambda: self.pool.next_client().batch()
+            )
+            build_failures = self._add_wallet_summary(batches, wallet_address, results)
+            
+            # Commit batches concurrently across the pooled clients
+            if batches:
+                with ThreadPoolExecutor(max_workers=min(len(batches), self.MAX_COMMIT_WORKERS)) as executor:
+                    future_to_count = {
+                        executor.submit(batch.commit, retry=COMMIT_RETRY): batch_count
+                        for batch, batch_count in batches
+                    }
+                    
+                    for future in as_completed(future_to_count):
+                        batch_count = future_to_count[future]
+                        try:
+                            future.result()
+                            results["stored"] += batch_count
+                        except Exception as e:
+                            self._record_failed_commit(results, batch_count, e)
+            
+            for nft_data in nfts_data:
+                self._read_cache.pop(nft_data.get("id", ""))
+            
+            self.logger.info(f"Stored {results['stored']} of {results['total_nfts']} NFTs for wallet {wallet_address}")
+            
+            # Rewrite the summary if it missed the commit or no longer matches the outcome
+            if not batches or results["failed"] > build_failures:
+                self._update_wallet_summary(wallet_address, results)
+            
+            return results
+            
+        except Exception as e:
+            raise FirestoreManagerError(f"Failed to store wallet NFTs: {str(e)}")
+    
+    async def store_wallet_nfts_async(self, wallet_address: str, nfts_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Store multiple NFTs for a wallet from an asyncio caller.
+        
+        Behaves like store_wallet_nfts, but commits through the async client so
+        up to MAX_ASYNC_COMMITS batches are in flight on one event loop.
+        
+        Args:
+            wallet_address: Owner wallet address
+            nfts_data: List of NFT data from Helius API
+            
+        Returns:
+            Summary of storage operation
+            
+        Raises:
+            FirestoreManagerError: If storage fails
+        """
+        try:
+            results = {
+                "total_nfts": len(nfts_data),
+                "stored": 0,
+                "failed": 0,
+                "errors": []
+            }
+            
+            async_client = self._get_async_client()
+            batches = self._build_wallet_batches(wallet_address, nfts_data, results, async_client.batch)
+            build_failures = self._add_wallet_summary(batches, wallet_address, results)
+            
+            semaphore = asyncio.Semaphore(self.MAX_ASYNC_COMMITS)
+            
+            async def commit(batch):
+                async with semaphore:
+                    return await batch.commit(retry=ASYNC_COMMIT_RETRY)
+            
+            outcomes = await asyncio.gather(*(commit(batch) for batch, _ in batches), return_exceptions=True)
+            for (_, batch_count), outcome in zip(batches, outcomes):
+                if isinstance(outcome, Exception):
+                    self._record_failed_commit(results, batch_count, outcome)
+                else:
+                    results["stored"] += batch_count
+            
             for nft_data in nfts_data:
+                self._read_cache.pop(nft_data.get("id", ""))
+            
+            self.logger.info(f"Stored {results['stored']} of {results['total_nfts']} NFTs for wallet {wallet_address}")
+            
+            if not batches or results["failed"] > build_failures:
                 try:
-                    self.store_nft_data(wallet_address, nft_data)
-                    results["stored"] += 1
+                    summary_ref = async_client.collection("wallet_summaries").document(wallet_address)
+                    await summary_ref.set(self._build_wallet_summary(wallet_address, results), merge=True)
+                except Exception as e:
+                    self.logger.error(f"Failed to update wallet summary for {wallet_address}: {str(e)}")
+            
+            return results
+            
+        except Exception as e:
+            raise FirestoreManagerError(f"Failed to store wallet NFTs: {str(e)}")
+    
+    def _build_wallet_batches(self, wallet_address: str, nfts_data: List[Dict[str, Any]], results: Dict[str, Any],
+                              new_batch: Callable[[], Any]) -> List[Tuple[Any, int]]:
+        """
+        Build batched writes for a wallet, one batch per NFTS_PER_BATCH NFTs.
+        
+        NFTs that cannot be built are recorded as failed in results.
+        
+        Args:
+            wallet_address: Owner wallet address
+            nfts_data: List of NFT data from Helius API
+            results: Storage summary updated with build failures
+            new_batch: Factory returning an empty write batch
+            
+        Returns:
+            List of (batch, number of NFTs in batch) tuples
+        """
+        now = datetime.now(timezone.utc)
+        batches = []
+        for start in range(0, len(nfts_data), self.NFTS_PER_BATCH):
+            batch = new_batch()
+            batch_count = 0
+            
+            for nft_data in nfts_data[start:start + self.NFTS_PER_BATCH]:
+                try:
+                    asset_id = nft_data.get("id", "")
+                    if not asset_id:
+                        raise FirestoreManagerError("NFT data missing required 'id' field")
+                    
+                    doc_data = self._build_doc_data(wallet_address, asset_id, nft_data, now)
+                    raw_doc = self._build_raw_doc(nft_data, now)
+                    batch.set(self.collection.document(asset_id), doc_data, merge=True)
+                    batch.set(self.raw_collection.document(asset_id), raw_doc)
+                    batch_count += 1
                 except Exception as e:
                     results["failed"] += 1
                     error_msg = f"Failed to store NFT {nft_data.get('id', 'unknown')}: {str(e)}"
                     results["errors"].append(error_msg)
                     self.logger.error(error_msg)
             
-            # Update wallet summary
-            self._update_wallet_summary(wallet_address, results)
-            
-            return results
+            if batch_count:
+                batches.append((batch, batch_count))
+        
+        return batches
+    
+    def _add_wallet_summary(self, batches: List[Tuple[Any, int]], wallet_address: str,
+                            results: Dict[str, Any]) -> int:
+        """
+        Piggyback the wallet summary on the final batch of an ingest.
+        
+        The summary assumes every batch commits; callers rewrite it when one fails.
+        
+        Args:
+            batches: Batches built by _build_wallet_batches
+            wallet_address: Owner wallet address
+            results: Storage summary holding the build failures so far
             
-        except Exception as e:
-            raise FirestoreManagerError(f"Failed to store wallet NFTs: {str(e)}")
+        Returns:
+            Number of NFTs that failed before any commit
+        """
+        if batches:
+            summary_ref = self.db.collection("wallet_summaries").document(wallet_address)
+            batches[-1][0].set(summary_ref, self._build_wallet_summary(wallet_address, results), merge=True)
+        return results["failed"]
+    
+    def _record_failed_commit(self, results: Dict[str, Any], batch_count: int, error: Exception) -> None:
+        """Record a failed batch commit in the storage summary."""
+        results["failed"] += batch_count
+        error_msg = f"Failed to commit batch of {batch_count} NFTs: {str(error)}"
+        results["errors"].append(error_msg)
+        self.logger.error(error_msg)
+    
+    def _get_async_client(self) -> firestore.AsyncClient:
+        """Return the async client for the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            if self.project_id:
+                self._async_client = firestore.AsyncClient(project=self.project_id, database=self.database_name)
+            else:
+                self._async_client = firestore.AsyncClient(database=self.database_name)
+            self._async_loop = loop
+        return self._async_client
     
     def get_nft_by_asset_id(self, asset_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve NFT data by asset ID.
         
+        Found documents are cached for read_cache_ttl seconds and invalidated
+        by every write this manager makes to them.
+        
         Args:
             asset_id: NFT asset ID
             
@@ -160,49 +617,114 @@ class FirestoreManager:
             NFT data or None if not found
         """
         try:
+            cached = self._read_cache.get(asset_id)
+            if cached is not None:
+                return copy.deepcopy(cached)
+            
             doc_ref = self.collection.document(asset_id)
             doc = doc_ref.get()
             
             if doc.exists:
-                return doc.to_dict()
+                nft_data = doc.to_dict()
+                self._read_cache.set(asset_id, copy.deepcopy(nft_data))
+                return nft_data
             return None
             
         except Exception as e:
             self.logger.error(f"Failed to retrieve NFT {asset_id}: {str(e)}")
             return None
     
-    def get_nfts_by_wallet(self, wallet_address: str, limit: int = 1000) -> List[Dict[str, Any]]:
+    def get_raw_nft_data(self, asset_id: str) -> Optional[Dict[str, Any]]:
         """
-        Retrieve all NFTs for a wallet address.
+        Retrieve the raw Helius payload stored for an NFT.
         
         Args:
-            wallet_address: Wallet address
-            limit: Maximum number of NFTs to retrieve
+            asset_id: NFT asset ID
             
         Returns:
-            List of NFT data
+            Raw Helius data or None if not found
         """
         try:
-            query = self.collection.where("wallet_address", "==", wallet_address).limit(limit)
-            docs = query.stream()
+            doc = self.raw_collection.document(asset_id).get(field_paths=["raw"])
             
-            nfts = []
-            for doc in docs:
-                nfts.append(doc.to_dict())
+            if doc.exists:
+                return decode_raw_data(doc.get("raw"))
+            return None
+            
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve raw data for NFT {asset_id}: {str(e)}")
+            return None
+    
+    def get_nfts_by_asset_ids(self, asset_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve multiple NFTs by asset ID using bulk reads.
+        
+        Args:
+            asset_ids: NFT asset IDs
+            
+        Returns:
+            Mapping of asset ID to NFT data; missing documents are omitted
+        """
+        if not asset_ids:
+            return {}
+        
+        try:
+            chunks = [
+                asset_ids[i:i + self.GET_ALL_CHUNK_SIZE]
+                for i in range(0, len(asset_ids), self.GET_ALL_CHUNK_SIZE)
+            ]
+            
+            nfts = {}
+            with ThreadPoolExecutor(max_workers=min(len(chunks), len(self.pool) * 4)) as executor:
+                for chunk_result in executor.map(self._get_all_chunk, chunks):
+                    nfts.update(chunk_result)
             
             return nfts
             
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve {len(asset_ids)} NFTs: {str(e)}")
+            return {}
+    
+    def _get_all_chunk(self, asset_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch one chunk of documents in a single get_all round-trip."""
+        client = self.pool.next_client()
+        doc_refs = [self.collection.document(asset_id) for asset_id in asset_ids]
+        return {snap.id: snap.to_dict() for snap in client.get_all(doc_refs) if snap.exists}
+    
+    def get_nfts_by_wallet(self, wallet_address: str, limit: int = 1000,
+                           fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream all NFTs for a wallet address.
+        
+        Documents are yielded as they arrive from the server, so callers that
+        need a list should wrap the result in ``list(...)``.
+        
+        Args:
+            wallet_address: Wallet address
+            limit: Maximum number of NFTs to retrieve
+            fields: Optional field paths to project; full documents are returned if None
+            
+        Yields:
+            NFT data
+        """
+        try:
+            query = self.collection.where("wallet_address", "==", wallet_address).limit(limit)
+            if fields:
+                query = query.select(fields)
+            
+            for doc in query.stream():
+                yield doc.to_dict()
+            
         except Exception as e:
             self.logger.error(f"Failed to retrieve NFTs for wallet {wallet_address}: {str(e)}")
-            return []
     
     def search_nfts(self, 
                    wallet_address: Optional[str] = None,
                    collection_name: Optional[str] = None,
                    compressed: Optional[bool] = None,
-                   limit: int = 100) -> List[Dict[str, Any]]:
+                   limit: int = 100) -> Iterator[Dict[str, Any]]:
         """
-        Search NFTs with various filters.
+        Search NFTs with various filters, streaming matches as they arrive.
         
         Args:
             wallet_address: Filter by wallet address
@@ -210,8 +732,8 @@ class FirestoreManager:
             compressed: Filter by compression status
             limit: Maximum number of results
             
-        Returns:
-            List of matching NFTs
+        Yields:
+            Matching NFTs
         """
         try:
             query = self.collection
@@ -229,16 +751,13 @@ class FirestoreManager:
             # Apply limit
             query = query.limit(limit)
             
-            docs = query.stream()
-            nfts = []
-            for doc in docs:
-                nfts.append(doc.to_dict())
-            
-            return nfts
+            for doc in query.stream():
+                yield doc.to_dict()
             
+        except google_exceptions.FailedPrecondition as e:
+            self._log_missing_index("search_nfts", e)
         except Exception as e:
             self.logger.error(f"Failed to search NFTs: {str(e)}")
-            return []
     
     def update_nft_sync_status(self, asset_id: str, status: str = "synced") -> bool:
         """
@@ -252,11 +771,12 @@ class FirestoreManager:
             True if update successful, False otherwise
         """
         try:
-            doc_ref = self.collection.document(asset_id)
+            doc_ref = self._next_collection().document(asset_id)
             doc_ref.update({
                 "sync_status": status,
                 "updated_at": datetime.now(timezone.utc)
             })
+            self._read_cache.pop(asset_id)
             self.logger.info(f"Updated sync status for asset {asset_id} to {status}")
             return True
         except Exception as e:
@@ -279,23 +799,20 @@ class FirestoreManager:
             True if update successful, False otherwise
         """
         try:
+            now = datetime.now(timezone.utc)
             update_data = {
                 "download_status": status,
-                "last_download_attempt": datetime.now(timezone.utc),
-                "updated_at": datetime.now(timezone.utc)
+                "last_download_attempt": now,
+                "updated_at": now
             }
             
             if status == "downloading":
-                # Increment download attempts
-                doc_ref = self.collection.document(asset_id)
-                doc = doc_ref.get()
-                if doc.exists:
-                    current_attempts = doc.to_dict().get("download_attempts", 0)
-                    update_data["download_attempts"] = current_attempts + 1
+                # Increment download attempts server-side, no read required
+                update_data["download_attempts"] = firestore.Increment(1)
             
             elif status == "completed":
                 update_data.update({
-                    "download_completed_at": datetime.now(timezone.utc),
+                    "download_completed_at": now,
                     "download_error": None
                 })
                 if local_file_path:
@@ -307,8 +824,9 @@ class FirestoreManager:
                 if error:
                     update_data["download_error"] = error
             
-            doc_ref = self.collection.document(asset_id)
+            doc_ref = self._next_collection().document(asset_id)
             doc_ref.update(update_data)
+            self._read_cache.pop(asset_id)
             
             self.logger.info(f"Updated download status for asset {asset_id} to {status}")
             return True
@@ -318,17 +836,17 @@ class FirestoreManager:
             return False
 
     def get_nfts_by_download_status(self, status: str, wallet_address: Optional[str] = None, 
-                                   limit: int = 100) -> List[Dict[str, Any]]:
+                                   limit: int = 100) -> Iterator[Dict[str, Any]]:
         """
-        Get NFTs by download status.
+        Stream NFTs by download status.
         
         Args:
             status: Download status to filter by
             wallet_address: Optional wallet address filter
             limit: Maximum number of documents to return
             
-        Returns:
-            List of NFT documents matching the criteria
+        Yields:
+            NFT documents matching the criteria, with the document ID under "id"
         """
         try:
             query = self.collection.where("download_status", "==", status)
@@ -336,12 +854,16 @@ class FirestoreManager:
             if wallet_address:
                 query = query.where("wallet_address", "==", wallet_address)
             
-            docs = query.limit(limit).stream()
-            return [{"id": doc.id, **doc.to_dict()} for doc in docs]
+            for doc in query.limit(limit).stream():
+                # to_dict() returns a fresh copy, so the ID can be added in place
+                nft_data = doc.to_dict()
+                nft_data["id"] = doc.id
+                yield nft_data
             
+        except google_exceptions.FailedPrecondition as e:
+            self._log_missing_index("get_nfts_by_download_status", e)
         except Exception as e:
             self.logger.error(f"Failed to get NFTs by download status {status}: {str(e)}")
-            return []
 
     def get_download_statistics(self, wallet_address: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -360,10 +882,17 @@ class FirestoreManager:
             else:
                 query = self.collection
             
-            # Get all documents
-            docs = list(query.stream())
+            # Count server-side: one aggregation per status, plus the completed file size sum
+            aggregations = {"total": query.count(alias="count")}
+            for status in self.DOWNLOAD_STATUSES:
+                aggregations[status] = query.where("download_status", "==", status).count(alias="count")
+            aggregations["completed"] = aggregations["completed"].sum("file_size", alias="file_size")
             
-            if not docs:
+            with ThreadPoolExecutor(max_workers=len(aggregations)) as executor:
+                results = dict(zip(aggregations, executor.map(self._run_aggregation, aggregations.values())))
+            
+            total_docs = int(results["total"].get("count", 0))
+            if not total_docs:
                 return {
                     "total_documents": 0,
                     "pending_downloads": 0,
@@ -374,31 +903,19 @@ class FirestoreManager:
                     "download_success_rate": "0%"
                 }
             
-            # Count by status
-            status_counts = {}
-            total_file_size = 0
-            completed_count = 0
-            
-            for doc in docs:
-                data = doc.to_dict()
-                status = data.get("download_status", "pending")
-                status_counts[status] = status_counts.get(status, 0) + 1
-                
-                if status == "completed":
-                    completed_count += 1
-                    file_size = data.get("file_size", 0)
-                    total_file_size += file_size
-            
-            total_docs = len(docs)
-            success_rate = (completed_count / total_docs * 100) if total_docs > 0 else 0
+            status_counts = {
+                status: int(results[status].get("count", 0))
+                for status in self.DOWNLOAD_STATUSES
+            }
+            success_rate = status_counts["completed"] / total_docs * 100
             
             return {
                 "total_documents": total_docs,
-                "pending_downloads": status_counts.get("pending", 0),
-                "downloading": status_counts.get("downloading", 0),
-                "completed_downloads": status_counts.get("completed", 0),
-                "failed_downloads": status_counts.get("failed", 0),
-                "total_file_size": total_file_size,
+                "pending_downloads": status_counts["pending"],
+                "downloading": status_counts["downloading"],
+                "completed_downloads": status_counts["completed"],
+                "failed_downloads": status_counts["failed"],
+                "total_file_size": int(results["completed"].get("file_size") or 0),
                 "download_success_rate": f"{success_rate:.1f}%"
             }
             
@@ -406,6 +923,10 @@ class FirestoreManager:
             self.logger.error(f"Failed to get download statistics: {str(e)}")
             return {}
 
+    def _run_aggregation(self, aggregation_query) -> Dict[str, Any]:
+        """Execute an aggregation query and map each alias to its value."""
+        return {result.alias: result.value for row in aggregation_query.get() for result in row}
+
     def batch_update_download_status(self, updates: List[Dict[str, Any]]) -> Dict[str, int]:
         """
         Batch update download status for multiple NFTs.
@@ -417,9 +938,10 @@ class FirestoreManager:
             Dictionary with success and failure counts
         """
         try:
-            batch = self.db.batch()
+            batch = self.pool.next_client().batch()
             success_count = 0
             failure_count = 0
+            now = datetime.now(timezone.utc)
             
             for update in updates:
                 try:
@@ -433,13 +955,13 @@ class FirestoreManager:
                     
                     update_data = {
                         "download_status": status,
-                        "last_download_attempt": datetime.now(timezone.utc),
-                        "updated_at": datetime.now(timezone.utc)
+                        "last_download_attempt": now,
+                        "updated_at": now
                     }
                     
                     if status == "completed":
                         update_data.update({
-                            "download_completed_at": datetime.now(timezone.utc),
+                            "download_completed_at": now,
                             "download_error": None
                         })
                         if local_file_path:
@@ -458,6 +980,8 @@ class FirestoreManager:
             
             # Commit batch
             batch.commit()
+            for update in updates:
+                self._read_cache.pop(update.get("asset_id", ""))
             self.logger.info(f"Batch update completed: {success_count} successful, {failure_count} failed")
             
             return {
@@ -482,21 +1006,16 @@ class FirestoreManager:
             Number of documents updated
         """
         try:
+            # Every document gets the same update, built once per call
+            reset_data = {**self.DOWNLOAD_RESET_FIELDS, "updated_at": datetime.now(timezone.utc)}
             if asset_ids:
                 # Reset specific assets
-                batch = self.db.batch()
+                batch = self.pool.next_client().batch()
                 for asset_id in asset_ids:
-                    doc_ref = self.collection.document(asset_id)
-                    batch.update(doc_ref, {
-                        "download_status": "pending",
-                        "download_attempts": 0,
-                        "download_error": None,
-                        "local_file_path": None,
-                        "file_size": None,
-                        "download_completed_at": None,
-                        "updated_at": datetime.now(timezone.utc)
-                    })
+                    batch.update(self.collection.document(asset_id), reset_data)
                 batch.commit()
+                for asset_id in asset_ids:
+                    self._read_cache.pop(asset_id)
                 return len(asset_ids)
             else:
                 # Reset all for wallet
@@ -504,30 +1023,38 @@ class FirestoreManager:
                     raise ValueError("wallet_address is required when asset_ids is None")
                 
                 docs = self.collection.where("wallet_address", "==", wallet_address).stream()
-                batch = self.db.batch()
+                batch = self.pool.next_client().batch()
                 count = 0
+                updated = 0
                 
-                for doc in docs:
-                    batch.update(doc.reference, {
-                        "download_status": "pending",
-                        "download_attempts": 0,
-                        "download_error": None,
-                        "local_file_path": None,
-                        "file_size": None,
-                        "download_completed_at": None,
-                        "updated_at": datetime.now(timezone.utc)
-                    })
-                    count += 1
-                    
-                    # Commit in batches of 500 (Firestore limit)
-                    if count % 500 == 0:
-                        batch.commit()
-                        batch = self.db.batch()
-                
-                if count % 500 != 0:
-                    batch.commit()
+                try:
+                    # Commit full batches in the background so the scan keeps streaming
+                    with ThreadPoolExecutor(max_workers=self.MAX_COMMIT_WORKERS) as executor:
+                        future_to_count = {}
+                        for doc in docs:
+                            batch.update(doc.reference, reset_data)
+                            count += 1
+                            
+                            if count % self.WRITE_BATCH_SIZE == 0:
+                                future_to_count[executor.submit(batch.commit, retry=COMMIT_RETRY)] = self.WRITE_BATCH_SIZE
+                                batch = self.pool.next_client().batch()
+                        
+                        if count % self.WRITE_BATCH_SIZE != 0:
+                            future_to_count[executor.submit(batch.commit, retry=COMMIT_RETRY)] = count % self.WRITE_BATCH_SIZE
+                        
+                        # Count only committed batches so a partial reset is reported as such
+                        for future in as_completed(future_to_count):
+                            batch_count = future_to_count[future]
+                            try:
+                                future.result()
+                                updated += batch_count
+                            except Exception as e:
+                                self.logger.error(f"Failed to reset {batch_count} documents for wallet {wallet_address}: {str(e)}")
+                finally:
+                    # Some batches may have committed even if the scan or others failed
+                    self._read_cache.clear()
                 
-                return count
+                return updated
                 
         except Exception as e:
             self.logger.error(f"Failed to reset download status: {str(e)}")
@@ -544,8 +1071,11 @@ class FirestoreManager:
             True if deleted successfully
         """
         try:
-            doc_ref = self.collection.document(asset_id)
-            doc_ref.delete()
+            batch = self.pool.next_client().batch()
+            batch.delete(self.collection.document(asset_id))
+            batch.delete(self.raw_collection.document(asset_id))
+            batch.commit()
+            self._read_cache.pop(asset_id)
             self.logger.info(f"Deleted NFT {asset_id}")
             return True
             
@@ -568,7 +1098,8 @@ class FirestoreManager:
             if wallet_address:
                 query = query.where("wallet_address", "==", wallet_address)
             
-            docs = query.stream()
+            # Every document is consumed, so fetch the projected fields in one response
+            docs = query.select(self.COLLECTION_STATS_FIELDS).get()
             
             stats = {
                 "total_nfts": 0,
@@ -613,110 +1144,99 @@ class FirestoreManager:
             self.logger.error(f"Failed to get collection stats: {str(e)}")
             return {}
     
-    def _extract_name(self, nft_data: Dict[str, Any]) -> str:
-        """Extract NFT name from Helius data."""
-        content = nft_data.get("content", {})
-        metadata = content.get("metadata", {})
-        return metadata.get("name", "Unknown NFT")
+    def _log_missing_index(self, operation: str, error: Exception) -> None:
+        """Warn that a query needs a composite index that has not been deployed."""
+        self.logger.warning(
+            f"{operation} requires a composite index that is not deployed - "
+            f"deploy firestore.indexes.json to database: {str(error)}"
+        )
     
-    def _extract_symbol(self, nft_data: Dict[str, Any]) -> str:
-        """Extract NFT symbol from Helius data."""
-        content = nft_data.get("content", {})
-        metadata = content.get("metadata", {})
-        return metadata.get("symbol", "")
+    def _next_collection(self) -> firestore.CollectionReference:
+        """Get the NFT collection bound to the next pooled client."""
+        if len(self.pool) == 1:
+            return self.collection
+        return self.pool.next_client().collection(self.collection_name)
     
-    def _extract_description(self, nft_data: Dict[str, Any]) -> str:
-        """Extract NFT description from Helius data."""
-        content = nft_data.get("content", {})
-        metadata = content.get("metadata", {})
-        return metadata.get("description", "")
-    
-    def _extract_image_url(self, nft_data: Dict[str, Any]) -> str:
-        """Extract image URL from Helius data."""
-        content = nft_data.get("content", {})
-        
-        # Check files array for image files
-        files = content.get("files", [])
-        for file_info in files:
-            mime_type = file_info.get("mime", "").lower()
-            if mime_type.startswith("image/"):
-                uri = file_info.get("uri", "")
-                if uri:
-                    return uri
-        
-        # Check links.image field
-        links = content.get("links", {})
-        if links and "image" in links:
-            return links["image"]
+    def _extract_all(self, nft_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extract all document fields from Helius data in a single pass.
         
-        # Check metadata for image fields
-        metadata = content.get("metadata", {})
-        for field in ["image", "image_url", "imageUrl"]:
-            if field in metadata:
-                return metadata[field]
-        
-        return ""
-    
-    def _extract_metadata_uri(self, nft_data: Dict[str, Any]) -> str:
-        """Extract metadata URI from Helius data."""
-        content = nft_data.get("content", {})
-        metadata = content.get("metadata", {})
-        return metadata.get("uri", "")
-    
-    def _extract_attributes(self, nft_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Extract NFT attributes from Helius data."""
-        content = nft_data.get("content", {})
-        metadata = content.get("metadata", {})
-        return metadata.get("attributes", [])
-    
-    def _extract_collection_info(self, nft_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract collection information from Helius data."""
-        content = nft_data.get("content", {})
-        metadata = content.get("metadata", {})
+        Args:
+            nft_data: NFT data from Helius API
+            
+        Returns:
+            Extracted document fields
+        """
+        content = nft_data.get("content") or {}
+        metadata = content.get("metadata") or {}
         
         collection = metadata.get("collection", {})
         if isinstance(collection, dict):
-            return {
+            collection_info = {
                 "name": collection.get("name", ""),
                 "family": collection.get("family", "")
             }
+        else:
+            collection_info = {"name": "", "family": ""}
         
-        return {"name": "", "family": ""}
-    
-    def _extract_royalties(self, nft_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Extract royalty information from Helius data."""
-        content = nft_data.get("content", {})
-        metadata = content.get("metadata", {})
-        return metadata.get("royalties", [])
+        return {
+            "name": metadata.get("name", "Unknown NFT"),
+            "symbol": metadata.get("symbol", ""),
+            "description": metadata.get("description", ""),
+            "image_url": self._extract_image_url_from_content(content, metadata),
+            "metadata_uri": metadata.get("uri", ""),
+            "attributes": metadata.get("attributes", []),
+            "collection": collection_info,
+            "compressed": (nft_data.get("compression") or {}).get("compressed", False),
+            "royalties": metadata.get("royalties", []),
+            "creators": metadata.get("creators", []),
+            "supply": metadata.get("supply", 1),
+            "decimals": metadata.get("decimals", 0),
+            "token_standard": metadata.get("tokenStandard", "Unknown")
+        }
     
-    def _extract_creators(self, nft_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Extract creator information from Helius data."""
-        content = nft_data.get("content", {})
-        metadata = content.get("metadata", {})
-        return metadata.get("creators", [])
+    def _extract_image_url(self, nft_data: Dict[str, Any]) -> str:
+        """Extract image URL from Helius data."""
+        content = nft_data.get("content") or {}
+        return self._extract_image_url_from_content(content, content.get("metadata") or {})
     
-    def _extract_supply(self, nft_data: Dict[str, Any]) -> int:
-        """Extract supply information from Helius data."""
-        content = nft_data.get("content", {})
-        metadata = content.get("metadata", {})
-        return metadata.get("supply", 1)
+    def _extract_image_url_from_content(self, content: Dict[str, Any], metadata: Dict[str, Any]) -> str:
+        """Extract image URL from the Helius content and metadata sections."""
+        # Check files array for the first image file with a URI
+        image_uri = next(
+            (file_info["uri"] for file_info in content.get("files", [])
+             if file_info.get("mime", "").lower().startswith("image/") and file_info.get("uri")),
+            None
+        )
+        if image_uri:
+            return image_uri
+        
+        # Check links.image field
+        links = content.get("links", {})
+        if links and "image" in links:
+            return links["image"]
+        
+        # Check metadata for image fields
+        return next((metadata[field] for field in ("image", "image_url", "imageUrl") if field in metadata), "")
     
     def _update_wallet_summary(self, wallet_address: str, results: Dict[str, Any]) -> None:
         """Update wallet summary in Firestore."""
         try:
             # Create or update wallet summary document
             wallet_summary_ref = self.db.collection("wallet_summaries").document(wallet_address)
-            
-            summary_data = {
-                "wallet_address": wallet_address,
-                "total_nfts": results["total_nfts"],
-                "last_sync": datetime.now(timezone.utc),
-                "sync_status": "completed" if results["failed"] == 0 else "partial",
-                "failed_count": results["failed"],
-                "updated_at": datetime.now(timezone.utc)
-            }
-            
-            wallet_summary_ref.set(summary_data, merge=True)
+            wallet_summary_ref.set(self._build_wallet_summary(wallet_address, results), merge=True)
             
         except Exception as e:
-            self.logger.error(f"Failed to update wallet summary for {wallet_address}: {str(e)}") 
\ No newline at end of file
+            self.logger.error(f"Failed to update wallet summary for {wallet_address}: {str(e)}")
+    
+    def _build_wallet_summary(self, wallet_address: str, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the wallet summary document from a storage summary."""
+        now = datetime.now(timezone.utc)
+        return {
+            "wallet_address": wallet_address,
+            "total_nfts": results["total_nfts"],
+            "last_sync": now,
+            "sync_status": "completed" if results["failed"] == 0 else "partial",
+            "failed_count": results["failed"],
+            "updated_at": now
+        }
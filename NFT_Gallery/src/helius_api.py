@@ -1,9 +1,22 @@
 """
 Helius API client for fetching Solana NFTs using DAS (Digital Asset Standard) API.
 """
+import contextlib
+import copy
+import functools
+import itertools
 import json
+import re
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import ijson
+import orjson
 import requests
-from typing import Dict, List, Optional, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union
 from urllib.parse import urlparse
 
 
@@ -12,16 +25,67 @@ class HeliusAPIError(Exception):
     pass
 
 
+class HeliusRateLimitError(HeliusAPIError):
+    """Raised when Helius rejects a request with HTTP 429."""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        """
+        Initialize rate limit error.
+        
+        Args:
+            message: Error message
+            retry_after: Seconds the server asked to wait before retrying, if given
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# Solana addresses are base58-encoded, typically 32-44 characters (used with fullmatch)
+_SOLANA_ADDRESS_RE = re.compile(r'[1-9A-HJ-NP-Za-km-z]{32,44}')
+
+# Message prefixes for standard JSON-RPC 2.0 error codes
+_RPC_ERROR_PREFIXES = {
+    -32603: "Internal server error",
+    -32602: "Invalid parameters",
+    -32601: "Method not found",
+}
+
+
 class HeliusAPIClient:
     """Helius API client for Solana NFT operations using DAS API."""
     
     BASE_URL = "https://mainnet.helius-rpc.com"
+    REST_URL = "https://api.helius.xyz/v0"
     DEFAULT_TIMEOUT = 30
+    # ACCEPT_ENCODING only lists br when a Brotli decoder is installed
     DEFAULT_HEADERS = {
         "Content-Type": "application/json",
-        "Accept": "application/json"
+        "Accept": "application/json",
+        "Accept-Encoding": ACCEPT_ENCODING
     }
     
+    # Connection pooling and transport-level retries for the RPC endpoint
+    POOL_CONNECTIONS = 16
+    POOL_MAXSIZE = 64
+    MAX_RETRIES = 3
+    RETRY_BACKOFF_FACTOR = 0.3
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    
+    # NFT metadata is effectively immutable, so getAsset results are reused for an hour
+    METADATA_CACHE_TTL = 3600
+    METADATA_CACHE_SIZE = 10_000
+    
+    # Maximum calls sent in one JSON-RPC batch request
+    MAX_BATCH_SIZE = 20
+    
+    # Maximum mints accepted by one token-metadata request
+    TOKEN_METADATA_BATCH_SIZE = 100
+    
+    # Seconds a successful connectivity check is trusted before probing again.
+    # Short enough that an outage shows up within one polling interval; failures
+    # are never cached, so recovery is seen on the very next check.
+    CONNECTIVITY_CACHE_TTL = 5.0
+    
     def __init__(self, api_key: str, timeout: int = DEFAULT_TIMEOUT):
         """
         Initialize Helius API client.
@@ -38,8 +102,48 @@ class HeliusAPIClient:
         
         self.api_key = api_key
         self.timeout = timeout
+        self._url = f"{self.BASE_URL}/?api-key={api_key}"
         self.session = requests.Session()
         self.session.headers.update(self.DEFAULT_HEADERS)
+        self.session.mount("https://", self._build_adapter())
+        self._metadata_cache: Dict[str, Any] = {}
+        self._last_ok_at = float("-inf")
+        # JSON-RPC ids, unique per client so batched responses can be correlated
+        self._id_counter = itertools.count(1)
+    
+    def _build_adapter(self) -> HTTPAdapter:
+        """
+        Build the HTTP adapter shared by all requests of this client.
+        
+        JSON-RPC calls are POSTs, so they are explicitly allowed to retry. Once
+        retries are exhausted the last response is returned and mapped to a
+        HeliusAPIError by _make_request as usual.
+        
+        Returns:
+            Configured HTTP adapter
+        """
+        retry = Retry(
+            total=self.MAX_RETRIES,
+            backoff_factor=self.RETRY_BACKOFF_FACTOR,
+            status_forcelist=self.RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["POST"]),
+            raise_on_status=False
+        )
+        return HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=retry
+        )
+    
+    def close(self) -> None:
+        """Close the HTTP session and release its pooled connections."""
+        self.session.close()
+    
+    def __enter__(self) -> "HeliusAPIClient":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
     
     def _make_request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -55,65 +159,186 @@ class HeliusAPIClient:
         Raises:
             HeliusAPIError: If request fails
         """
-        try:
-            # Construct the URL with API key
-            url = f"{self.BASE_URL}/?api-key={self.api_key}"
+        # Prepare JSON-RPC 2.0 payload
+        payload = {
+            "jsonrpc": "2.0",
+            "id": next(self._id_counter),
+            "method": method,
+            "params": params
+        }
+        
+        result = self._post(payload)
+        self._check_rpc_error(result)
+        
+        # Return the result
+        return result.get("result", {})
+    
+    def _make_batch_request(self, calls: List[Tuple[str, Any]]) -> List[Any]:
+        """
+        Make a JSON-RPC 2.0 batch request, sending several calls in one POST.
+        
+        Args:
+            calls: (method, params) pairs, at most MAX_BATCH_SIZE
             
-            # Prepare JSON-RPC 2.0 payload
-            payload = {
-                "jsonrpc": "2.0",
-                "id": "my-request-id",
-                "method": method,
-                "params": params
-            }
+        Returns:
+            Results in the same order as calls
+            
+        Raises:
+            HeliusAPIError: If the request or any call fails
+        """
+        if len(calls) > self.MAX_BATCH_SIZE:
+            raise HeliusAPIError(f"Batch of {len(calls)} calls exceeds limit of {self.MAX_BATCH_SIZE}")
+        
+        payload = [
+            {"jsonrpc": "2.0", "id": next(self._id_counter), "method": method, "params": params}
+            for method, params in calls
+        ]
+        
+        responses = self._post(payload)
+        if not isinstance(responses, list):
+            # Servers answer a rejected batch with a single error object
+            self._check_rpc_error(responses)
+            raise HeliusAPIError("Invalid batch response from API")
+        
+        if not all(isinstance(response, dict) for response in responses):
+            raise HeliusAPIError("Invalid batch response from API")
+        
+        by_id = {response.get("id"): response for response in responses}
+        results = []
+        for i, request in enumerate(payload):
+            response = by_id.get(request["id"])
+            if response is None:
+                raise HeliusAPIError(f"Missing response for batch call {i}")
+            self._check_rpc_error(response)
+            results.append(response.get("result", {}))
+        
+        return results
+    
+    def _post(self, payload: Union[Dict[str, Any], List[Dict[str, Any]]], url: Optional[str] = None) -> Any:
+        """
+        POST a JSON payload and decode the response.
+        
+        Args:
+            payload: Single request object or batch of request objects
+            url: Endpoint to post to, the JSON-RPC endpoint by default
             
+        Returns:
+            Decoded JSON response
+            
+        Raises:
+            HeliusAPIError: If the HTTP request fails
+        """
+        with self._translate_errors():
+            # Content-Type is already set on the session headers
             response = self.session.post(
-                url,
-                json=payload,
+                url or self._url,
+                data=orjson.dumps(payload),
                 timeout=self.timeout
             )
             
             # Handle HTTP errors
             response.raise_for_status()
             
-            # Parse JSON response
-            result = response.json()
-            
-            # Check for JSON-RPC errors
-            if "error" in result:
-                error = result["error"]
-                error_code = error.get("code", "unknown")
-                error_message = error.get("message", "Unknown error")
-                
-                if error_code == -32603:
-                    raise HeliusAPIError(f"Internal server error: {error_message}")
-                elif error_code == -32602:
-                    raise HeliusAPIError(f"Invalid parameters: {error_message}")
-                elif error_code == -32601:
-                    raise HeliusAPIError(f"Method not found: {error_message}")
-                else:
-                    raise HeliusAPIError(f"API error {error_code}: {error_message}")
-            
-            # Return the result
-            return result.get("result", {})
-            
+            # Parse JSON response (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+            return orjson.loads(response.content)
+    
+    @contextlib.contextmanager
+    def _translate_errors(self) -> Iterator[None]:
+        """
+        Translate transport and decoding failures into HeliusAPIError.
+        
+        Raises:
+            HeliusAPIError: If the wrapped request fails
+        """
+        try:
+            yield
         except requests.exceptions.Timeout:
             raise HeliusAPIError(f"Request timeout after {self.timeout} seconds")
         except requests.exceptions.ConnectionError:
             raise HeliusAPIError("Connection error - check network connectivity")
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 401:
-                raise HeliusAPIError("Authentication failed - check API key")
-            elif e.response.status_code == 429:
-                raise HeliusAPIError("Rate limit exceeded")
-            elif e.response.status_code == 400:
-                raise HeliusAPIError(f"Bad request: {e.response.text}")
-            else:
-                raise HeliusAPIError(f"HTTP error {e.response.status_code}: {e}")
-        except json.JSONDecodeError:
+            raise self._http_error(e.response.status_code, e.response.text, e.response.headers, e)
+        except (json.JSONDecodeError, ijson.JSONError):
             raise HeliusAPIError("Invalid JSON response from API")
-        except Exception as e:
-            raise HeliusAPIError(f"Unexpected error: {str(e)}")
+        except requests.exceptions.RequestException as e:
+            raise HeliusAPIError(f"Request failed: {str(e)}")
+    
+    @classmethod
+    def _http_error(cls, status_code: int, text: str, headers: Any, detail: Any) -> HeliusAPIError:
+        """
+        Map an HTTP error status to the matching HeliusAPIError.
+        
+        Args:
+            status_code: HTTP status code
+            text: Response body
+            headers: Response headers
+            detail: Underlying error description
+            
+        Returns:
+            Exception to raise
+        """
+        if status_code == 401:
+            return HeliusAPIError("Authentication failed - check API key")
+        elif status_code == 429:
+            return HeliusRateLimitError("Rate limit exceeded", cls._parse_retry_after(headers.get("Retry-After")))
+        elif status_code == 400:
+            return HeliusAPIError(f"Bad request: {text}")
+        else:
+            return HeliusAPIError(f"HTTP error {status_code}: {detail}")
+    
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Parse a Retry-After header given in seconds or as an HTTP date.
+        
+        Args:
+            value: Header value
+            
+        Returns:
+            Seconds to wait, or None if absent or unparseable
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            # A "-0000" zone parses to a naive datetime; HTTP dates are always UTC
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    
+    @staticmethod
+    def _check_rpc_error(response: Dict[str, Any]) -> None:
+        """
+        Raise if a JSON-RPC response object carries an error or is not an object.
+        
+        Args:
+            response: Decoded JSON-RPC response object
+            
+        Raises:
+            HeliusAPIError: If the response is malformed or contains an error
+        """
+        if not isinstance(response, dict):
+            raise HeliusAPIError("Invalid JSON-RPC response from API")
+        if "error" not in response:
+            return
+        
+        error = response["error"]
+        if isinstance(error, dict):
+            error_code = error.get("code", "unknown")
+            error_message = error.get("message", "Unknown error")
+        else:
+            # Some gateways answer with a bare string instead of an error object
+            error_code = "unknown"
+            error_message = str(error)
+        
+        prefix = _RPC_ERROR_PREFIXES.get(error_code) or f"API error {error_code}"
+        raise HeliusAPIError(f"{prefix}: {error_message}")
     
     def get_nfts_by_owner(self, wallet_address: str) -> Dict[str, Any]:
         """
@@ -135,8 +360,82 @@ class HeliusAPIClient:
         if not self._is_valid_solana_address(wallet_address):
             raise HeliusAPIError(f"Invalid Solana wallet address format: {wallet_address}")
         
+        return self._make_request("getAssetsByOwner", self._owner_assets_params(wallet_address))
+    
+    def iter_assets_by_owner(self, wallet_address: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the NFTs owned by a wallet, decoding one item at a time.
+        
+        Same request as get_nfts_by_owner, but the response is parsed
+        incrementally so peak memory is a single item rather than the whole page.
+        
+        Args:
+            wallet_address: Solana wallet address
+            
+        Yields:
+            NFT items from the response
+            
+        Raises:
+            HeliusAPIError: If request fails, wallet is invalid or the response is malformed
+        """
+        if not wallet_address or not isinstance(wallet_address, str):
+            raise HeliusAPIError("Wallet address must be a non-empty string")
+        
+        if not self._is_valid_solana_address(wallet_address):
+            raise HeliusAPIError(f"Invalid Solana wallet address format: {wallet_address}")
+        
+        payload = {
+            "jsonrpc": "2.0",
+            "id": next(self._id_counter),
+            "method": "getAssetsByOwner",
+            "params": self._owner_assets_params(wallet_address)
+        }
+        
+        with self._translate_errors():
+            with self.session.post(self._url, data=orjson.dumps(payload), timeout=self.timeout,
+                                   stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                
+                # Build only the items and a possible error value from the event stream
+                building = None
+                has_result = False
+                events = ijson.parse(response.raw, use_float=True)
+                if next(events, None) != ("", "start_map", None):
+                    raise HeliusAPIError("Invalid JSON-RPC response from API")
+                for prefix, event, value in events:
+                    if building is None:
+                        if prefix == "" and event == "map_key" and value == "result":
+                            # A null or non-object result is reported after any error value
+                            has_result = next(events, (None, None, None))[1] == "start_map"
+                            continue
+                        if prefix == "error" and event in ("string", "number", "boolean"):
+                            # A bare value instead of an error object
+                            self._check_rpc_error({"error": value})
+                        if prefix == "error" and event in ("start_map", "start_array"):
+                            building = (prefix, ijson.ObjectBuilder())
+                        elif prefix == "result.items.item" and event == "start_map":
+                            building = (prefix, ijson.ObjectBuilder())
+                        else:
+                            continue
+                    
+                    target, builder = building
+                    builder.event(event, value)
+                    if prefix == target and event in ("end_map", "end_array"):
+                        building = None
+                        if target == "error":
+                            self._check_rpc_error({"error": builder.value})
+                        else:
+                            yield builder.value
+                
+                if not has_result:
+                    raise HeliusAPIError("Invalid JSON-RPC response from API")
+    
+    @staticmethod
+    def _owner_assets_params(wallet_address: str) -> Dict[str, Any]:
+        """Build getAssetsByOwner parameters for a wallet."""
         # Use getAssetsByOwner method as per DAS API documentation
-        params = {
+        return {
             "ownerAddress": wallet_address,
             "page": 1,
             "limit": 1000,
@@ -146,13 +445,13 @@ class HeliusAPIClient:
                 "showInscription": False
             }
         }
-        
-        return self._make_request("getAssetsByOwner", params)
     
     def get_nft_metadata(self, asset_id: str) -> Dict[str, Any]:
         """
         Get metadata for a specific NFT using DAS API.
         
+        Results are cached in memory for METADATA_CACHE_TTL seconds.
+        
         Args:
             asset_id: NFT asset ID (mint address)
             
@@ -169,11 +468,120 @@ class HeliusAPIClient:
         if not self._is_valid_solana_address(asset_id):
             raise HeliusAPIError(f"Invalid asset ID format: {asset_id}")
         
+        cached = self._get_cached_metadata(asset_id)
+        if cached is not None:
+            return cached
+        
         params = {
             "id": asset_id
         }
         
-        return self._make_request("getAsset", params)
+        result = self._make_request("getAsset", params)
+        self._cache_metadata(asset_id, result)
+        
+        return result
+    
+    def get_assets_and_metadata(self, wallet_address: str, batch_size: int = MAX_BATCH_SIZE) -> Dict[str, Dict[str, Any]]:
+        """
+        Get metadata for every NFT a wallet owns in as few round-trips as possible.
+        
+        The owner listing is fetched once, then getAsset calls for mints not
+        already cached are sent as JSON-RPC batches of batch_size.
+        
+        Args:
+            wallet_address: Solana wallet address
+            batch_size: getAsset calls per batch request, capped at MAX_BATCH_SIZE
+            
+        Returns:
+            Dictionary mapping mint address to its metadata, in listing order
+            
+        Raises:
+            HeliusAPIError: If request fails or wallet is invalid
+        """
+        listing = self.get_nfts_by_owner(wallet_address)
+        mints = [item["id"] for item in listing.get("items", []) if item.get("id")]
+        batch_size = max(1, min(batch_size, self.MAX_BATCH_SIZE))
+        
+        metadata = {}
+        pending = []
+        for mint in mints:
+            cached = self._get_cached_metadata(mint)
+            if cached is not None:
+                metadata[mint] = cached
+            else:
+                pending.append(mint)
+        
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            results = self._make_batch_request([("getAsset", {"id": mint}) for mint in chunk])
+            for mint, result in zip(chunk, results):
+                self._cache_metadata(mint, result)
+                metadata[mint] = result
+        
+        return {mint: metadata[mint] for mint in mints}
+    
+    def get_token_metadata_batch(self, mints: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get on-chain and off-chain metadata for many mints via the token-metadata endpoint.
+        
+        Mints are sent TOKEN_METADATA_BATCH_SIZE at a time; each entry's
+        offChainMetadata.metadata holds the JSON document its URI points to.
+        
+        Args:
+            mints: NFT mint addresses
+            
+        Returns:
+            Metadata entries from API, in request order
+            
+        Raises:
+            HeliusAPIError: If request fails or a mint is invalid
+        """
+        for mint in mints:
+            if not isinstance(mint, str) or not self._is_valid_solana_address(mint):
+                raise HeliusAPIError(f"Invalid asset ID format: {mint}")
+        
+        url = f"{self.REST_URL}/token-metadata?api-key={self.api_key}"
+        results = []
+        for start in range(0, len(mints), self.TOKEN_METADATA_BATCH_SIZE):
+            payload = {
+                "mintAccounts": mints[start:start + self.TOKEN_METADATA_BATCH_SIZE],
+                "includeOffChain": True,
+                "disableCache": False
+            }
+            response = self._post(payload, url)
+            if not isinstance(response, list):
+                raise HeliusAPIError("Invalid token metadata response from API")
+            results.extend(response)
+        
+        return results
+    
+    def _get_cached_metadata(self, asset_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a copy of cached getAsset metadata if it is still fresh.
+        
+        Args:
+            asset_id: NFT asset ID (mint address)
+            
+        Returns:
+            Cached metadata, or None on a miss or expired entry
+        """
+        entry = self._metadata_cache.get(asset_id)
+        if entry and time.monotonic() - entry[0] < self.METADATA_CACHE_TTL:
+            return copy.deepcopy(entry[1])
+        return None
+    
+    def _cache_metadata(self, asset_id: str, result: Dict[str, Any]) -> None:
+        """
+        Store getAsset metadata, evicting the oldest entry when the cache is full.
+        
+        Args:
+            asset_id: NFT asset ID (mint address)
+            result: Metadata returned by the API
+        """
+        if asset_id not in self._metadata_cache and len(self._metadata_cache) >= self.METADATA_CACHE_SIZE:
+            # Evict the oldest entry
+            self._metadata_cache.pop(next(iter(self._metadata_cache)), None)
+        self._metadata_cache[asset_id] = (time.monotonic(), copy.deepcopy(result))
     
     def search_assets(self, owner_address: str, compressed: bool = False, page: int = 1, limit: int = 1000) -> Dict[str, Any]:
         """
@@ -206,10 +614,55 @@ class HeliusAPIClient:
         
         return self._make_request("searchAssets", params)
     
-    def _is_valid_solana_address(self, address: str) -> bool:
+    def get_all_assets_by_owner(self, owner_address: str, max_pages: int = 10, limit: int = 1000) -> Dict[str, Any]:
+        """
+        Fetch every page of an owner's assets, batching page requests into single POSTs.
+        
+        Args:
+            owner_address: Owner wallet address
+            max_pages: Maximum number of pages to fetch
+            limit: Number of results per page
+            
+        Returns:
+            Dictionary with the merged "items" of all pages and their "total"
+            
+        Raises:
+            HeliusAPIError: If request fails
+        """
+        if not owner_address or not isinstance(owner_address, str):
+            raise HeliusAPIError("Owner address must be a non-empty string")
+        
+        if not self._is_valid_solana_address(owner_address):
+            raise HeliusAPIError(f"Invalid owner address format: {owner_address}")
+        
+        items = []
+        page = 1
+        while page <= max_pages:
+            pages = range(page, min(page + self.MAX_BATCH_SIZE, max_pages + 1))
+            calls = [
+                ("searchAssets", {"ownerAddress": owner_address, "page": p, "limit": limit})
+                for p in pages
+            ]
+            
+            for result in self._make_batch_request(calls):
+                page_items = result.get("items", [])
+                items.extend(page_items)
+                if len(page_items) < limit:
+                    # A short page is the last one
+                    return {"total": len(items), "items": items}
+            
+            page += len(pages)
+        
+        return {"total": len(items), "items": items}
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _is_valid_solana_address(address: str) -> bool:
         """
         Basic validation for Solana wallet address.
         
+        Results are memoized since gallery workloads validate the same wallets and mints repeatedly.
+        
         Args:
             address: Address to validate
             
@@ -222,11 +675,12 @@ class HeliusAPIClient:
         # For testing purposes, allow test wallet addresses
         if address.startswith('test-'):
             return True
-        
-        # Solana addresses are base58-encoded, typically 32-44 characters
-        import re
-        pattern = r'^[1-9A-HJ-NP-Za-km-z]{32,44}$'
-        return bool(re.match(pattern, address))
+
+        # Base58-encoded 32-byte keys are 32-44 characters; reject others without touching the regex
+        if not 32 <= len(address) <= 44:
+            return False
+
+        return _SOLANA_ADDRESS_RE.fullmatch(address) is not None
     
     def get_wallet_balance(self, wallet_address: str) -> Dict[str, Any]:
         """
@@ -256,13 +710,20 @@ class HeliusAPIClient:
         """
         Check if Helius API is accessible.
         
+        A success is reused for CONNECTIVITY_CACHE_TTL seconds so polling
+        callers don't issue a getSlot on every check. Failures are not cached.
+        
         Returns:
             True if accessible, False otherwise
         """
+        if time.monotonic() - self._last_ok_at < self.CONNECTIVITY_CACHE_TTL:
+            return True
+        
         try:
             # Try a simple getSlot call to test connectivity
             params = []
             self._make_request("getSlot", params)
+            self._last_ok_at = time.monotonic()
             return True
         except Exception:
             return False 
\ No newline at end of file
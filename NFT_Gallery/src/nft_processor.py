@@ -1,13 +1,27 @@
 """
 NFT processing logic for downloading and managing Solana NFTs.
 """
+import asyncio
+import functools
+import json
 import os
 import logging
-from typing import Dict, List, Optional, Any
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple
 from .helius_api import HeliusAPIClient, HeliusAPIError
 from .file_manager import FileManager, FileManagerError
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+import aiohttp
+import diskcache
+from aiolimiter import AsyncLimiter
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 class NFTProcessorError(Exception):
@@ -15,16 +29,239 @@ class NFTProcessorError(Exception):
     pass
 
 
+# Image extension anywhere in a URL (case-insensitive) and well-known image hosts
+_IMAGE_EXT_RE = re.compile(r'\.(?:jpe?g|png|gif|webp|svg|bmp|tiff)', re.IGNORECASE)
+_IMAGE_DOMAIN_RE = re.compile(r'ipfs\.io|arweave\.net|nftstorage\.link|cloudflare-ipfs\.com|gateway\.pinata\.cloud')
+
+# Common image field names in NFT metadata, in priority order
+_IMAGE_FIELDS = (
+    'image', 'image_url', 'imageUrl', 'image_uri', 'imageUri',
+    'image_data', 'imageData', 'img', 'img_url', 'imgUrl'
+)
+_IMAGE_FIELD_SET = frozenset(_IMAGE_FIELDS)
+_IMAGE_FIELDS_LOWER = frozenset(field.lower() for field in _IMAGE_FIELDS)
+
+_URL_PREFIXES = ('http://', 'https://', 'ipfs://', 'ar://')
+
+# IPFS gateway URL prefixes, shared by every ipfs:// URI instead of formatted per call
+_IPFS_GATEWAYS = (
+    'https://ipfs.io/ipfs/',
+    'https://cloudflare-ipfs.com/ipfs/',
+    'https://gateway.pinata.cloud/ipfs/',
+    'https://dweb.link/ipfs/',
+    'https://nftstorage.link/ipfs/'
+)
+
+# Fields that may hold a metadata URI on an asset and on its content, in priority order
+_ASSET_URI_FIELDS = ('token_uri', 'tokenUri', 'uri', 'metadata_uri')
+_CONTENT_URI_FIELDS = ('uri', 'metadata_uri', 'token_uri')
+_ASSET_URI_FIELD_SET = frozenset(_ASSET_URI_FIELDS)
+_CONTENT_URI_FIELD_SET = frozenset(_CONTENT_URI_FIELDS)
+
+# Failed-download error keywords and their types, in priority order
+_DOWNLOAD_ERROR_TYPES = (
+    ('403', 'forbidden'),
+    ('404', 'not_found'),
+    ('timeout', 'timeout'),
+    ('ssl', 'ssl_error'),
+    ('json', 'json_response'),
+    ('empty', 'empty_file'),
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _classify_download_error(error: str) -> str:
+    """Map a download error message to a coarse error type."""
+    lowered = error.lower()
+    return next((error_type for keyword, error_type in _DOWNLOAD_ERROR_TYPES if keyword in lowered), 'unknown')
+
+
+@functools.lru_cache(maxsize=1024)
+def _url_domain(url: str) -> str:
+    """Return the network location of a URL, or 'unknown' if it can't be parsed."""
+    try:
+        return urlparse(url).netloc
+    except ValueError:
+        return 'unknown'
+
+
+def _children(obj: Any) -> Iterator[Tuple[Optional[str], Any]]:
+    """Yield (key, value) pairs of a dict, or (None, item) pairs of a list."""
+    if isinstance(obj, dict):
+        return iter(obj.items())
+    return ((None, item) for item in obj)
+
+
+def _find_nested_string(root: Any, match: Callable[[str, str], bool], max_depth: int = 3) -> Optional[str]:
+    """
+    Find the first non-empty string dict value accepted by match, depth first.
+    
+    Walks nested dicts and lists with an explicit stack of iterators, visiting
+    values in the same order as a recursive search limited to max_depth levels.
+    Containers shared between branches (or forming cycles) are only walked
+    again when reached at a shallower depth, where they may hide more levels.
+    
+    Args:
+        root: Parsed JSON object to search
+        match: Predicate called with (key, value) for string values of dicts
+        max_depth: Number of container levels to descend into
+        
+    Returns:
+        The first matching value, or None
+    """
+    if max_depth <= 0 or not isinstance(root, (dict, list)):
+        return None
+    
+    # Shallowest depth each container has been walked from, keyed by id()
+    visited = {id(root): 0}
+    stack = [(_children(root), 0)]
+    while stack:
+        children, depth = stack[-1]
+        item = next(children, None)
+        if item is None:
+            stack.pop()
+            continue
+        
+        key, value = item
+        if isinstance(value, str):
+            if key is not None and value and match(key, value):
+                return value
+        elif depth + 1 < max_depth and isinstance(value, (dict, list)):
+            if visited.get(id(value), max_depth) <= depth + 1:
+                continue
+            visited[id(value)] = depth + 1
+            stack.append((_children(value), depth + 1))
+    
+    return None
+
+
+def _is_image_like_url(key: str, value: str) -> bool:
+    """Check whether a string looks like an image URL by extension or host."""
+    return value.startswith(_URL_PREFIXES) and bool(_IMAGE_EXT_RE.search(value) or _IMAGE_DOMAIN_RE.search(value))
+
+
+def _is_image_field_url(key: str, value: str) -> bool:
+    """Check whether a key names an image field and its value is a URL."""
+    return key.lower() in _IMAGE_FIELDS_LOWER and value.startswith(_URL_PREFIXES)
+
+
+def _first_str_field(obj: Any, fields: Sequence[str],
+                     field_set: Optional[FrozenSet[str]] = None) -> Optional[str]:
+    """
+    Return the first non-empty string value among fields, in order, or None if obj is not a dict.
+    
+    Passing the fields as a precomputed field_set lets one C-level set
+    intersection find the keys present, so only those are checked in order.
+    """
+    if not isinstance(obj, dict):
+        return None
+    present = obj.keys() & (field_set or fields)
+    if present:
+        for field in fields:
+            if field in present:
+                value = obj[field]
+                if isinstance(value, str) and value:
+                    return value
+    return None
+
+
+def _first_file_image_uri(asset: Dict[str, Any]) -> Optional[str]:
+    """Return content.files[0].uri when it is a lowercase image/ MIME, the usual Helius DAS shape."""
+    try:
+        first = asset["content"]["files"][0]
+        if first["mime"].startswith("image/"):
+            return first["uri"] or None
+    except (KeyError, IndexError, TypeError, AttributeError):
+        pass
+    return None
+
+
+def _safe_unlink(path: str) -> Tuple[str, bool, Optional[str]]:
+    """Delete a file, returning (path, removed, error message)."""
+    try:
+        os.unlink(path)
+        return path, True, None
+    except OSError as e:
+        return path, False, str(e)
+
+
+def _loads_json(body: bytes) -> Any:
+    """Decode a JSON body with orjson, falling back to the lenient stdlib parser."""
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        # e.g. NaN literals or a UTF-8 BOM, which orjson rejects
+        return json.loads(body)
+
+
+def _require_no_running_loop(alternative: str) -> None:
+    """Raise NFTProcessorError when called inside a running event loop, where asyncio.run() fails."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    raise NFTProcessorError(f"Cannot run from inside an active event loop; await {alternative} instead")
+
+
 class NFTProcessor:
     """Main processor for NFT download operations."""
     
-    def __init__(self, wallet_address: str, output_dir: str = "~/Pictures/NFTs"):
+    # Concurrency limits for the asyncio download pipeline
+    MAX_CONCURRENT_NFTS = 64
+    MAX_CONNECTIONS_PER_HOST = 8
+    
+    METADATA_TIMEOUT = 10
+    METADATA_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
+    
+    # On-disk metadata cache; ipfs:// and ar:// bodies are immutable and never expire
+    DEFAULT_METADATA_CACHE_DIR = "~/.cache/nft_gallery/metadata"
+    METADATA_HTTP_CACHE_TTL = 86400
+    # URIs no gateway could serve are not retried for this long (seconds)
+    METADATA_FAILURE_CACHE_TTL = 600
+    
+    # Per-asset memo of extracted image and metadata URIs
+    URL_CACHE_SIZE = 10_000
+    
+    # Threads resolving asset filenames in cleanup_orphaned_files
+    CLEANUP_WORKERS = 32
+    # Threads deleting orphaned files
+    UNLINK_WORKERS = 8
+    
+    # IPFS gateways are raced; each gets this long before it is given up on
+    GATEWAY_RACE_TIMEOUT = 3
+    # Weight of the newest sample in each gateway's smoothed latency
+    GATEWAY_STATS_WEIGHT = 0.2
+    # Async requests allowed per gateway host in each rate period (seconds)
+    GATEWAY_MAX_RATE = 10
+    GATEWAY_RATE_PERIOD = 1.0
+    # Consecutive failures that trip a gateway's circuit breaker, and how long it then sits out (seconds)
+    GATEWAY_FAILURE_THRESHOLD = 5
+    GATEWAY_COOLDOWN = 30
+    
+    # Connection pooling and retries for synchronous metadata fetches
+    HTTP_POOL_CONNECTIONS = 32
+    HTTP_POOL_MAXSIZE = 64
+    HTTP_MAX_RETRIES = 4
+    HTTP_BACKOFF_FACTOR = 0.5
+    HTTP_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    # Connection pool size of the metadata session shared by batch()
+    BATCH_POOL_MAXSIZE = 128
+    
+    def __init__(self, wallet_address: str, output_dir: str = "~/Pictures/NFTs",
+                 metadata_cache_dir: Optional[str] = DEFAULT_METADATA_CACHE_DIR,
+                 shared_helius: Optional[HeliusAPIClient] = None,
+                 shared_http: Optional[requests.Session] = None):
         """
         Initialize NFT processor.
         
         Args:
             wallet_address: Solana wallet address to fetch NFTs from
             output_dir: Directory to store NFT images
+            metadata_cache_dir: Directory persisting fetched metadata across runs, or None to disable
+            shared_helius: Helius client to reuse instead of creating one from HELIUS_API_KEY
+            shared_http: Metadata session to reuse instead of building a new pool
             
         Raises:
             NFTProcessorError: If initialization fails
@@ -34,23 +271,179 @@ class NFTProcessor:
         
         # Initialize components
         try:
-            # Get Helius API key from environment variable
-            self.api_key = os.getenv("HELIUS_API_KEY")
-            if not self.api_key:
-                raise NFTProcessorError("HELIUS_API_KEY environment variable is required")
-            
-            self.helius_client = HeliusAPIClient(self.api_key)
+            if shared_helius is not None:
+                self.api_key = shared_helius.api_key
+                self.helius_client = shared_helius
+            else:
+                # Get Helius API key from environment variable
+                self.api_key = os.getenv("HELIUS_API_KEY")
+                if not self.api_key:
+                    raise NFTProcessorError("HELIUS_API_KEY environment variable is required")
+                
+                self.helius_client = HeliusAPIClient(self.api_key)
             self.file_manager = FileManager(output_dir)
-        except (HeliusAPIError, FileManagerError) as e:
+            self._meta_cache = (
+                diskcache.Cache(os.path.expanduser(metadata_cache_dir)) if metadata_cache_dir else None
+            )
+        except (HeliusAPIError, FileManagerError, OSError) as e:
             raise NFTProcessorError(f"Failed to initialize NFT processor: {str(e)}")
         
+        # Pooled session so repeated gateway hits reuse connections
+        self._http = shared_http if shared_http is not None else self._build_http_session()
+        # Smoothed response time per gateway host, used to order gateway races
+        self._gateway_stats: Dict[str, float] = {}
+        # Per-host async request limiters and monotonic times 429'd hosts may be retried
+        self._gateway_limiters: Dict[str, AsyncLimiter] = {}
+        self._gateway_retry_at: Dict[str, float] = {}
+        # Consecutive failures per gateway host and monotonic times tripped hosts rejoin races
+        self._gateway_failures: Dict[str, int] = {}
+        self._gateway_open_until: Dict[str, float] = {}
+        # Keyed by asset ID so cleanup_orphaned_files reuses what process_wallet found
+        self._image_url_cache: Dict[str, str] = {}
+        self._metadata_uri_cache: Dict[str, str] = {}
+        # Guards evictions from the two caches above across worker threads
+        self._cache_lock = threading.Lock()
+        # Assets whose image could only be found in off-chain metadata
+        self._metadata_refetch_count = 0
+        # Failed downloads stored column-wise; report rows are built on demand
+        self._failed_names: List[str] = []
+        self._failed_ids: List[str] = []
+        self._failed_urls: List[str] = []
+        self._failed_errors: List[str] = []
+        self._failed_timestamps: List[int] = []
+        # Reference points for turning monotonic failure times into epoch seconds
+        self._epoch0 = time.time()
+        self._monotonic0 = time.monotonic_ns()
+        
         # Setup logging
         self.logger = logging.getLogger(__name__)
     
+    @classmethod
+    def batch(cls, wallet_addresses: List[str], output_dir: str = "~/Pictures/NFTs",
+              metadata_cache_dir: Optional[str] = DEFAULT_METADATA_CACHE_DIR) -> Dict[str, Dict[str, Any]]:
+        """
+        Process several wallets concurrently over one Helius client and one metadata session.
+        
+        Args:
+            wallet_addresses: Solana wallet addresses to fetch NFTs from
+            output_dir: Directory to store NFT images
+            metadata_cache_dir: Directory persisting fetched metadata across runs, or None to disable
+            
+        Must not be called from inside a running event loop; there, create the
+        processors and await their process_wallet_async() coroutines instead.
+        
+        Returns:
+            Dictionary mapping each wallet to its processing results summary,
+            or to {"error": message} if the wallet could not be processed
+            
+        Raises:
+            NFTProcessorError: If HELIUS_API_KEY is missing, initialization fails
+                or an event loop is already running
+        """
+        _require_no_running_loop("process_wallet_async() on each processor")
+        
+        api_key = os.getenv("HELIUS_API_KEY")
+        if not api_key:
+            raise NFTProcessorError("HELIUS_API_KEY environment variable is required")
+        
+        try:
+            helius_client = HeliusAPIClient(api_key)
+        except HeliusAPIError as e:
+            raise NFTProcessorError(f"Failed to initialize NFT processor: {str(e)}")
+        http = cls._build_http_session(pool_maxsize=cls.BATCH_POOL_MAXSIZE)
+        
+        try:
+            processors = [
+                cls(wallet, output_dir, metadata_cache_dir, shared_helius=helius_client, shared_http=http)
+                for wallet in wallet_addresses
+            ]
+            
+            async def run_all() -> List[Any]:
+                return await asyncio.gather(
+                    *(processor.process_wallet_async() for processor in processors),
+                    return_exceptions=True
+                )
+            
+            outcomes = asyncio.run(run_all())
+        finally:
+            http.close()
+            helius_client.close()
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        for wallet, outcome in zip(wallet_addresses, outcomes):
+            if isinstance(outcome, BaseException):
+                logging.getLogger(__name__).error("Failed to process wallet %s: %s", wallet, outcome)
+                results[wallet] = {"error": str(outcome)}
+            else:
+                results[wallet] = outcome
+        return results
+    
+    @classmethod
+    def _build_http_session(cls, pool_maxsize: int = HTTP_POOL_MAXSIZE) -> requests.Session:
+        """
+        Build the HTTP session used for synchronous metadata fetches.
+        
+        Requests under the IPFS gateway prefixes go through an adapter that
+        never retries: those are raced, so the race is the retry and
+        GATEWAY_RACE_TIMEOUT bounds each gateway rather than each attempt.
+        
+        Args:
+            pool_maxsize: Maximum pooled connections per host
+            
+        Returns:
+            Session with pooled adapters (retrying except for raced gateways) and default headers
+        """
+        retry = Retry(
+            total=cls.HTTP_MAX_RETRIES,
+            backoff_factor=cls.HTTP_BACKOFF_FACTOR,
+            status_forcelist=cls.HTTP_RETRY_STATUS_CODES,
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(
+            pool_connections=cls.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry
+        )
+        
+        session = requests.Session()
+        session.headers.update(cls.METADATA_HEADERS)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        
+        race_adapter = HTTPAdapter(
+            pool_connections=len(_IPFS_GATEWAYS),
+            pool_maxsize=pool_maxsize,
+            max_retries=0
+        )
+        for gateway in _IPFS_GATEWAYS:
+            session.mount(gateway, race_adapter)
+        return session
+    
     def process_wallet(self) -> Dict[str, Any]:
         """
         Process all NFTs in the wallet.
         
+        Runs process_wallet_async on a new event loop, so it must not be called
+        from inside a running one (e.g. a notebook or an async service); await
+        process_wallet_async() there instead.
+        
+        Returns:
+            Processing results summary
+            
+        Raises:
+            NFTProcessorError: If processing fails or an event loop is already running
+        """
+        _require_no_running_loop("process_wallet_async()")
+        return asyncio.run(self.process_wallet_async())
+    
+    async def process_wallet_async(self) -> Dict[str, Any]:
+        """
+        Process all NFTs in the wallet concurrently.
+        
+        Up to MAX_CONCURRENT_NFTS assets are processed at once over a shared
+        aiohttp session that opens at most MAX_CONNECTIONS_PER_HOST
+        connections to any one gateway or image host.
+        
         Returns:
             Processing results summary
             
@@ -58,17 +451,20 @@ class NFTProcessor:
             NFTProcessorError: If processing fails
         """
         try:
-            self.logger.info(f"Starting NFT processing for wallet: {self.wallet_address}")
+            self.logger.info("Starting NFT processing for wallet: %s", self.wallet_address)
             
             # Fetch NFTs from API
-            nft_data = self._fetch_nfts()
+            nft_data = await asyncio.to_thread(self._fetch_nfts)
             
             if not nft_data:
                 raise NFTProcessorError("Invalid response from Helius API")
             
             # DAS API returns data in a specific format with 'items' array
             assets = nft_data.get("items", []) if isinstance(nft_data, dict) else []
-            self.logger.info(f"Found {len(assets)} NFTs in wallet")
+            self.logger.info("Found %d NFTs in wallet", len(assets))
+            
+            # Resolve off-chain metadata through Helius in bulk before falling back to gateways
+            await self._prefetch_metadata(assets)
             
             # Process each NFT
             results = {
@@ -79,25 +475,86 @@ class NFTProcessor:
                 "errors": []
             }
             
-            for asset in assets:
-                try:
-                    success = self._process_single_nft(asset)
-                    if success:
-                        results["downloaded"] += 1
-                    else:
-                        results["skipped"] += 1
-                except Exception as e:
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_NFTS)
+            connector = aiohttp.TCPConnector(limit_per_host=self.MAX_CONNECTIONS_PER_HOST)
+            
+            async with aiohttp.ClientSession(connector=connector) as session:
+                async def process(asset: Dict[str, Any]) -> bool:
+                    async with semaphore:
+                        return await self._process_single_nft_async(session, asset)
+                
+                outcomes = await asyncio.gather(*(process(asset) for asset in assets), return_exceptions=True)
+            
+            for asset, outcome in zip(assets, outcomes):
+                if isinstance(outcome, BaseException):
                     results["failed"] += 1
-                    error_msg = f"Failed to process NFT {asset.get('id', 'unknown')}: {str(e)}"
+                    error_msg = f"Failed to process NFT {asset.get('id', 'unknown')}: {str(outcome)}"
                     results["errors"].append(error_msg)
                     self.logger.error(error_msg)
+                elif outcome:
+                    results["downloaded"] += 1
+                else:
+                    results["skipped"] += 1
             
-            self.logger.info(f"Processing complete: {results['downloaded']} downloaded, {results['skipped']} skipped, {results['failed']} failed")
+            self.logger.info("Processing complete: %d downloaded, %d skipped, %d failed",
+                             results['downloaded'], results['skipped'], results['failed'])
             return results
             
         except Exception as e:
             raise NFTProcessorError(f"Failed to process wallet: {str(e)}")
     
+    async def _prefetch_metadata(self, assets: List[Dict[str, Any]]) -> None:
+        """
+        Seed the metadata cache from Helius token-metadata batches.
+        
+        Assets without an inline image normally need their metadata URI fetched
+        from a gateway. Their mints are looked up TOKEN_METADATA_BATCH_SIZE at a
+        time instead, with the chunks sent concurrently, and the returned
+        off-chain documents are cached under each asset's metadata URI. Mints
+        Helius can't resolve, or failed chunks, fall back to the gateways.
+        Skipped when the metadata cache is disabled.
+        
+        Args:
+            assets: NFT assets from Helius DAS API
+        """
+        if self._meta_cache is None:
+            return
+        
+        pending: Dict[str, str] = {}
+        for asset in assets:
+            mint = asset.get("id")
+            if not isinstance(mint, str) or not HeliusAPIClient._is_valid_solana_address(mint):
+                continue
+            if self._extract_inline_image_url(asset):
+                continue
+            metadata_uri = self._get_metadata_uri(asset)
+            if metadata_uri and self._get_cached_metadata(metadata_uri) is None:
+                pending[mint] = metadata_uri
+        
+        if not pending:
+            return
+        
+        mints = list(pending)
+        size = HeliusAPIClient.TOKEN_METADATA_BATCH_SIZE
+        chunks = [mints[start:start + size] for start in range(0, len(mints), size)]
+        outcomes = await asyncio.gather(
+            *(asyncio.to_thread(self.helius_client.get_token_metadata_batch, chunk) for chunk in chunks),
+            return_exceptions=True
+        )
+        
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, BaseException):
+                self.logger.warning("Token metadata batch of %d mints failed: %s", len(chunk), outcome)
+                continue
+            for entry in outcome:
+                if not isinstance(entry, dict):
+                    continue
+                off_chain = entry.get("offChainMetadata") or {}
+                metadata = off_chain.get("metadata") if isinstance(off_chain, dict) else None
+                mint = entry.get("account")
+                if mint in pending and isinstance(metadata, dict) and metadata:
+                    self._cache_metadata(pending[mint], metadata)
+    
     def _fetch_nfts(self) -> Dict[str, Any]:
         """
         Fetch NFTs from Helius DAS API.
@@ -132,7 +589,7 @@ class NFTProcessor:
         image_url = self._extract_image_url(asset)
         
         if not image_url:
-            self.logger.warning(f"NFT {asset_id} has no image URL, skipping")
+            self.logger.warning("NFT %s has no image URL, skipping", asset_id)
             return False
         
         # Generate filename
@@ -140,26 +597,72 @@ class NFTProcessor:
         
         # Check if file already exists
         if self.file_manager.file_exists(filename):
-            self.logger.info(f"NFT {name} ({asset_id}) already exists, skipping")
+            self.logger.info("NFT %s (%s) already exists, skipping", name, asset_id)
             return False
         
         # Download image
         try:
-            self.logger.debug(f"Attempting to download image for {name} ({asset_id}) from: {image_url}")
+            self.logger.debug("Attempting to download image for %s (%s) from: %s", name, asset_id, image_url)
             success = self.file_manager.download_image(image_url, filename)
             if success:
-                self.logger.info(f"Successfully downloaded: {name} ({asset_id})")
+                self.logger.info("Successfully downloaded: %s (%s)", name, asset_id)
                 return True
             else:
-                self.logger.error(f"Failed to download: {name} ({asset_id})")
+                self.logger.error("Failed to download: %s (%s)", name, asset_id)
                 return False
         except FileManagerError as e:
-            self.logger.error(f"File manager error for {name} ({asset_id}): {str(e)}")
+            self.logger.error("File manager error for %s (%s): %s", name, asset_id, e)
             # Track failed downloads for reporting
             self._track_failed_download(name, asset_id, image_url, str(e))
             return False
         except Exception as e:
-            self.logger.error(f"Unexpected error downloading {name} ({asset_id}): {str(e)}")
+            self.logger.error("Unexpected error downloading %s (%s): %s", name, asset_id, e)
+            self._track_failed_download(name, asset_id, image_url, str(e))
+            return False
+    
+    async def _process_single_nft_async(self, session: aiohttp.ClientSession, asset: Dict[str, Any]) -> bool:
+        """
+        Process a single NFT asset on a shared aiohttp session.
+        
+        Args:
+            session: HTTP session for metadata and image requests
+            asset: NFT asset data from Helius DAS API
+            
+        Returns:
+            True if processed successfully, False if skipped
+            
+        Raises:
+            NFTProcessorError: If processing fails
+        """
+        asset_id = asset.get("id", "")
+        name = asset.get("content", {}).get("metadata", {}).get("name", "")
+        image_url = await self._extract_image_url_async(session, asset)
+        
+        if not image_url:
+            self.logger.warning("NFT %s has no image URL, skipping", asset_id)
+            return False
+        
+        filename = self.file_manager._generate_safe_filename(name, asset_id, asset_id, image_url)
+        
+        if self.file_manager.file_exists(filename):
+            self.logger.info("NFT %s (%s) already exists, skipping", name, asset_id)
+            return False
+        
+        try:
+            self.logger.debug("Attempting to download image for %s (%s) from: %s", name, asset_id, image_url)
+            success = await self.file_manager.download_image_async(session, image_url, filename)
+            if success:
+                self.logger.info("Successfully downloaded: %s (%s)", name, asset_id)
+                return True
+            else:
+                self.logger.error("Failed to download: %s (%s)", name, asset_id)
+                return False
+        except FileManagerError as e:
+            self.logger.error("File manager error for %s (%s): %s", name, asset_id, e)
+            self._track_failed_download(name, asset_id, image_url, str(e))
+            return False
+        except Exception as e:
+            self.logger.error("Unexpected error downloading %s (%s): %s", name, asset_id, e)
             self._track_failed_download(name, asset_id, image_url, str(e))
             return False
     
@@ -173,16 +676,11 @@ class NFTProcessor:
             image_url: Image URL that failed
             error: Error message
         """
-        if not hasattr(self, '_failed_downloads'):
-            self._failed_downloads = []
-        
-        self._failed_downloads.append({
-            'name': name,
-            'asset_id': asset_id,
-            'image_url': image_url,
-            'error': error,
-            'timestamp': time.time()
-        })
+        self._failed_names.append(name)
+        self._failed_ids.append(asset_id)
+        self._failed_urls.append(image_url)
+        self._failed_errors.append(error)
+        self._failed_timestamps.append(time.monotonic_ns())
     
     def get_failed_downloads_report(self) -> List[Dict[str, Any]]:
         """
@@ -191,7 +689,19 @@ class NFTProcessor:
         Returns:
             List of failed download details
         """
-        return getattr(self, '_failed_downloads', [])
+        return [
+            {
+                'name': name,
+                'asset_id': asset_id,
+                'image_url': image_url,
+                'error': error,
+                'timestamp': self._epoch0 + (timestamp - self._monotonic0) / 1e9
+            }
+            for name, asset_id, image_url, error, timestamp in zip(
+                self._failed_names, self._failed_ids, self._failed_urls,
+                self._failed_errors, self._failed_timestamps
+            )
+        ]
     
     def get_failed_downloads_summary(self) -> Dict[str, Any]:
         """
@@ -200,45 +710,15 @@ class NFTProcessor:
         Returns:
             Summary of failed downloads
         """
-        failed_downloads = self.get_failed_downloads_report()
-        
-        error_counts = {}
-        domain_counts = {}
-        
-        for failed in failed_downloads:
-            error = failed['error']
-            url = failed['image_url']
-            
-            # Count by error type
-            error_type = 'unknown'
-            if '403' in error:
-                error_type = 'forbidden'
-            elif '404' in error:
-                error_type = 'not_found'
-            elif 'timeout' in error.lower():
-                error_type = 'timeout'
-            elif 'ssl' in error.lower():
-                error_type = 'ssl_error'
-            elif 'json' in error.lower():
-                error_type = 'json_response'
-            elif 'empty' in error.lower():
-                error_type = 'empty_file'
-            
-            error_counts[error_type] = error_counts.get(error_type, 0) + 1
-            
-            # Count by domain
-            try:
-                from urllib.parse import urlparse
-                domain = urlparse(url).netloc
-                domain_counts[domain] = domain_counts.get(domain, 0) + 1
-            except:
-                domain_counts['unknown'] = domain_counts.get('unknown', 0) + 1
+        # Count by error type and by domain straight from the columns
+        error_counts = Counter(map(_classify_download_error, self._failed_errors))
+        domain_counts = Counter(map(_url_domain, self._failed_urls))
         
         return {
-            'total_failed': len(failed_downloads),
-            'error_counts': error_counts,
-            'domain_counts': domain_counts,
-            'failed_downloads': failed_downloads
+            'total_failed': len(self._failed_errors),
+            'error_counts': dict(error_counts),
+            'domain_counts': dict(domain_counts),
+            'failed_downloads': self.get_failed_downloads_report()
         }
     
     def _extract_image_url(self, asset: Dict[str, Any]) -> str:
@@ -251,6 +731,93 @@ class NFTProcessor:
         Returns:
             Image URL or empty string if not found
         """
+        asset_id = asset.get("id")
+        cached = self._image_url_cache.get(asset_id)
+        if cached is not None:
+            return cached
+        
+        image_url = self._extract_inline_image_url(asset)
+        if not image_url:
+            # Last resort: Try to extract from metadata URI (IPFS/Arweave)
+            # This is the most robust method for NFTs that store images in IPFS
+            image_url = self._extract_image_url_from_metadata(asset)
+        
+        self._remember_image_url(asset_id, image_url)
+        return image_url
+    
+    async def _extract_image_url_async(self, session: aiohttp.ClientSession, asset: Dict[str, Any]) -> str:
+        """
+        Extract image URL from asset data, fetching off-chain metadata on a shared session.
+        
+        Args:
+            session: HTTP session for metadata requests
+            asset: NFT asset data from Helius DAS API
+            
+        Returns:
+            Image URL or empty string if not found
+        """
+        asset_id = asset.get("id")
+        cached = self._image_url_cache.get(asset_id)
+        if cached is not None:
+            return cached
+        
+        image_url = self._extract_inline_image_url(asset)
+        if not image_url:
+            metadata_uri = self._get_metadata_uri(asset)
+            metadata = None
+            if metadata_uri:
+                self._metadata_refetch_count += 1
+                metadata = await self._fetch_metadata_async(session, metadata_uri)
+            image_url = self._extract_image_from_metadata(metadata) if metadata else ""
+        
+        self._remember_image_url(asset_id, image_url)
+        return image_url
+    
+    def _remember_image_url(self, asset_id: Optional[str], image_url: str) -> None:
+        """
+        Cache an extracted image URL for an asset.
+        
+        Misses are not cached because they may come from a gateway outage.
+        
+        Args:
+            asset_id: Asset ID the URL belongs to
+            image_url: Extracted image URL
+        """
+        if asset_id and image_url:
+            self._bounded_put(self._image_url_cache, asset_id, image_url)
+    
+    def _bounded_put(self, cache: Dict[str, str], key: str, value: str) -> None:
+        """
+        Store a value, evicting the oldest entry when the cache is full.
+        
+        Cleanup and metadata thread pools write concurrently, so the size
+        check, eviction and store happen under one lock.
+        
+        Args:
+            cache: Cache dictionary
+            key: Cache key
+            value: Value to store
+        """
+        with self._cache_lock:
+            if key not in cache and len(cache) >= self.URL_CACHE_SIZE:
+                cache.pop(next(iter(cache)), None)
+            cache[key] = value
+    
+    def _extract_inline_image_url(self, asset: Dict[str, Any]) -> str:
+        """
+        Extract image URL from the asset data itself, without any network requests.
+        
+        Args:
+            asset: NFT asset data from Helius DAS API
+            
+        Returns:
+            Image URL or empty string if not found
+        """
+        # Fast path: the first file is the image for almost every DAS asset
+        uri = _first_file_image_uri(asset)
+        if uri:
+            return uri
+        
         # Try multiple possible locations for image URL
         content = asset.get("content", {})
         
@@ -285,60 +852,23 @@ class NFTProcessor:
             external_url = metadata.get("external_url", "")
             if external_url:
                 # Check if it looks like an image URL
-                if any(ext in external_url.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.bmp', '.tiff']):
+                if _IMAGE_EXT_RE.search(external_url):
                     return external_url
                 # Also check for common image hosting domains
-                image_domains = ['ipfs.io', 'arweave.net', 'nftstorage.link', 'cloudflare-ipfs.com', 'gateway.pinata.cloud']
-                if any(domain in external_url for domain in image_domains):
+                if _IMAGE_DOMAIN_RE.search(external_url):
                     return external_url
         
         # Fifth priority: Check for any URI fields in the asset
         if "uri" in asset:
             uri = asset["uri"]
-            if uri and any(ext in uri.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.bmp', '.tiff']):
+            if uri and _IMAGE_EXT_RE.search(uri):
                 return uri
         
         # Sixth priority: Check for any URL-like fields in the entire asset
-        def search_for_urls(obj, max_depth=3, current_depth=0):
-            if current_depth >= max_depth:
-                return None
-            
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    if isinstance(value, str) and value:
-                        # Check if it looks like an image URL
-                        if value.startswith(('http://', 'https://', 'ipfs://', 'ar://')):
-                            if any(ext in value.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.bmp', '.tiff']):
-                                return value
-                            # Also check for image hosting domains
-                            image_domains = ['ipfs.io', 'arweave.net', 'nftstorage.link', 'cloudflare-ipfs.com', 'gateway.pinata.cloud']
-                            if any(domain in value for domain in image_domains):
-                                return value
-                    
-                    # Recursively search nested objects
-                    result = search_for_urls(value, max_depth, current_depth + 1)
-                    if result:
-                        return result
-                        
-            elif isinstance(obj, list):
-                for item in obj:
-                    result = search_for_urls(item, max_depth, current_depth + 1)
-                    if result:
-                        return result
-            
-            return None
-        
-        # Search the entire asset for image URLs
-        found_url = search_for_urls(asset)
+        found_url = _find_nested_string(asset, _is_image_like_url)
         if found_url:
             return found_url
         
-        # Seventh priority: Try to extract from metadata URI (IPFS/Arweave)
-        # This is the most robust method for NFTs that store images in IPFS
-        metadata_image_url = self._extract_image_url_from_metadata(asset)
-        if metadata_image_url:
-            return metadata_image_url
-        
         return ""
     
     def _extract_image_url_from_metadata(self, asset: Dict[str, Any]) -> str:
@@ -356,6 +886,7 @@ class NFTProcessor:
         if not metadata_uri:
             return ""
         
+        self._metadata_refetch_count += 1
         try:
             # Fetch the metadata
             metadata = self._fetch_metadata(metadata_uri)
@@ -368,7 +899,7 @@ class NFTProcessor:
                 return image_url
                 
         except Exception as e:
-            self.logger.debug(f"Failed to fetch metadata from {metadata_uri}: {str(e)}")
+            self.logger.debug("Failed to fetch metadata from %s: %s", metadata_uri, e)
         
         return ""
     
@@ -376,6 +907,26 @@ class NFTProcessor:
         """
         Get the metadata URI from the asset.
         
+        Args:
+            asset: NFT asset data
+            
+        Returns:
+            Metadata URI or empty string
+        """
+        asset_id = asset.get("id")
+        cached = self._metadata_uri_cache.get(asset_id)
+        if cached is not None:
+            return cached
+        
+        metadata_uri = self._find_metadata_uri(asset)
+        if asset_id:
+            self._bounded_put(self._metadata_uri_cache, asset_id, metadata_uri)
+        return metadata_uri
+    
+    def _find_metadata_uri(self, asset: Dict[str, Any]) -> str:
+        """
+        Search the asset's known locations for its metadata URI.
+        
         Args:
             asset: NFT asset data
             
@@ -397,18 +948,14 @@ class NFTProcessor:
             return metadata["uri"]
         
         # Priority 3: Check for token URI in various fields
-        for field in ["token_uri", "tokenUri", "uri", "metadata_uri"]:
-            if field in asset:
-                uri = asset[field]
-                if uri and isinstance(uri, str):
-                    return uri
+        uri = _first_str_field(asset, _ASSET_URI_FIELDS, _ASSET_URI_FIELD_SET)
+        if uri:
+            return uri
         
         # Priority 4: Check content for URI fields
-        for field in ["uri", "metadata_uri", "token_uri"]:
-            if field in content:
-                uri = content[field]
-                if uri and isinstance(uri, str):
-                    return uri
+        uri = _first_str_field(content, _CONTENT_URI_FIELDS, _CONTENT_URI_FIELD_SET)
+        if uri:
+            return uri
         
         # Priority 5: Check if the asset itself has a URI that might be metadata
         if "uri" in asset:
@@ -424,65 +971,379 @@ class NFTProcessor:
         """
         Fetch metadata from URI (IPFS, Arweave, HTTP).
         
+        When a URI resolves to several gateways they are raced and the first
+        successful response wins.
+        
         Args:
             metadata_uri: URI to fetch metadata from
             
         Returns:
             Parsed metadata or None if failed
         """
-        try:
-            # Handle IPFS URIs
-            if metadata_uri.startswith('ipfs://'):
-                ipfs_hash = metadata_uri.replace('ipfs://', '')
-                # Try multiple IPFS gateways
-                gateways = [
-                    f'https://ipfs.io/ipfs/{ipfs_hash}',
-                    f'https://cloudflare-ipfs.com/ipfs/{ipfs_hash}',
-                    f'https://gateway.pinata.cloud/ipfs/{ipfs_hash}',
-                    f'https://dweb.link/ipfs/{ipfs_hash}',
-                    f'https://nftstorage.link/ipfs/{ipfs_hash}'
-                ]
-                
-                for gateway_url in gateways:
-                    try:
-                        response = requests.get(gateway_url, timeout=10, headers={
-                            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                        })
-                        response.raise_for_status()
-                        return response.json()
-                    except Exception as e:
-                        self.logger.debug(f"Failed to fetch from {gateway_url}: {str(e)}")
-                        continue
+        metadata = self._get_cached_metadata(metadata_uri)
+        if metadata is None and not self._recently_failed(metadata_uri):
+            metadata = self._request_metadata(metadata_uri)
+            self._cache_metadata(metadata_uri, metadata)
+        return metadata
+    
+    def _request_metadata(self, metadata_uri: str) -> Optional[Dict[str, Any]]:
+        """
+        Request metadata from the URLs a URI resolves to, bypassing the disk cache.
+        
+        Args:
+            metadata_uri: URI to fetch metadata from
             
-            # Handle Arweave URIs
-            elif metadata_uri.startswith('ar://'):
-                ar_hash = metadata_uri.replace('ar://', '')
-                arweave_url = f'https://arweave.net/{ar_hash}'
-                try:
-                    response = requests.get(arweave_url, timeout=10, headers={
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    })
-                    response.raise_for_status()
-                    return response.json()
-                except Exception as e:
-                    self.logger.debug(f"Failed to fetch from Arweave {arweave_url}: {str(e)}")
+        Returns:
+            Parsed metadata or None if failed
+        """
+        urls = self._metadata_urls(metadata_uri)
+        if len(urls) > 1:
+            return self._race_metadata_urls(urls)
+        
+        for url in urls:
+            try:
+                return self._get_metadata_json(url, self.METADATA_TIMEOUT)
+            except Exception as e:
+                self.logger.debug("Failed to fetch from %s: %s", url, e)
+        
+        return None
+    
+    def _race_metadata_urls(self, urls: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Request every gateway at once in threads and return the first success.
+        
+        Args:
+            urls: Gateway URLs serving the same content
             
-            # Handle HTTP/HTTPS URIs
-            elif metadata_uri.startswith(('http://', 'https://')):
+        Returns:
+            Parsed metadata or None if every gateway failed
+        """
+        urls = self._order_gateways(urls)
+        start = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=len(urls))
+        try:
+            futures = {
+                executor.submit(self._get_metadata_json, url, self.GATEWAY_RACE_TIMEOUT): url
+                for url in urls
+            }
+            for future in as_completed(futures):
+                url = futures[future]
                 try:
-                    response = requests.get(metadata_uri, timeout=10, headers={
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    })
-                    response.raise_for_status()
-                    return response.json()
+                    metadata = future.result()
                 except Exception as e:
-                    self.logger.debug(f"Failed to fetch from {metadata_uri}: {str(e)}")
+                    self.logger.debug("Failed to fetch from %s: %s", url, e)
+                    self._record_gateway_latency(url, None)
+                    continue
+                self._record_gateway_latency(url, time.monotonic() - start)
+                return metadata
+        finally:
+            # Don't wait for the slower gateways
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return None
+    
+    def _get_metadata_json(self, url: str, timeout: float) -> Dict[str, Any]:
+        """
+        GET a metadata URL on the pooled session and decode its JSON body.
+        
+        Args:
+            url: HTTP URL to fetch
+            timeout: Request timeout in seconds
             
-        except Exception as e:
-            self.logger.debug(f"Error fetching metadata from {metadata_uri}: {str(e)}")
+        Returns:
+            Parsed metadata
+            
+        Raises:
+            requests.RequestException: If the request fails
+            ValueError: If the body is not valid JSON
+        """
+        response = self._http.get(url, timeout=timeout)
+        response.raise_for_status()
+        return _loads_json(response.content)
+    
+    async def _fetch_metadata_async(self, session: aiohttp.ClientSession, metadata_uri: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch metadata from URI (IPFS, Arweave, HTTP) on a shared aiohttp session.
+        
+        When a URI resolves to several gateways they are raced, the first
+        successful response wins and the remaining requests are cancelled.
+        
+        Args:
+            session: HTTP session to fetch with
+            metadata_uri: URI to fetch metadata from
+            
+        Returns:
+            Parsed metadata or None if failed
+        """
+        metadata = self._get_cached_metadata(metadata_uri)
+        if metadata is None and not self._recently_failed(metadata_uri):
+            metadata = await self._request_metadata_async(session, metadata_uri)
+            self._cache_metadata(metadata_uri, metadata)
+        return metadata
+    
+    async def _request_metadata_async(self, session: aiohttp.ClientSession,
+                                      metadata_uri: str) -> Optional[Dict[str, Any]]:
+        """
+        Request metadata on an aiohttp session, bypassing the disk cache.
+        
+        Args:
+            session: HTTP session to fetch with
+            metadata_uri: URI to fetch metadata from
+            
+        Returns:
+            Parsed metadata or None if failed
+        """
+        urls = self._metadata_urls(metadata_uri)
+        if len(urls) > 1:
+            return await self._race_metadata_urls_async(session, urls)
+        
+        for url in urls:
+            try:
+                return await self._get_metadata_json_async(session, url, self.METADATA_TIMEOUT)
+            except Exception as e:
+                self.logger.debug("Failed to fetch from %s: %s", url, e)
         
         return None
     
+    async def _race_metadata_urls_async(self, session: aiohttp.ClientSession,
+                                        urls: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Request every gateway at once and return the first success.
+        
+        Args:
+            session: HTTP session to fetch with
+            urls: Gateway URLs serving the same content
+            
+        Returns:
+            Parsed metadata or None if every gateway failed
+        """
+        start = time.monotonic()
+        tasks = {
+            asyncio.ensure_future(self._get_metadata_json_async(session, url, self.GATEWAY_RACE_TIMEOUT)): url
+            for url in self._order_gateways(urls)
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    url = tasks[task]
+                    if task.exception() is not None:
+                        self.logger.debug("Failed to fetch from %s: %s", url, task.exception())
+                        self._record_gateway_latency(url, None)
+                        continue
+                    self._record_gateway_latency(url, time.monotonic() - start)
+                    return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        return None
+    
+    async def _get_metadata_json_async(self, session: aiohttp.ClientSession, url: str,
+                                       timeout: float) -> Dict[str, Any]:
+        """
+        GET a metadata URL on an aiohttp session and decode its JSON body.
+        
+        Args:
+            session: HTTP session to fetch with
+            url: HTTP URL to fetch
+            timeout: Request timeout in seconds
+            
+        Returns:
+            Parsed metadata
+            
+        Raises:
+            aiohttp.ClientError: If the request fails
+            ValueError: If the body is not valid JSON
+        """
+        host = urlparse(url).netloc
+        await self._wait_for_gateway(host, timeout)
+        
+        async with self._gateway_limiter(host):
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout),
+                                   headers=self.METADATA_HEADERS) as response:
+                if response.status == 429:
+                    self._note_rate_limited(url, response.headers.get("Retry-After"))
+                response.raise_for_status()
+                # Gateways often serve JSON as text/plain or octet-stream, so ignore the content type
+                return _loads_json(await response.read())
+    
+    def _gateway_limiter(self, host: str) -> AsyncLimiter:
+        """
+        Get the request rate limiter for a gateway host, creating it on first use.
+        
+        Args:
+            host: Gateway network location
+            
+        Returns:
+            Limiter allowing GATEWAY_MAX_RATE requests per GATEWAY_RATE_PERIOD
+        """
+        limiter = self._gateway_limiters.get(host)
+        if limiter is None:
+            limiter = AsyncLimiter(self.GATEWAY_MAX_RATE, self.GATEWAY_RATE_PERIOD)
+            self._gateway_limiters[host] = limiter
+        return limiter
+    
+    async def _wait_for_gateway(self, host: str, timeout: float) -> None:
+        """
+        Wait out a gateway's Retry-After back-off if it ends within the request timeout.
+        
+        Args:
+            host: Gateway network location
+            timeout: Request timeout in seconds
+            
+        Raises:
+            aiohttp.ClientError: If the back-off outlasts the timeout
+        """
+        remaining = self._gateway_retry_at.get(host, 0.0) - time.monotonic()
+        if remaining <= 0:
+            return
+        if remaining > timeout:
+            raise aiohttp.ClientError(f"{host} is rate limited for another {remaining:.1f}s")
+        await asyncio.sleep(remaining)
+    
+    def _note_rate_limited(self, url: str, retry_after: Optional[str]) -> None:
+        """
+        Record a 429 from a gateway so later requests back off for its Retry-After.
+        
+        The 429 is ranked by the race's failure path like any other failed
+        response, so it is not recorded here as well.
+        
+        Args:
+            url: Gateway URL that answered 429
+            retry_after: Retry-After header value, if any
+        """
+        delay = HeliusAPIClient._parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.GATEWAY_RACE_TIMEOUT
+        self._gateway_retry_at[urlparse(url).netloc] = time.monotonic() + delay
+    
+    def _order_gateways(self, urls: List[str]) -> List[str]:
+        """
+        Order gateway URLs fastest first by their smoothed response times.
+        
+        Gateways without stats yet sort first so they get measured. Gateways
+        whose circuit breaker is open are left out, unless that would leave
+        none to try.
+        
+        Args:
+            urls: Gateway URLs
+            
+        Returns:
+            Reordered URLs
+        """
+        now = time.monotonic()
+        closed = [url for url in urls if self._gateway_open_until.get(urlparse(url).netloc, 0.0) <= now]
+        return sorted(closed or urls, key=lambda url: self._gateway_stats.get(urlparse(url).netloc, 0.0))
+    
+    def _record_gateway_latency(self, url: str, elapsed: Optional[float]) -> None:
+        """
+        Fold a gateway response time into its smoothed stats.
+        
+        GATEWAY_FAILURE_THRESHOLD failures in a row trip the gateway's circuit
+        breaker for GATEWAY_COOLDOWN seconds. After the cooldown a single
+        further failure trips it again; a success resets it.
+        
+        Args:
+            url: Gateway URL that answered
+            elapsed: Seconds until it answered, or None if it failed
+        """
+        host = urlparse(url).netloc
+        if elapsed is None:
+            failures = self._gateway_failures.get(host, 0) + 1
+            if failures >= self.GATEWAY_FAILURE_THRESHOLD:
+                self._gateway_open_until[host] = time.monotonic() + self.GATEWAY_COOLDOWN
+                failures = self.GATEWAY_FAILURE_THRESHOLD - 1
+            self._gateway_failures[host] = failures
+        else:
+            self._gateway_failures.pop(host, None)
+        
+        sample = self.GATEWAY_RACE_TIMEOUT if elapsed is None else elapsed
+        previous = self._gateway_stats.get(host)
+        if previous is None:
+            self._gateway_stats[host] = sample
+        else:
+            self._gateway_stats[host] = previous + self.GATEWAY_STATS_WEIGHT * (sample - previous)
+    
+    def _get_cached_metadata(self, metadata_uri: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up previously fetched metadata in the disk cache.
+        
+        Args:
+            metadata_uri: URI the metadata was fetched from
+            
+        Returns:
+            Cached metadata or None on a miss
+        """
+        if self._meta_cache is None or not isinstance(metadata_uri, str):
+            return None
+        return self._meta_cache.get(metadata_uri)
+    
+    def _recently_failed(self, metadata_uri: str) -> bool:
+        """
+        Check whether a metadata URI failed within the last METADATA_FAILURE_CACHE_TTL.
+        
+        Args:
+            metadata_uri: URI to check
+            
+        Returns:
+            True if every gateway recently failed for this URI
+        """
+        if self._meta_cache is None or not isinstance(metadata_uri, str):
+            return False
+        return ("failed", metadata_uri) in self._meta_cache
+    
+    def _cache_metadata(self, metadata_uri: str, metadata: Optional[Dict[str, Any]]) -> None:
+        """
+        Persist fetched metadata in the disk cache.
+        
+        Content-addressed (ipfs://, ar://) URIs never change, so they are kept
+        forever; other URIs expire after METADATA_HTTP_CACHE_TTL. A failed
+        fetch (None) is remembered for METADATA_FAILURE_CACHE_TTL so assets
+        sharing an unresolvable URI don't each wait out the gateway timeouts.
+        
+        Args:
+            metadata_uri: URI the metadata was fetched from
+            metadata: Parsed metadata, or None if the fetch failed
+        """
+        if self._meta_cache is None or not isinstance(metadata_uri, str):
+            return
+        if metadata is None:
+            self._meta_cache.set(("failed", metadata_uri), True, expire=self.METADATA_FAILURE_CACHE_TTL)
+            return
+        expire = None if metadata_uri.startswith(('ipfs://', 'ar://')) else self.METADATA_HTTP_CACHE_TTL
+        self._meta_cache.set(metadata_uri, metadata, expire=expire)
+    
+    def _metadata_urls(self, metadata_uri: str) -> List[str]:
+        """
+        Resolve a metadata URI to the HTTP URLs to try, in order.
+        
+        Args:
+            metadata_uri: IPFS, Arweave or HTTP(S) URI
+            
+        Returns:
+            Candidate URLs, empty for unsupported schemes
+        """
+        if not isinstance(metadata_uri, str):
+            return []
+        
+        # Handle IPFS URIs: try multiple IPFS gateways
+        if metadata_uri.startswith('ipfs://'):
+            ipfs_hash = metadata_uri[7:]
+            return [gateway + ipfs_hash for gateway in _IPFS_GATEWAYS]
+        
+        # Handle Arweave URIs
+        if metadata_uri.startswith('ar://'):
+            ar_hash = metadata_uri[5:]
+            return [f'https://arweave.net/{ar_hash}']
+        
+        # Handle HTTP/HTTPS URIs
+        if metadata_uri.startswith(('http://', 'https://')):
+            return [metadata_uri]
+        
+        return []
+    
     def _extract_image_from_metadata(self, metadata: Dict[str, Any]) -> str:
         """
         Extract image URL from parsed metadata.
@@ -493,18 +1354,14 @@ class NFTProcessor:
         Returns:
             Image URL or empty string
         """
-        # Common image field names in NFT metadata
-        image_fields = [
-            'image', 'image_url', 'imageUrl', 'image_uri', 'imageUri',
-            'image_data', 'imageData', 'img', 'img_url', 'imgUrl'
-        ]
+        # Some metadata URIs serve a JSON list or string rather than an object
+        if not isinstance(metadata, dict):
+            return ""
         
         # Priority 1: Direct image fields
-        for field in image_fields:
-            if field in metadata:
-                image_url = metadata[field]
-                if image_url and isinstance(image_url, str):
-                    return image_url
+        image_url = _first_str_field(metadata, _IMAGE_FIELDS, _IMAGE_FIELD_SET)
+        if image_url:
+            return image_url
         
         # Priority 2: Check nested structures
         if 'properties' in metadata:
@@ -524,11 +1381,9 @@ class NFTProcessor:
                                         return uri
                 
                 # Check properties.image
-                for field in image_fields:
-                    if field in properties:
-                        image_url = properties[field]
-                        if image_url and isinstance(image_url, str):
-                            return image_url
+                image_url = _first_str_field(properties, _IMAGE_FIELDS, _IMAGE_FIELD_SET)
+                if image_url:
+                    return image_url
         
         # Priority 3: Check attributes for image data
         if 'attributes' in metadata:
@@ -542,34 +1397,8 @@ class NFTProcessor:
                             if value and isinstance(value, str) and value.startswith(('http://', 'https://', 'ipfs://', 'ar://')):
                                 return value
         
-        # Priority 4: Recursive search through the entire metadata
-        def search_recursive(obj, max_depth=3, current_depth=0):
-            if current_depth >= max_depth:
-                return None
-            
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    # Check if this key looks like an image field
-                    if key.lower() in [field.lower() for field in image_fields]:
-                        if isinstance(value, str) and value:
-                            # Check if it looks like a URL
-                            if value.startswith(('http://', 'https://', 'ipfs://', 'ar://')):
-                                return value
-                    
-                    # Recursively search nested objects
-                    result = search_recursive(value, max_depth, current_depth + 1)
-                    if result:
-                        return result
-                        
-            elif isinstance(obj, list):
-                for item in obj:
-                    result = search_recursive(item, max_depth, current_depth + 1)
-                    if result:
-                        return result
-            
-            return None
-        
-        found_url = search_recursive(metadata)
+        # Priority 4: Search through the entire metadata
+        found_url = _find_nested_string(metadata, _is_image_field_url)
         if found_url:
             return found_url
         
@@ -590,10 +1419,11 @@ class NFTProcessor:
                 "downloaded_files": len(downloaded_files),
                 "available_space_gb": round(available_space / (1024**3), 2),
                 "total_space_gb": round(total_space / (1024**3), 2),
-                "output_directory": str(self.file_manager.output_dir)
+                "output_directory": str(self.file_manager.output_dir),
+                "metadata_refetches": self._metadata_refetch_count
             }
         except Exception as e:
-            self.logger.error(f"Failed to get processing stats: {str(e)}")
+            self.logger.error("Failed to get processing stats: %s", e)
             return {}
     
     def validate_wallet_address(self) -> bool:
@@ -633,35 +1463,113 @@ class NFTProcessor:
             Number of files removed
         """
         try:
-            current_nfts = set()
-            
             # DAS API returns data in a specific format with 'items' array
             assets = nft_data.get("items", []) if isinstance(nft_data, dict) else []
             
-            for asset in assets:
-                asset_id = asset.get("id", "")
-                name = asset.get("content", {}).get("metadata", {}).get("name", "")
-                image_url = self._extract_image_url(asset)
-                
-                if image_url:
-                    filename = self.file_manager._generate_safe_filename(name, asset_id, asset_id, image_url)
-                    current_nfts.add(filename)
+            # Image URL extraction may fetch metadata, so resolve assets concurrently
+            with ThreadPoolExecutor(max_workers=self.CLEANUP_WORKERS) as executor:
+                resolutions = list(executor.map(self._resolve_cleanup_filename, assets))
+            current_nfts = {filename for filename, _ in resolutions if filename}
+            
+            # An asset whose metadata could not be fetched may still own a file, so keep it
+            unresolved_stems = {
+                self._asset_file_stem(asset)
+                for asset, (_, resolved) in zip(assets, resolutions)
+                if not resolved
+            }
+            if unresolved_stems:
+                self.logger.warning("Keeping files of %d assets whose metadata could not be resolved", len(unresolved_stems))
             
             downloaded_files = set(self.file_manager.list_downloaded_files())
-            orphaned_files = downloaded_files - current_nfts
+            orphaned_files = {
+                filename for filename in downloaded_files - current_nfts
+                if os.path.splitext(filename)[0] not in unresolved_stems
+            }
             
-            removed_count = 0
-            for filename in orphaned_files:
-                try:
-                    file_path = self.file_manager.output_dir / filename
-                    file_path.unlink()
-                    removed_count += 1
-                    self.logger.info(f"Removed orphaned file: {filename}")
-                except Exception as e:
-                    self.logger.error(f"Failed to remove orphaned file {filename}: {str(e)}")
+            # Overlap unlink round trips, which dominate on network and external drives
+            base = str(self.file_manager.output_dir)
+            paths = [os.path.join(base, filename) for filename in orphaned_files]
+            with ThreadPoolExecutor(max_workers=self.UNLINK_WORKERS) as executor:
+                outcomes = list(executor.map(_safe_unlink, paths))
+            
+            removed = [os.path.basename(path) for path, ok, _ in outcomes if ok]
+            failures = [f"{os.path.basename(path)} ({error})" for path, ok, error in outcomes if not ok]
+            # Joining long file lists is only worth it when the record is emitted
+            if removed and self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Removed %d orphaned files: %s", len(removed), ', '.join(sorted(removed)))
+            if failures:
+                self.logger.error("Failed to remove %d orphaned files: %s", len(failures), '; '.join(sorted(failures)))
             
-            return removed_count
+            return len(removed)
             
         except Exception as e:
-            self.logger.error(f"Failed to cleanup orphaned files: {str(e)}")
-            return 0 
\ No newline at end of file
+            self.logger.error("Failed to cleanup orphaned files: %s", e)
+            return 0
+    
+    def _resolve_cleanup_filename(self, asset: Dict[str, Any]) -> Tuple[Optional[str], bool]:
+        """
+        Resolve an asset's filename for cleanup, noting whether its image is known.
+        
+        Args:
+            asset: NFT asset data from Helius DAS API
+            
+        Returns:
+            (filename or None, False if the asset's image could not be determined)
+        """
+        try:
+            filename = self._asset_to_filename(asset)
+        except Exception as e:
+            self.logger.debug("Failed to resolve filename for asset %s: %s", asset.get("id", ""), e)
+            return None, False
+        return filename, bool(filename) or not self._metadata_unresolved(asset)
+    
+    def _asset_to_filename(self, asset: Dict[str, Any]) -> Optional[str]:
+        """
+        Get the local filename an asset's image is stored under.
+        
+        Args:
+            asset: NFT asset data from Helius DAS API
+            
+        Returns:
+            Filename, or None if the asset has no image URL
+        """
+        asset_id = asset.get("id", "")
+        name = asset.get("content", {}).get("metadata", {}).get("name", "")
+        image_url = self._extract_image_url(asset)
+        
+        if not image_url:
+            return None
+        return self.file_manager._generate_safe_filename(name, asset_id, asset_id, image_url)
+    
+    def _asset_file_stem(self, asset: Dict[str, Any]) -> str:
+        """
+        Get an asset's local filename without its URL-dependent extension.
+        
+        Args:
+            asset: NFT asset data from Helius DAS API
+            
+        Returns:
+            Filename stem shared by every image the asset could be stored as
+        """
+        asset_id = asset.get("id", "")
+        name = asset.get("content", {}).get("metadata", {}).get("name", "")
+        return os.path.splitext(self.file_manager._generate_safe_filename(name, asset_id, asset_id, ""))[0]
+    
+    def _metadata_unresolved(self, asset: Dict[str, Any]) -> bool:
+        """
+        Check whether an asset without an image URL just lacks one or its metadata fetch failed.
+        
+        Only the caches are consulted: fetched metadata is cached on success,
+        so a miss (or a remembered failure) means the image is unknown.
+        
+        Args:
+            asset: NFT asset data from Helius DAS API
+            
+        Returns:
+            True if the asset has a metadata URI that could not be fetched
+        """
+        metadata_uri = self._get_metadata_uri(asset)
+        if not metadata_uri:
+            return False
+        return self._recently_failed(metadata_uri) or self._get_cached_metadata(metadata_uri) is None
+
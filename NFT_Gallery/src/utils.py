@@ -1,17 +1,63 @@
 """
 Utility functions for Solana NFT Downloader.
 """
+import atexit
+import copy
+import functools
+import hashlib
 import os
+import platform
+import queue
+import random
 import sys
+import time
 import logging
-from typing import Optional, Dict, Any
+import logging.handlers
+import mmap
+from typing import Optional, Dict, Any, Tuple, Type
 from pathlib import Path
+from urllib.parse import urlparse
+
+# Read size for the pre-3.11 hashing loop; hashlib.file_digest manages its own buffer
+_HASH_CHUNK_SIZE = 1 << 20
+# Files up to this size are hashed from a memory map in one update() call
+_MMAP_HASH_LIMIT = 512 * 1024 * 1024
+
+# Characters invalid in filenames (ASCII control characters plus <>:"/\|?*), all mapped to '_'
+_INVALID_SET = frozenset([*map(chr, range(0x20)), *'<>:"/\\|?*'])
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys(_INVALID_SET, '_'))
+
+# Units for format_file_size, each 1024 (2**10) times the previous
+_SIZE_NAMES = ("B", "KB", "MB", "GB", "TB", "PB")
+
+# Common schemes whose URLs can be validated without a full parse
+_FAST_SCHEMES = ('http://', 'https://', 'ipfs://', 'ar://')
+
+# Home and working directory for get_system_info, captured once at import
+_HOME = str(Path.home())
+_CWD_AT_IMPORT = os.getcwd()
+
+# Shared by every handler setup_logging attaches
+_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# (level, log_file) the logger was last configured with, so repeat calls are no-ops
+_LOGGING_CONFIG: Optional[Tuple[str, Optional[str]]] = None
+
+# Background thread writing queued records to the log file, if one is configured
+_LOG_LISTENER: Optional[logging.handlers.QueueListener] = None
+
+# Last validate_environment result and the environment signature it was computed for
+_VALIDATION_CACHE: Optional[Tuple[Tuple[Any, ...], Dict[str, Any]]] = None
 
 
 def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> logging.Logger:
     """
     Setup logging configuration.
     
+    Calling again with the same level and log file returns the logger as is
+    instead of rebuilding its handlers. Log file writes happen on a background
+    QueueListener thread, so logging calls only enqueue the record.
+    
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional log file path
@@ -19,41 +65,87 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> loggin
     Returns:
         Configured logger instance
     """
+    global _LOGGING_CONFIG, _LOG_LISTENER
+    
     # Create logger
     logger = logging.getLogger("solana_nft_downloader")
-    logger.setLevel(getattr(logging, level.upper()))
     
-    # Clear existing handlers
-    logger.handlers.clear()
+    # Already configured this way: keep the existing handlers
+    level_name = level.upper()
+    config = (level_name, log_file)
+    if config == _LOGGING_CONFIG and logger.handlers and (not log_file or _LOG_LISTENER is not None):
+        return logger
     
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    num_level = getattr(logging, level_name)
+    logger.setLevel(num_level)
+    
+    # Clear existing handlers, flushing and closing any open log file
+    _stop_log_listener()
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers.clear()
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, level.upper()))
-    console_handler.setFormatter(formatter)
+    console_handler.setLevel(num_level)
+    console_handler.setFormatter(_FORMATTER)
     logger.addHandler(console_handler)
     
-    # File handler (if specified)
+    # File handler (if specified), fed through a queue so callers never block on disk
     if log_file:
         file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(getattr(logging, level.upper()))
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        file_handler.setLevel(num_level)
+        file_handler.setFormatter(_FORMATTER)
+        
+        log_queue: queue.Queue = queue.Queue(-1)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setLevel(num_level)
+        logger.addHandler(queue_handler)
+        
+        _LOG_LISTENER = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _LOG_LISTENER.start()
     
+    _LOGGING_CONFIG = config
     return logger
 
 
-def validate_environment() -> Dict[str, Any]:
+def _stop_log_listener() -> None:
+    """Flush queued log records to the log file and close it."""
+    global _LOG_LISTENER
+    
+    if _LOG_LISTENER is None:
+        return
+    _LOG_LISTENER.stop()
+    for handler in _LOG_LISTENER.handlers:
+        handler.close()
+    _LOG_LISTENER = None
+
+
+atexit.register(_stop_log_listener)
+
+
+def validate_environment(force: bool = False, deep_check: bool = False) -> Dict[str, Any]:
     """
     Validate required environment variables and system requirements.
     
+    The result is reused while HELIUS_API_KEY, OUTPUT_DIR and the platform
+    are unchanged, so the output directory checks run once per process.
+    
+    Args:
+        force: Re-run every check even if a cached result exists
+        deep_check: Prove the output directory is writable by creating and
+            deleting a file, rather than trusting os.access (which can be
+            wrong on network filesystems)
+        
     Returns:
         Dictionary with validation results
     """
+    global _VALIDATION_CACHE
+    
+    signature = (os.getenv("HELIUS_API_KEY"), os.getenv("OUTPUT_DIR"), sys.platform, deep_check)
+    if not force and _VALIDATION_CACHE is not None and _VALIDATION_CACHE[0] == signature:
+        return copy.deepcopy(_VALIDATION_CACHE[1])
+    
     results = {
         "valid": True,
         "errors": [],
@@ -74,13 +166,17 @@ def validate_environment() -> Dict[str, Any]:
     output_dir = Path(os.getenv("OUTPUT_DIR", "~/Pictures/SolanaNFTs")).expanduser()
     try:
         output_dir.mkdir(parents=True, exist_ok=True)
-        test_file = output_dir / ".test_write"
-        test_file.write_text("test")
-        test_file.unlink()
+        if deep_check:
+            test_file = output_dir / ".test_write"
+            test_file.write_text("test")
+            test_file.unlink()
+        elif not os.access(output_dir, os.W_OK):
+            raise PermissionError("Permission denied")
     except Exception as e:
         results["valid"] = False
         results["errors"].append(f"Cannot write to output directory {output_dir}: {str(e)}")
     
+    _VALIDATION_CACHE = (signature, copy.deepcopy(results))
     return results
 
 
@@ -94,33 +190,51 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         Formatted size string
     """
-    if size_bytes == 0:
+    if size_bytes <= 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    import math
-    i = int(math.floor(math.log(size_bytes, 1024)))
-    p = math.pow(1024, i)
-    s = round(size_bytes / p, 2)
-    return f"{s} {size_names[i]}"
+    # Each unit is 10 more bits, so the exponent comes straight from the bit length
+    i = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_NAMES) - 1)
+    s = round(size_bytes / (1 << (i * 10)), 2)
+    return f"{s} {_SIZE_NAMES[i]}"
+
+
+@functools.lru_cache(maxsize=1)
+def _platform_info() -> Dict[str, str]:
+    """Platform details, queried once since they may shell out to uname."""
+    return {
+        "platform": platform.platform(),
+        "architecture": platform.architecture()[0],
+        "processor": platform.processor()
+    }
 
 
-def get_system_info() -> Dict[str, str]:
+def get_system_info(refresh: bool = False) -> Dict[str, str]:
     """
     Get system information for debugging.
     
+    Args:
+        refresh: Re-query the platform, home and current working directory
+            instead of returning the values captured at import
+    
     Returns:
         Dictionary with system information
     """
-    import platform
+    global _HOME, _CWD_AT_IMPORT
     
+    if refresh:
+        _platform_info.cache_clear()
+        _HOME = str(Path.home())
+        _CWD_AT_IMPORT = os.getcwd()
+    
+    info = _platform_info()
     return {
-        "platform": platform.platform(),
+        "platform": info["platform"],
         "python_version": sys.version,
-        "architecture": platform.architecture()[0],
-        "processor": platform.processor(),
-        "home_directory": str(Path.home()),
-        "current_working_directory": os.getcwd()
+        "architecture": info["architecture"],
+        "processor": info["processor"],
+        "home_directory": _HOME,
+        "current_working_directory": _CWD_AT_IMPORT
     }
 
 
@@ -134,9 +248,7 @@ def create_backup_filename(original_filename: str) -> str:
     Returns:
         Backup filename with timestamp
     """
-    from datetime import datetime
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     name, ext = os.path.splitext(original_filename)
     return f"{name}_backup_{timestamp}{ext}"
 
@@ -151,28 +263,35 @@ def is_valid_url(url: str) -> bool:
     Returns:
         True if valid URL, False otherwise
     """
+    # Fast path: a known scheme followed directly by a host character has both parts
+    # (brackets are left to urlparse, which rejects malformed IPv6 hosts)
+    if isinstance(url, str) and url.startswith(_FAST_SCHEMES):
+        if url.partition('://')[2][:1].isalnum() and '[' not in url and ']' not in url:
+            return True
+    
     try:
-        from urllib.parse import urlparse
         result = urlparse(url)
         return all([result.scheme, result.netloc])
     except Exception:
         return False
 
 
-def retry_on_failure(max_retries: int = 3, delay: float = 1.0):
+def retry_on_failure(max_retries: int = 3, delay: float = 1.0,
+                     retry_on: Tuple[Type[BaseException], ...] = (Exception,)):
     """
     Decorator to retry function on failure.
     
+    Waits grow exponentially from delay and are jittered by 0.5-1.5x so
+    concurrent workers failing together don't retry in lockstep.
+    
     Args:
         max_retries: Maximum number of retry attempts
-        delay: Delay between retries in seconds
+        delay: Base delay between retries in seconds
+        retry_on: Exception types worth retrying; anything else is raised immediately
         
     Returns:
         Decorated function
     """
-    import time
-    import functools
-    
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
@@ -181,10 +300,10 @@ def retry_on_failure(max_retries: int = 3, delay: float = 1.0):
             for attempt in range(max_retries + 1):
                 try:
                     return func(*args, **kwargs)
-                except Exception as e:
+                except retry_on as e:
                     last_exception = e
                     if attempt < max_retries:
-                        time.sleep(delay * (2 ** attempt))  # Exponential backoff
+                        time.sleep(delay * (1 << attempt) * (0.5 + random.random()))  # Jittered exponential backoff
                     else:
                         raise last_exception
             
@@ -205,12 +324,13 @@ def sanitize_filename(filename: str, max_length: int = 255) -> str:
     Returns:
         Sanitized filename
     """
-    import re
+    # Already-safe names (e.g. "<uuid>.png") are returned untouched
+    if (filename and len(filename) <= max_length and _INVALID_SET.isdisjoint(filename)
+            and filename[0] not in ' .' and filename[-1] not in ' .'):
+        return filename
     
-    # Remove or replace invalid characters
-    invalid_chars = '<>:"/\\|?*\x00-\x1f'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
+    # Replace invalid characters in a single pass
+    filename = filename.translate(_SANITIZE_TABLE)
     
     # Remove leading/trailing spaces and dots
     filename = filename.strip(' .')
@@ -228,27 +348,56 @@ def sanitize_filename(filename: str, max_length: int = 255) -> str:
     return filename
 
 
+def _new_hash(algorithm: str) -> Any:
+    """Create a hash object for a hashlib algorithm name, or "xxh3" via the optional xxhash package."""
+    if algorithm == "xxh3":
+        import xxhash
+        return xxhash.xxh3_64()
+    return hashlib.new(algorithm)
+
+
 def calculate_file_hash(file_path: Path, algorithm: str = "sha256") -> Optional[str]:
     """
     Calculate file hash.
     
+    "blake3" and "xxh3" are much faster than SHA-256 but need the optional
+    blake3 / xxhash packages; use them for local dedup, not integrity checks
+    (xxh3 is not cryptographic).
+    
     Args:
         file_path: Path to file
-        algorithm: Hash algorithm (md5, sha1, sha256)
+        algorithm: Hash algorithm (md5, sha1, sha256, blake3, xxh3)
         
     Returns:
         File hash or None if calculation fails
     """
-    import hashlib
-    
     if not file_path.exists():
         return None
     
     try:
-        hash_obj = hashlib.new(algorithm)
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+        if algorithm == "blake3":
+            import blake3
+            # Memory-maps the file and hashes its chunks in parallel
+            return blake3.blake3(max_threads=blake3.blake3.AUTO).update_mmap(str(file_path)).hexdigest()
+        
+        # Unbuffered, so reads go straight into the digest's own buffer
+        with open(file_path, "rb", buffering=0) as f:
+            size = os.fstat(f.fileno()).st_size
+            if 0 < size <= _MMAP_HASH_LIMIT:
+                # Hash the mapped pages directly, with no copies or Python-level loop
+                hash_obj = _new_hash(algorithm)
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    hash_obj.update(mapped)
+                return hash_obj.hexdigest()
+            
+            # Larger files are streamed to keep memory bounded
+            if sys.version_info >= (3, 11):
+                return hashlib.file_digest(f, functools.partial(_new_hash, algorithm)).hexdigest()
+            
+            hash_obj = _new_hash(algorithm)
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
                 hash_obj.update(chunk)
-        return hash_obj.hexdigest()
+            return hash_obj.hexdigest()
     except Exception:
-        return None 
\ No newline at end of file
+        return None
+ 
\ No newline at end of file
@@ -8,7 +8,10 @@ import logging
 from pathlib import Path
 
 # Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent / "src"))
+_HERE = Path(__file__).resolve().parent
+_SRC = str(_HERE / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
 
 from src.firestore_manager import FirestoreManager
 from src.file_manager import FileManager
@@ -51,12 +54,12 @@ def test_firestore_downloader():
         
         # Test 2: Get pending downloads
         logger.info("Testing pending downloads query...")
-        pending_docs = firestore_manager.get_nfts_by_download_status("pending", limit=5)
+        pending_docs = list(firestore_manager.get_nfts_by_download_status("pending", limit=5))
         logger.info(f"Found {len(pending_docs)} pending downloads")
         
         # Test 3: Get failed downloads
         logger.info("Testing failed downloads query...")
-        failed_docs = firestore_manager.get_nfts_by_download_status("failed", limit=5)
+        failed_docs = list(firestore_manager.get_nfts_by_download_status("failed", limit=5))
         logger.info(f"Found {len(failed_docs)} failed downloads")
         
         # Test 4: Test download progress
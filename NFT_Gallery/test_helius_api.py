@@ -3,19 +3,78 @@
 Simple test script to verify Helius API connectivity and permissions.
 """
 import os
+import re
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, List, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_HERE = Path(__file__).resolve().parent
+
+# One keep-alive session so the probes below share a single TLS connection
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+))
+
+# KEY=value lines of a .env file; comments and blank lines never match
+_ENV_RE = re.compile(rb'(?m)^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t\r]*$')
 
 def load_env_file():
-    """Load environment variables from .env file if it exists."""
-    env_file = Path(__file__).parent / ".env"
+    """Load environment variables from .env file if it exists, without overriding ones already set."""
+    env_file = _HERE / ".env"
     if env_file.exists():
-        with open(env_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key.strip()] = value.strip()
+        pairs = (
+            (key.decode(), value.decode())
+            for key, value in _ENV_RE.findall(env_file.read_bytes())
+        )
+        os.environ.update({key: value for key, value in pairs if key not in os.environ})
+
+def probe_basic_connectivity(base_url: str, params: dict) -> List[str]:
+    """Probe an NFT listing for an arbitrary address."""
+    response = SESSION.get(f"{base_url}/addresses/test/nfts", params=params, timeout=10)
+    return [f"   Status: {response.status_code}", f"   Response: {response.text[:200]}..."]
+
+def probe_known_wallet(base_url: str, params: dict) -> List[str]:
+    """Probe the NFT listing of a known wallet."""
+    test_wallet = "11111111111111111111111111111112"  # System Program
+    response = SESSION.get(f"{base_url}/addresses/{test_wallet}/nfts", params=params, timeout=10)
+    return [f"   Status: {response.status_code}", f"   Response: {response.text[:200]}..."]
+
+def probe_rpc_endpoint(base_url: str, params: dict) -> List[str]:
+    """Probe the JSON-RPC endpoint with getSlot."""
+    data = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "getSlot"
+    }
+    response = SESSION.post(f"{base_url}/rpc", params=params, json=data, timeout=10)
+    return [f"   Status: {response.status_code}", f"   Response: {response.text[:200]}..."]
+
+def probe_api_key_info(base_url: str, params: dict) -> List[str]:
+    """Show the response headers, which carry rate limit information."""
+    # Try to get some basic info about the API key
+    response = SESSION.get(f"{base_url}/addresses/test/nfts", params=params, timeout=10)
+    return [f"   Rate limit headers: {dict(response.headers)}"]
+
+# Probes in display order; they are independent, so they run concurrently
+PROBES = (
+    ("1️⃣ Testing basic connectivity...", probe_basic_connectivity),
+    ("2️⃣ Testing with known wallet...", probe_known_wallet),
+    ("3️⃣ Testing RPC endpoint...", probe_rpc_endpoint),
+    ("4️⃣ Checking API key information...", probe_api_key_info),
+)
+
+def run_probe(probe: Callable[[str, dict], List[str]], base_url: str, params: dict) -> Tuple[bool, List[str]]:
+    """Run one probe, turning an exception into an error line so other probes are unaffected."""
+    try:
+        return True, probe(base_url, params)
+    except Exception as e:
+        return False, [f"   ❌ Error: {e}"]
 
 def test_helius_api():
     """Test Helius API connectivity and permissions."""
@@ -31,50 +90,21 @@ def test_helius_api():
     print(f"🔑 Using API key: {api_key[:8]}...{api_key[-4:]}")
     
     base_url = "https://api.helius.xyz/v0"
+    params = {"api-key": api_key}
     
-    # Test 1: Basic connectivity
-    print("\n1️⃣ Testing basic connectivity...")
-    try:
-        response = requests.get(f"{base_url}/addresses/test/nfts?api-key={api_key}", timeout=10)
-        print(f"   Status: {response.status_code}")
-        print(f"   Response: {response.text[:200]}...")
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
-        return False
-    
-    # Test 2: Try with a known wallet
-    print("\n2️⃣ Testing with known wallet...")
-    test_wallet = "11111111111111111111111111111112"  # System Program
-    try:
-        response = requests.get(f"{base_url}/addresses/{test_wallet}/nfts?api-key={api_key}", timeout=10)
-        print(f"   Status: {response.status_code}")
-        print(f"   Response: {response.text[:200]}...")
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
+    with ThreadPoolExecutor(max_workers=len(PROBES)) as executor:
+        futures = [executor.submit(run_probe, probe, base_url, params) for _, probe in PROBES]
+        results = [future.result() for future in futures]
     
-    # Test 3: Try RPC endpoint
-    print("\n3️⃣ Testing RPC endpoint...")
-    try:
-        data = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "getSlot"
-        }
-        response = requests.post(f"{base_url}/rpc?api-key={api_key}", json=data, timeout=10)
-        print(f"   Status: {response.status_code}")
-        print(f"   Response: {response.text[:200]}...")
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
+    # Report in a fixed order regardless of which probe finished first
+    for (title, _), (ok, lines) in zip(PROBES, results):
+        print(f"\n{title}")
+        for line in lines:
+            print(line)
     
-    # Test 4: Check API key info
-    print("\n4️⃣ Checking API key information...")
-    try:
-        # Try to get some basic info about the API key
-        response = requests.get(f"{base_url}/addresses/test/nfts?api-key={api_key}", timeout=10)
-        headers = response.headers
-        print(f"   Rate limit headers: {dict(headers)}")
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
+    # Without basic connectivity the rest of the results are meaningless
+    if not results[0][0]:
+        return False
     
     print("\n📋 Summary:")
     print("   - If you see 401 errors: API key is invalid or expired")
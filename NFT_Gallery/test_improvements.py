@@ -7,7 +7,10 @@ import sys
 from pathlib import Path
 
 # Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent / "src"))
+_HERE = Path(__file__).resolve().parent
+_SRC = str(_HERE / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
 
 from src.file_manager import FileManager, FileManagerError
 from src.nft_processor import NFTProcessor, NFTProcessorError
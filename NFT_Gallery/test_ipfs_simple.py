@@ -2,8 +2,110 @@
 """
 Simple test script to verify IPFS metadata extraction functionality without API key.
 """
+import asyncio
+import time
+
+import aiohttp
 import requests
 
+# Public IPFS gateways, raced concurrently by fetch_ipfs
+IPFS_GATEWAYS = (
+    'https://ipfs.io/ipfs/',
+    'https://cloudflare-ipfs.com/ipfs/',
+    'https://gateway.pinata.cloud/ipfs/',
+    'https://dweb.link/ipfs/',
+    'https://nftstorage.link/ipfs/'
+)
+
+# Common image field names in NFT metadata, in priority order
+IMAGE_FIELDS_ORDER = (
+    'image', 'image_url', 'imageUrl', 'image_uri', 'imageUri',
+    'image_data', 'imageData', 'img', 'img_url', 'imgUrl'
+)
+IMAGE_FIELDS = frozenset(IMAGE_FIELDS_ORDER)
+
+# Fields that may hold a metadata URI on an asset and on its content, in priority order
+ASSET_URI_FIELDS_ORDER = ('token_uri', 'tokenUri', 'uri', 'metadata_uri')
+ASSET_URI_FIELDS = frozenset(ASSET_URI_FIELDS_ORDER)
+CONTENT_URI_FIELDS_ORDER = ('uri', 'metadata_uri', 'token_uri')
+CONTENT_URI_FIELDS = frozenset(CONTENT_URI_FIELDS_ORDER)
+
+SAMPLE_CID = "QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG"
+
+
+async def fetch_ipfs(cid, session, timeout=3):
+    """
+    Fetch IPFS content by requesting every gateway at once.
+    
+    The first 2xx response wins and the other requests are cancelled, so a
+    stalled gateway costs nothing instead of a full timeout.
+    
+    Args:
+        cid: IPFS content identifier (optionally followed by a path)
+        session: aiohttp session to fetch with
+        timeout: Per-gateway request timeout in seconds
+        
+    Returns:
+        Response body, or None if no gateway answered successfully
+    """
+    async def get(url):
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            response.raise_for_status()
+            return await response.read()
+    
+    pending = {asyncio.create_task(get(url)) for url in ipfs_urls(cid)}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+    
+    return None
+
+
+def ipfs_urls(cid):
+    """
+    Build the gateway URLs for an IPFS CID.
+    
+    Args:
+        cid: IPFS content identifier (optionally followed by a path)
+        
+    Returns:
+        One URL per gateway, in IPFS_GATEWAYS order
+    """
+    return [gateway + cid for gateway in IPFS_GATEWAYS]
+
+
+def first_str_field(obj, fields_order, fields):
+    """
+    Return the first non-empty string value among fields, in priority order.
+    
+    One set intersection with the dict's keys finds the fields present, so
+    only those are checked in order instead of testing every field name.
+    
+    Args:
+        obj: Dictionary to search (JSON lists and strings yield None)
+        fields_order: Field names in priority order
+        fields: The same field names as a frozenset
+        
+    Returns:
+        Field value, or None if no field holds a non-empty string
+    """
+    if not isinstance(obj, dict):
+        return None
+    common = fields & obj.keys()
+    if common:
+        for field in fields_order:
+            if field in common:
+                value = obj[field]
+                if value and isinstance(value, str):
+                    return value
+    return None
+
 
 def test_ipfs_gateway_handling():
     """Test IPFS gateway handling."""
@@ -19,26 +121,39 @@ def test_ipfs_gateway_handling():
     for uri in test_uris:
         print(f"\nTesting URI: {uri}")
         
-        # Convert IPFS URI to HTTP URLs
-        if uri.startswith('ipfs://'):
-            ipfs_hash = uri.replace('ipfs://', '')
-            gateways = [
-                f'https://ipfs.io/ipfs/{ipfs_hash}',
-                f'https://cloudflare-ipfs.com/ipfs/{ipfs_hash}',
-                f'https://gateway.pinata.cloud/ipfs/{ipfs_hash}',
-                f'https://dweb.link/ipfs/{ipfs_hash}',
-                f'https://nftstorage.link/ipfs/{ipfs_hash}'
-            ]
+        # Split off the scheme in one pass, then convert IPFS URI to HTTP URLs
+        scheme, _, rest = uri.partition('://')
+        if scheme == 'ipfs':
+            ipfs_hash = rest
+            gateways = ipfs_urls(ipfs_hash)
             print(f"  Converted to gateways: {gateways[:2]}...")  # Show first 2
             
-        elif uri.startswith('ar://'):
-            ar_hash = uri.replace('ar://', '')
+        elif scheme == 'ar':
+            ar_hash = rest
             arweave_url = f'https://arweave.net/{ar_hash}'
             print(f"  Converted to Arweave: {arweave_url}")
     
     print("\nIPFS Gateway conversion tests completed!")
 
 
+def test_ipfs_gateway_race():
+    """Test fetching a CID by racing the IPFS gateways."""
+    print("\nTesting IPFS Gateway Race...")
+    
+    async def race():
+        async with aiohttp.ClientSession() as session:
+            return await fetch_ipfs(SAMPLE_CID, session)
+    
+    start = time.monotonic()
+    body = asyncio.run(race())
+    elapsed = time.monotonic() - start
+    
+    if body is None:
+        print(f"  No gateway responded within the timeout ({elapsed:.2f}s)")
+    else:
+        print(f"  Fetched {len(body)} bytes from the fastest gateway in {elapsed:.2f}s")
+
+
 def test_metadata_parsing_logic():
     """Test metadata parsing logic with sample data."""
     print("\nTesting Metadata Parsing Logic...")
@@ -76,18 +191,10 @@ def test_metadata_parsing_logic():
     
     def extract_image_from_metadata(metadata):
         """Extract image URL from metadata."""
-        # Common image field names in NFT metadata
-        image_fields = [
-            'image', 'image_url', 'imageUrl', 'image_uri', 'imageUri',
-            'image_data', 'imageData', 'img', 'img_url', 'imgUrl'
-        ]
-        
         # Priority 1: Direct image fields
-        for field in image_fields:
-            if field in metadata:
-                image_url = metadata[field]
-                if image_url and isinstance(image_url, str):
-                    return image_url
+        image_url = first_str_field(metadata, IMAGE_FIELDS_ORDER, IMAGE_FIELDS)
+        if image_url:
+            return image_url
         
         # Priority 2: Check nested structures
         if 'properties' in metadata:
@@ -177,18 +284,14 @@ def test_metadata_uri_extraction():
             return metadata["uri"]
         
         # Priority 3: Check for token URI in various fields
-        for field in ["token_uri", "tokenUri", "uri", "metadata_uri"]:
-            if field in asset:
-                uri = asset[field]
-                if uri and isinstance(uri, str):
-                    return uri
+        uri = first_str_field(asset, ASSET_URI_FIELDS_ORDER, ASSET_URI_FIELDS)
+        if uri:
+            return uri
         
         # Priority 4: Check content for URI fields
-        for field in ["uri", "metadata_uri", "token_uri"]:
-            if field in content:
-                uri = content[field]
-                if uri and isinstance(uri, str):
-                    return uri
+        uri = first_str_field(content, CONTENT_URI_FIELDS_ORDER, CONTENT_URI_FIELDS)
+        if uri:
+            return uri
         
         return ""
     
@@ -207,6 +310,7 @@ def main():
     print("=== Testing IPFS Metadata Extraction (Simple) ===\n")
     
     test_ipfs_gateway_handling()
+    test_ipfs_gateway_race()
     test_metadata_parsing_logic()
     test_metadata_uri_extraction()
     
@@ -10,6 +10,10 @@ from unittest.mock import Mock, patch
 import responses
 import requests
 
+# Image bodies served by mock_image_response, shared by every request it answers
+FAKE_JPEG_BODY = b"fake-image-data"
+FAKE_PNG_BODY = b"fake-png-data"
+
 
 @pytest.fixture(scope="session")
 def test_data_dir():
@@ -144,14 +148,14 @@ def mock_image_response():
         rsps.add(
             responses.GET,
             "https://example.com/nft1.jpg",
-            body=b"fake-image-data",
+            body=FAKE_JPEG_BODY,
             status=200,
             content_type="image/jpeg"
         )
         rsps.add(
             responses.GET,
             "https://example.com/nft2.png",
-            body=b"fake-png-data",
+            body=FAKE_PNG_BODY,
             status=200,
             content_type="image/png"
         )
@@ -217,13 +221,30 @@ def pytest_configure(config):
     )
 
 
+# Markers for tests under unit/, integration/ and e2e/ directories, in priority order
+_DIRECTORY_MARKERS = (
+    ("unit", pytest.mark.unit),
+    ("integration", pytest.mark.integration),
+    ("e2e", pytest.mark.e2e)
+)
+
+
+def _marker_for_path(path):
+    """Return the marker for a test file's directory, or None."""
+    directories = set(path.parent.parts)
+    for name, marker in _DIRECTORY_MARKERS:
+        if name in directories:
+            return marker
+    return None
+
+
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers based on file location."""
+    # Resolve each test file's marker once rather than once per test
+    markers = {}
     for item in items:
-        # Add markers based on test file location
-        if "unit" in str(item.fspath):
-            item.add_marker(pytest.mark.unit)
-        elif "integration" in str(item.fspath):
-            item.add_marker(pytest.mark.integration)
-        elif "e2e" in str(item.fspath):
-            item.add_marker(pytest.mark.e2e) 
\ No newline at end of file
+        if item.path not in markers:
+            markers[item.path] = _marker_for_path(item.path)
+        marker = markers[item.path]
+        if marker is not None:
+            item.add_marker(marker) 
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Unit tests for the asyncio Helius API client.
+"""
+import asyncio
+import pytest
+from aiohttp import web
+from src.async_helius_api import AsyncHeliusAPIClient
+from src.helius_api import HeliusAPIError, HeliusRateLimitError
+
+
+async def _call_against(handler, call):
+    """Run call(client) against a local JSON-RPC server backed by handler."""
+    app = web.Application()
+    app.router.add_post("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        async with AsyncHeliusAPIClient("test-api-key") as client:
+            client._url = f"http://127.0.0.1:{port}/?api-key=test-api-key"
+            return await call(client)
+    finally:
+        await runner.cleanup()
+
+
+class TestAsyncHeliusAPIClient:
+    """Test cases for AsyncHeliusAPIClient."""
+
+    def test_init_invalid_api_key(self):
+        """Test initialization with invalid API key."""
+        with pytest.raises(HeliusAPIError, match="API key must be a non-empty string"):
+            AsyncHeliusAPIClient("")
+
+    def test_get_nft_metadata_invalid_id(self):
+        """Test asset ID validation happens before any request."""
+        client = AsyncHeliusAPIClient("test-api-key")
+
+        with pytest.raises(HeliusAPIError, match="Invalid asset ID format"):
+            asyncio.run(client.get_nft_metadata("not-valid"))
+
+    def test_gather_metadata(self):
+        """Test metadata for several assets is fetched concurrently and keyed by ID."""
+        async def handler(request):
+            body = await request.json()
+            return web.json_response({"jsonrpc": "2.0", "id": body["id"],
+                                      "result": {"id": body["params"]["id"]}})
+
+        asset_ids = ["test-asset-1", "test-asset-2", "test-asset-3"]
+        result = asyncio.run(_call_against(handler, lambda client: client.gather_metadata(asset_ids)))
+
+        assert result == {asset_id: {"id": asset_id} for asset_id in asset_ids}
+
+    def test_rpc_error(self):
+        """Test JSON-RPC errors map to the same messages as the sync client."""
+        async def handler(request):
+            body = await request.json()
+            return web.json_response({"jsonrpc": "2.0", "id": body["id"],
+                                      "error": {"code": -32602, "message": "Invalid params"}})
+
+        with pytest.raises(HeliusAPIError, match="Invalid parameters"):
+            asyncio.run(_call_against(handler, lambda client: client.get_nft_metadata("test-asset")))
+
+    def test_rate_limit_surfaces_retry_after(self):
+        """Test a 429 response raises HeliusRateLimitError with Retry-After."""
+        async def handler(request):
+            return web.Response(status=429, text="slow down", headers={"Retry-After": "7"})
+
+        with pytest.raises(HeliusRateLimitError) as exc_info:
+            asyncio.run(_call_against(handler, lambda client: client.get_nft_metadata("test-asset")))
+
+        assert exc_info.value.retry_after == 7
@@ -1,12 +1,15 @@
 """
 Unit tests for FileManager class.
 """
+import asyncio
 import pytest
 import tempfile
 import shutil
 from pathlib import Path
 from unittest.mock import Mock, patch, mock_open
+import aiohttp
 import requests
+from aiohttp import web
 from src.file_manager import FileManager, FileManagerError
 
 
@@ -166,6 +169,19 @@ class TestFileManager:
         assert (Path(temp_dir) / "test_image.jpg").exists()
         mock_get.assert_called_once_with("https://example.com/image.jpg", stream=True, timeout=30)
     
+    @patch('requests.get')
+    def test_download_image_streams_large_chunks(self, mock_get, file_manager, temp_dir):
+        """Test image bodies are streamed to disk in DOWNLOAD_CHUNK_SIZE chunks."""
+        mock_response = Mock()
+        mock_response.headers = {'content-type': 'image/png'}
+        mock_response.iter_content.return_value = [b"chunk1", b"chunk2"]
+        mock_get.return_value = mock_response
+        
+        assert file_manager.download_image("https://example.com/image.png", "test_image.png")
+        
+        mock_response.iter_content.assert_called_once_with(chunk_size=FileManager.DOWNLOAD_CHUNK_SIZE)
+        assert (Path(temp_dir) / "test_image.png").read_bytes() == b"chunk1chunk2"
+    
     @patch('requests.get')
     def test_download_image_http_error(self, mock_get, file_manager):
         """Test image download with HTTP error."""
@@ -193,6 +209,42 @@ class TestFileManager:
                 filename="test_image.jpg"
             )
     
+    def test_download_image_async(self, file_manager, temp_dir):
+        """Test images are downloaded and saved over a shared aiohttp session."""
+        png = b"\x89PNG\r\n\x1a\n" + b"0" * 100
+        
+        async def handler(request):
+            return web.Response(body=png, content_type="application/x-unknown")
+        
+        async def run():
+            app = web.Application()
+            app.router.add_get("/image", handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = runner.addresses[0][1]
+            try:
+                async with aiohttp.ClientSession() as session:
+                    return await file_manager.download_image_async(
+                        session, f"http://127.0.0.1:{port}/image", "test_image.png"
+                    )
+            finally:
+                await runner.cleanup()
+        
+        assert asyncio.run(run())
+        assert (Path(temp_dir) / "test_image.png").read_bytes() == png
+    
+    def test_download_image_async_timeout_message(self, file_manager):
+        """Test async timeouts are reported with a message naming the timeout."""
+        session = Mock()
+        session.get.side_effect = asyncio.TimeoutError()
+        
+        with pytest.raises(FileManagerError, match=r"timeout after 30s"):
+            asyncio.run(file_manager.download_image_async(session, "https://example.com/image.png", "test.png"))
+        
+        assert session.get.call_count == 3
+    
     def test_get_file_info(self, file_manager, temp_dir):
         """Test file information retrieval."""
         # Create test file
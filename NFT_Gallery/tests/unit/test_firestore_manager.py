@@ -1,16 +1,30 @@
 """
 Unit tests for Firestore manager.
 """
+import asyncio
 import pytest
 import os
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from datetime import datetime, timezone
-from src.firestore_manager import FirestoreManager, FirestoreManagerError
+from google.api_core.exceptions import FailedPrecondition
+from google.cloud import firestore
+from google.cloud.firestore_v1.base_aggregation import AggregationResult
+from src.firestore_manager import (
+    FirestoreManager, FirestoreManagerError, FirestoreClientPool, decode_raw_data, COMMIT_RETRY, ASYNC_COMMIT_RETRY,
+    TTLCache, get_firestore_client
+)
 
 
 class TestFirestoreManager:
     """Test cases for FirestoreManager class."""
     
+    @pytest.fixture(autouse=True)
+    def clear_shared_clients(self):
+        """Reset the shared client cache between tests."""
+        get_firestore_client.cache_clear()
+        yield
+        get_firestore_client.cache_clear()
+    
     @pytest.fixture
     def mock_firestore_client(self):
         """Mock Firestore client."""
@@ -87,21 +101,65 @@ class TestFirestoreManager:
             with pytest.raises(FirestoreManagerError, match="Failed to initialize Firestore client"):
                 FirestoreManager()
     
+    def test_init_with_client_pool(self, mock_firestore_client):
+        """Test initialization with multiple pooled clients."""
+        manager = FirestoreManager(project_id="test-project", pool_size=3)
+        assert len(manager.pool) == 3
+        assert mock_firestore_client.call_count == 3
+        assert manager.db is manager.pool.clients[0]
+    
+    def test_shared_client_reused_across_managers(self, mock_firestore_client):
+        """Test managers for the same database share one client."""
+        first = FirestoreManager(project_id="test-project")
+        second = FirestoreManager(project_id="test-project", collection_name="other")
+        
+        assert first.db is second.db
+        mock_firestore_client.assert_called_once()
+    
+    def test_init_with_rest_transport(self, mock_firestore_client):
+        """Test the REST transport builds a REST client rather than a gRPC one."""
+        with patch('src.firestore_manager.RestFirestoreClient') as mock_rest_client:
+            manager = FirestoreManager(project_id="test-project", transport="rest")
+        
+        mock_rest_client.assert_called_once_with(project="test-project", database="develop")
+        mock_firestore_client.assert_not_called()
+        assert manager.db == mock_rest_client.return_value
+    
+    def test_init_with_unknown_transport(self, mock_firestore_client):
+        """Test an unknown transport is rejected."""
+        with pytest.raises(FirestoreManagerError, match="Unsupported Firestore transport"):
+            FirestoreManager(project_id="test-project", transport="http3")
+    
+    def test_client_pool_round_robin(self):
+        """Test pooled clients are handed out in round-robin order."""
+        with patch('src.firestore_manager.firestore.Client', side_effect=[Mock(), Mock()]):
+            pool = FirestoreClientPool("test-project", "develop", pool_size=2)
+        
+        first, second = pool.clients
+        assert [pool.next_client() for _ in range(4)] == [first, second, first, second]
+    
+    def test_client_pool_invalid_size(self):
+        """Test pool rejects a non-positive size."""
+        with pytest.raises(FirestoreManagerError, match="pool_size must be at least 1"):
+            FirestoreClientPool("test-project", "develop", pool_size=0)
+    
     def test_store_nft_data_success(self, firestore_manager, sample_nft_data, mock_firestore_client):
         """Test successful NFT data storage."""
         mock_db = mock_firestore_client.return_value
         mock_collection = mock_db.collection.return_value
         mock_doc_ref = Mock()
         mock_collection.document.return_value = mock_doc_ref
+        mock_batch = mock_db.batch.return_value
         
         result = firestore_manager.store_nft_data("test-wallet", sample_nft_data)
         
         assert result == "test-asset-id-123"
-        mock_collection.document.assert_called_once_with("test-asset-id-123")
-        mock_doc_ref.set.assert_called_once()
+        mock_collection.document.assert_called_with("test-asset-id-123")
+        assert mock_batch.set.call_count == 2
+        mock_batch.commit.assert_called_once()
         
         # Verify the stored data structure
-        call_args = mock_doc_ref.set.call_args[0][0]
+        call_args = mock_batch.set.call_args_list[0][0][1]
         assert call_args["asset_id"] == "test-asset-id-123"
         assert call_args["wallet_address"] == "test-wallet"
         assert call_args["name"] == "Test NFT"
@@ -111,6 +169,32 @@ class TestFirestoreManager:
         assert call_args["compressed"] == False
         assert len(call_args["attributes"]) == 2
         assert call_args["collection"]["name"] == "Test Collection"
+        assert "raw_data" not in call_args
+        assert call_args["created_at"] == call_args["updated_at"] == call_args["last_synced"]
+        
+        # Verify the raw payload is stored compressed in the sibling collection
+        raw_doc = mock_batch.set.call_args_list[1][0][1]
+        assert decode_raw_data(raw_doc["raw"]) == sample_nft_data
+        mock_db.collection.assert_any_call("nfts_raw")
+    
+    def test_decode_raw_data_legacy_formats(self):
+        """Test raw payloads written by older versions still decode."""
+        assert decode_raw_data({"id": "test-123"}) == {"id": "test-123"}
+        assert decode_raw_data(b'{"id":"test-123"}') == {"id": "test-123"}
+        assert decode_raw_data(None) == {}
+    
+    def test_get_raw_nft_data_success(self, firestore_manager, mock_firestore_client):
+        """Test raw payload retrieval from the sibling collection."""
+        mock_db = mock_firestore_client.return_value
+        mock_collection = mock_db.collection.return_value
+        raw_doc = firestore_manager._build_raw_doc({"id": "test-123"}, datetime.now(timezone.utc))
+        mock_doc = Mock(exists=True)
+        mock_doc.get.side_effect = raw_doc.__getitem__
+        mock_collection.document.return_value.get.return_value = mock_doc
+        
+        assert firestore_manager.get_raw_nft_data("test-123") == {"id": "test-123"}
+        mock_collection.document.return_value.get.assert_called_once_with(field_paths=["raw"])
+        mock_doc.to_dict.assert_not_called()
     
     def test_store_nft_data_missing_id(self, firestore_manager):
         """Test NFT data storage with missing ID."""
@@ -142,6 +226,69 @@ class TestFirestoreManager:
         assert results["stored"] == 1
         assert results["failed"] == 0
         assert len(results["errors"]) == 0
+        # Document, raw payload and wallet summary share one commit
+        assert mock_db.batch.return_value.set.call_count == 3
+        mock_db.batch.return_value.commit.assert_called_once()
+        mock_doc_ref.set.assert_not_called()
+    
+    def test_store_wallet_nfts_commits_in_batches(self, firestore_manager, sample_nft_data, mock_firestore_client):
+        """Test wallet NFTs are committed in NFTS_PER_BATCH chunks."""
+        mock_db = mock_firestore_client.return_value
+        nfts_data = [
+            {**sample_nft_data, "id": f"test-asset-{i}"}
+            for i in range(FirestoreManager.NFTS_PER_BATCH + 1)
+        ]
+        
+        results = firestore_manager.store_wallet_nfts("test-wallet", nfts_data)
+        
+        assert results["stored"] == FirestoreManager.NFTS_PER_BATCH + 1
+        assert mock_db.batch.return_value.commit.call_count == 2
+        mock_db.batch.return_value.commit.assert_called_with(retry=COMMIT_RETRY)
+    
+    def test_store_wallet_nfts_commit_failure(self, firestore_manager, sample_nft_data, mock_firestore_client):
+        """Test a failed batch commit marks its NFTs as failed."""
+        mock_db = mock_firestore_client.return_value
+        mock_db.batch.return_value.commit.side_effect = Exception("Commit failed")
+        
+        results = firestore_manager.store_wallet_nfts("test-wallet", [sample_nft_data])
+        
+        assert results["stored"] == 0
+        assert results["failed"] == 1
+        assert "Commit failed" in results["errors"][0]
+        # The piggybacked summary was lost with the batch, so it is rewritten
+        summary_ref = mock_db.collection.return_value.document.return_value
+        assert summary_ref.set.call_args[0][0]["sync_status"] == "partial"
+    
+    def test_store_wallet_nfts_async(self, firestore_manager, sample_nft_data):
+        """Test async wallet storage commits through the async client."""
+        with patch('src.firestore_manager.firestore.AsyncClient') as mock_async_client:
+            mock_async_db = mock_async_client.return_value
+            mock_batch = mock_async_db.batch.return_value
+            mock_batch.commit = AsyncMock()
+            mock_summary_ref = mock_async_db.collection.return_value.document.return_value
+            mock_summary_ref.set = AsyncMock()
+            
+            results = asyncio.run(firestore_manager.store_wallet_nfts_async("test-wallet", [sample_nft_data]))
+        
+        assert results["stored"] == 1
+        assert results["failed"] == 0
+        mock_async_client.assert_called_once_with(project="test-project", database="develop")
+        assert mock_batch.set.call_count == 3
+        mock_batch.commit.assert_awaited_once_with(retry=ASYNC_COMMIT_RETRY)
+        mock_summary_ref.set.assert_not_awaited()
+    
+    def test_store_wallet_nfts_async_commit_failure(self, firestore_manager, sample_nft_data):
+        """Test a failed async commit marks its NFTs as failed."""
+        with patch('src.firestore_manager.firestore.AsyncClient') as mock_async_client:
+            mock_async_db = mock_async_client.return_value
+            mock_async_db.batch.return_value.commit = AsyncMock(side_effect=Exception("Commit failed"))
+            mock_async_db.collection.return_value.document.return_value.set = AsyncMock()
+            
+            results = asyncio.run(firestore_manager.store_wallet_nfts_async("test-wallet", [sample_nft_data]))
+        
+        assert results["stored"] == 0
+        assert results["failed"] == 1
+        assert "Commit failed" in results["errors"][0]
     
     def test_store_wallet_nfts_partial_failure(self, firestore_manager, sample_nft_data, mock_firestore_client):
         """Test wallet NFTs storage with partial failures."""
@@ -187,6 +334,46 @@ class TestFirestoreManager:
         assert result == {"asset_id": "test-123", "name": "Test NFT"}
         mock_collection.document.assert_called_once_with("test-123")
     
+    def test_get_nft_by_asset_id_served_from_cache(self, firestore_manager, mock_firestore_client):
+        """Test repeated reads hit the cache until the document is written."""
+        mock_doc_ref = mock_firestore_client.return_value.collection.return_value.document.return_value
+        mock_doc_ref.get.return_value = Mock(exists=True, to_dict=lambda: {"asset_id": "test-123", "name": "Test"})
+        
+        first = firestore_manager.get_nft_by_asset_id("test-123")
+        first["name"] = "Mutated"
+        second = firestore_manager.get_nft_by_asset_id("test-123")
+        
+        assert second == {"asset_id": "test-123", "name": "Test"}
+        assert mock_doc_ref.get.call_count == 1
+        
+        firestore_manager.update_nft_sync_status("test-123", "synced")
+        firestore_manager.get_nft_by_asset_id("test-123")
+        
+        assert mock_doc_ref.get.call_count == 2
+    
+    def test_ttl_cache_evicts_least_recently_used(self):
+        """Test the read cache evicts the least recently used entry when full."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+    
+    def test_get_nft_by_asset_id_cache_disabled(self, mock_firestore_client):
+        """Test a zero TTL always reads from Firestore."""
+        manager = FirestoreManager(project_id="test-project", read_cache_ttl=0)
+        mock_doc_ref = mock_firestore_client.return_value.collection.return_value.document.return_value
+        mock_doc_ref.get.return_value = Mock(exists=True, to_dict=lambda: {"asset_id": "test-123"})
+        
+        manager.get_nft_by_asset_id("test-123")
+        manager.get_nft_by_asset_id("test-123")
+        
+        assert mock_doc_ref.get.call_count == 2
+    
     def test_get_nft_by_asset_id_not_found(self, firestore_manager, mock_firestore_client):
         """Test NFT retrieval when not found."""
         mock_db = mock_firestore_client.return_value
@@ -202,6 +389,29 @@ class TestFirestoreManager:
         
         assert result is None
     
+    def test_get_nfts_by_asset_ids_success(self, firestore_manager, mock_firestore_client):
+        """Test bulk NFT retrieval skips missing documents."""
+        mock_db = mock_firestore_client.return_value
+        mock_db.get_all.return_value = [
+            Mock(id="test-1", exists=True, to_dict=lambda: {"asset_id": "test-1"}),
+            Mock(id="test-2", exists=False)
+        ]
+        
+        results = firestore_manager.get_nfts_by_asset_ids(["test-1", "test-2"])
+        
+        assert results == {"test-1": {"asset_id": "test-1"}}
+        mock_db.get_all.assert_called_once()
+    
+    def test_get_nfts_by_asset_ids_chunks_requests(self, firestore_manager, mock_firestore_client):
+        """Test bulk retrieval is split into get_all chunks."""
+        mock_db = mock_firestore_client.return_value
+        mock_db.get_all.return_value = []
+        asset_ids = [f"test-{i}" for i in range(FirestoreManager.GET_ALL_CHUNK_SIZE + 1)]
+        
+        firestore_manager.get_nfts_by_asset_ids(asset_ids)
+        
+        assert mock_db.get_all.call_count == 2
+    
     def test_get_nfts_by_wallet_success(self, firestore_manager, mock_firestore_client):
         """Test successful NFTs retrieval by wallet."""
         mock_db = mock_firestore_client.return_value
@@ -218,12 +428,42 @@ class TestFirestoreManager:
         ]
         mock_query.stream.return_value = mock_docs
         
-        results = firestore_manager.get_nfts_by_wallet("test-wallet", limit=1000)
+        results = list(firestore_manager.get_nfts_by_wallet("test-wallet", limit=1000))
         
         assert len(results) == 2
         assert results[0]["asset_id"] == "test-1"
         assert results[1]["asset_id"] == "test-2"
     
+    def test_get_nfts_by_wallet_is_lazy(self, firestore_manager, mock_firestore_client):
+        """Test NFTs are streamed rather than materialized up front."""
+        mock_db = mock_firestore_client.return_value
+        mock_query = Mock()
+        mock_db.collection.return_value.where.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.stream.return_value = iter([Mock(to_dict=lambda: {"asset_id": "test-1"})])
+        
+        results = firestore_manager.get_nfts_by_wallet("test-wallet")
+        
+        mock_query.stream.assert_not_called()
+        assert next(results) == {"asset_id": "test-1"}
+        mock_query.stream.assert_called_once()
+    
+    def test_get_nfts_by_wallet_with_projection(self, firestore_manager, mock_firestore_client):
+        """Test NFTs retrieval by wallet projects the requested fields."""
+        mock_db = mock_firestore_client.return_value
+        mock_collection = mock_db.collection.return_value
+        
+        mock_query = Mock()
+        mock_collection.where.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.select.return_value = mock_query
+        mock_query.stream.return_value = [Mock(to_dict=lambda: {"asset_id": "test-1"})]
+        
+        results = list(firestore_manager.get_nfts_by_wallet("test-wallet", fields=["asset_id"]))
+        
+        assert results == [{"asset_id": "test-1"}]
+        mock_query.select.assert_called_once_with(["asset_id"])
+    
     def test_search_nfts_with_filters(self, firestore_manager, mock_firestore_client):
         """Test NFT search with filters."""
         mock_db = mock_firestore_client.return_value
@@ -240,16 +480,31 @@ class TestFirestoreManager:
         ]
         mock_query.stream.return_value = mock_docs
         
-        results = firestore_manager.search_nfts(
+        results = list(firestore_manager.search_nfts(
             wallet_address="test-wallet",
             collection_name="Test Collection",
             compressed=False,
             limit=100
-        )
+        ))
         
         assert len(results) == 1
         assert results[0]["asset_id"] == "test-1"
     
+    def test_search_nfts_missing_index(self, firestore_manager, mock_firestore_client, caplog):
+        """Test a missing composite index is reported as a warning."""
+        mock_db = mock_firestore_client.return_value
+        mock_collection = mock_db.collection.return_value
+        mock_query = Mock()
+        mock_collection.where.return_value = mock_query
+        mock_query.where.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.stream.side_effect = FailedPrecondition("The query requires an index")
+        
+        results = list(firestore_manager.search_nfts(wallet_address="test-wallet", compressed=True))
+        
+        assert results == []
+        assert "firestore.indexes.json" in caplog.text
+    
     def test_update_nft_sync_status_success(self, firestore_manager, mock_firestore_client):
         """Test successful sync status update."""
         mock_db = mock_firestore_client.return_value
@@ -268,6 +523,116 @@ class TestFirestoreManager:
         assert "last_synced" in call_args
         assert "updated_at" in call_args
     
+    def test_update_download_status_downloading_increments_attempts(self, firestore_manager, mock_firestore_client):
+        """Test download attempts are incremented without reading the document."""
+        mock_db = mock_firestore_client.return_value
+        mock_collection = mock_db.collection.return_value
+        mock_doc_ref = Mock()
+        mock_collection.document.return_value = mock_doc_ref
+        
+        result = firestore_manager.update_download_status("test-123", "downloading")
+        
+        assert result is True
+        mock_doc_ref.get.assert_not_called()
+        call_args = mock_doc_ref.update.call_args[0][0]
+        assert call_args["download_status"] == "downloading"
+        assert call_args["download_attempts"] == firestore.Increment(1)
+    
+    def test_get_nfts_by_download_status_streams_with_ids(self, firestore_manager, mock_firestore_client):
+        """Test documents are streamed with their document ID added."""
+        mock_db = mock_firestore_client.return_value
+        mock_query = Mock()
+        mock_db.collection.return_value.where.return_value = mock_query
+        mock_query.where.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.stream.return_value = iter([Mock(id="test-1", to_dict=lambda: {"asset_id": "test-1"})])
+        
+        docs = firestore_manager.get_nfts_by_download_status("pending", "test-wallet")
+        
+        mock_query.stream.assert_not_called()
+        assert list(docs) == [{"asset_id": "test-1", "id": "test-1"}]
+    
+    def test_get_download_statistics_uses_aggregations(self, firestore_manager, mock_firestore_client):
+        """Test download statistics are computed with count/sum aggregations."""
+        mock_db = mock_firestore_client.return_value
+        mock_collection = mock_db.collection.return_value
+        
+        def aggregation(**values):
+            mock_aggregation = Mock()
+            mock_aggregation.sum.return_value = mock_aggregation
+            mock_aggregation.get.return_value = [[AggregationResult(alias, value) for alias, value in values.items()]]
+            return mock_aggregation
+        
+        mock_collection.count.return_value = aggregation(count=10)
+        status_aggregations = {
+            "pending": aggregation(count=5),
+            "downloading": aggregation(count=1),
+            "completed": aggregation(count=3, file_size=3072),
+            "failed": aggregation(count=1)
+        }
+        mock_collection.where.side_effect = lambda field, op, value: Mock(
+            count=Mock(return_value=status_aggregations[value])
+        )
+        
+        stats = firestore_manager.get_download_statistics()
+        
+        assert stats == {
+            "total_documents": 10,
+            "pending_downloads": 5,
+            "downloading": 1,
+            "completed_downloads": 3,
+            "failed_downloads": 1,
+            "total_file_size": 3072,
+            "download_success_rate": "30.0%"
+        }
+        mock_collection.stream.assert_not_called()
+    
+    def test_reset_download_status_for_assets(self, firestore_manager, mock_firestore_client):
+        """Test resetting specific assets clears the download fields."""
+        mock_db = mock_firestore_client.return_value
+        mock_batch = mock_db.batch.return_value
+        
+        count = firestore_manager.reset_download_status(asset_ids=["test-1", "test-2"])
+        
+        assert count == 2
+        assert mock_batch.update.call_count == 2
+        update_data = mock_batch.update.call_args[0][1]
+        assert update_data["download_status"] == "pending"
+        assert update_data["download_attempts"] == 0
+        assert update_data["local_file_path"] is None
+        assert "updated_at" in update_data
+        mock_batch.commit.assert_called_once()
+    
+    def test_reset_download_status_for_wallet_commits_in_batches(self, firestore_manager, mock_firestore_client):
+        """Test resetting a wallet commits every full batch plus the remainder."""
+        mock_db = mock_firestore_client.return_value
+        mock_query = Mock()
+        mock_db.collection.return_value.where.return_value = mock_query
+        mock_query.stream.return_value = [Mock() for _ in range(FirestoreManager.WRITE_BATCH_SIZE + 1)]
+        
+        count = firestore_manager.reset_download_status(wallet_address="test-wallet")
+        
+        assert count == FirestoreManager.WRITE_BATCH_SIZE + 1
+        mock_batch = mock_db.batch.return_value
+        assert mock_batch.update.call_count == FirestoreManager.WRITE_BATCH_SIZE + 1
+        assert mock_batch.commit.call_count == 2
+        mock_batch.commit.assert_called_with(retry=COMMIT_RETRY)
+    
+    def test_reset_download_status_for_wallet_partial_commit_failure(self, firestore_manager, mock_firestore_client):
+        """Test a failed batch commit reports only the committed resets and drops cached reads."""
+        mock_db = mock_firestore_client.return_value
+        mock_query = Mock()
+        mock_db.collection.return_value.where.return_value = mock_query
+        mock_query.stream.return_value = [Mock() for _ in range(FirestoreManager.WRITE_BATCH_SIZE * 2)]
+        mock_db.batch.return_value.commit.side_effect = [None, Exception("Commit failed")]
+        firestore_manager._read_cache.set("test-1", {"download_status": "completed"})
+        
+        count = firestore_manager.reset_download_status(wallet_address="test-wallet")
+        
+        assert count == FirestoreManager.WRITE_BATCH_SIZE
+        assert mock_db.batch.return_value.commit.call_count == 2
+        assert firestore_manager._read_cache.get("test-1") is None
+    
     def test_delete_nft_success(self, firestore_manager, mock_firestore_client):
         """Test successful NFT deletion."""
         mock_db = mock_firestore_client.return_value
@@ -278,16 +643,20 @@ class TestFirestoreManager:
         result = firestore_manager.delete_nft("test-123")
         
         assert result is True
-        mock_doc_ref.delete.assert_called_once()
+        mock_batch = mock_db.batch.return_value
+        mock_batch.delete.assert_any_call(mock_doc_ref)
+        assert mock_batch.delete.call_count == 2
+        mock_batch.commit.assert_called_once()
     
     def test_get_collection_stats_success(self, firestore_manager, mock_firestore_client):
         """Test successful collection statistics retrieval."""
         mock_db = mock_firestore_client.return_value
         mock_collection = mock_db.collection.return_value
         
-        # Mock query and stream
+        # Mock query and projected get
         mock_query = Mock()
         mock_collection.where.return_value = mock_query
+        mock_query.select.return_value = mock_query
         
         mock_docs = [
             Mock(to_dict=lambda: {
@@ -307,7 +676,7 @@ class TestFirestoreManager:
                 "created_at": datetime.now(timezone.utc)
             })
         ]
-        mock_query.stream.return_value = mock_docs
+        mock_query.get.return_value = mock_docs
         
         stats = firestore_manager.get_collection_stats("test-wallet")
         
@@ -316,12 +685,60 @@ class TestFirestoreManager:
         assert stats["compressed_count"] == 1
         assert stats["sync_status_counts"]["synced"] == 2
         assert len(stats["recent_additions"]) == 2
+        mock_query.select.assert_called_once_with(FirestoreManager.COLLECTION_STATS_FIELDS)
+    
+    def test_build_doc_data_trims_oversized_arrays(self, firestore_manager, sample_nft_data):
+        """Test oversized documents drop their large arrays instead of failing the write."""
+        sample_nft_data["content"]["metadata"]["attributes"] = [
+            {"trait_type": "padding", "value": "x" * 1000} for _ in range(1000)
+        ]
+        
+        doc_data = firestore_manager._build_doc_data("test-wallet", "test-123", sample_nft_data, datetime.now(timezone.utc))
+        
+        assert doc_data["attributes"] == []
+        assert doc_data["overflow_fields"] == list(FirestoreManager.OVERFLOW_FIELDS)
+        assert doc_data["name"] == "Test NFT"
+    
+    def test_store_wallet_nfts_rejects_oversized_raw_payload(self, firestore_manager, sample_nft_data, mock_firestore_client):
+        """Test an NFT whose raw payload cannot fit fails alone without sinking its batch."""
+        oversized = {**sample_nft_data, "id": "test-big", "blob": os.urandom(1_000_000).hex()}
+        
+        results = firestore_manager.store_wallet_nfts("test-wallet", [sample_nft_data, oversized])
+        
+        assert results["stored"] == 1
+        assert results["failed"] == 1
+        assert "exceeds" in results["errors"][0]
+    
+    def test_extract_all_defaults(self, firestore_manager):
+        """Test single-pass extraction falls back to defaults for missing sections."""
+        fields = firestore_manager._extract_all({"id": "test-123", "content": None})
+        
+        assert fields["name"] == "Unknown NFT"
+        assert fields["image_url"] == ""
+        assert fields["collection"] == {"name": "", "family": ""}
+        assert fields["compressed"] is False
+        assert fields["supply"] == 1
+        assert fields["token_standard"] == "Unknown"
     
     def test_extract_image_url_from_files(self, firestore_manager, sample_nft_data):
         """Test image URL extraction from files array."""
         image_url = firestore_manager._extract_image_url(sample_nft_data)
         assert image_url == "https://example.com/image.png"
     
+    def test_extract_image_url_skips_non_image_files(self, firestore_manager):
+        """Test files without an image mime type or URI are skipped."""
+        nft_data = {
+            "content": {
+                "files": [
+                    {"uri": "https://example.com/video.mp4", "mime": "video/mp4"},
+                    {"uri": "", "mime": "image/png"},
+                    {"uri": "https://example.com/image.gif", "mime": "IMAGE/GIF"}
+                ]
+            }
+        }
+        image_url = firestore_manager._extract_image_url(nft_data)
+        assert image_url == "https://example.com/image.gif"
+    
     def test_extract_image_url_from_links(self, firestore_manager):
         """Test image URL extraction from links."""
         nft_data = {
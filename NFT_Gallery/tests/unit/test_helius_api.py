@@ -1,10 +1,12 @@
 """
 Unit tests for Helius API client.
 """
+import json
 import pytest
+import requests
 import responses
 from unittest.mock import patch, MagicMock
-from src.helius_api import HeliusAPIClient, HeliusAPIError
+from src.helius_api import HeliusAPIClient, HeliusAPIError, HeliusRateLimitError
 
 
 class TestHeliusAPIClient:
@@ -16,6 +18,30 @@ class TestHeliusAPIClient:
         assert client.api_key == "test-api-key"
         assert client.timeout == 30
     
+    def test_init_mounts_pooled_retrying_adapter(self):
+        """Test the session uses a pooled adapter that retries transient failures."""
+        client = HeliusAPIClient("test-api-key")
+        adapter = client.session.get_adapter(HeliusAPIClient.BASE_URL)
+        
+        assert adapter._pool_maxsize == HeliusAPIClient.POOL_MAXSIZE
+        assert adapter.max_retries.total == HeliusAPIClient.MAX_RETRIES
+        assert 429 in adapter.max_retries.status_forcelist
+        assert "POST" in adapter.max_retries.allowed_methods
+    
+    def test_session_advertises_compression(self):
+        """Test the session asks for compressed responses."""
+        client = HeliusAPIClient("test-api-key")
+        
+        assert "gzip" in client.session.headers["Accept-Encoding"]
+    
+    def test_context_manager_closes_session(self):
+        """Test leaving the context manager closes the HTTP session."""
+        with patch("src.helius_api.requests.Session.close") as mock_close:
+            with HeliusAPIClient("test-api-key"):
+                mock_close.assert_not_called()
+        
+        mock_close.assert_called_once()
+    
     def test_init_invalid_api_key(self):
         """Test initialization with invalid API key."""
         with pytest.raises(HeliusAPIError, match="API key must be a non-empty string"):
@@ -36,6 +62,9 @@ class TestHeliusAPIClient:
         assert not client._is_valid_solana_address("")
         assert not client._is_valid_solana_address("invalid-address!")
         assert not client._is_valid_solana_address("0x1234567890abcdef")
+        assert not client._is_valid_solana_address("9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM\n")
+        assert not client._is_valid_solana_address("1" * 31)
+        assert not client._is_valid_solana_address("1" * 45)
     
     @responses.activate
     def test_get_nfts_by_owner_success(self):
@@ -111,6 +140,175 @@ class TestHeliusAPIClient:
         result = client.get_nft_metadata(asset_id)
         assert result == mock_response
     
+    def test_get_nft_metadata_cached(self):
+        """Test repeated metadata lookups for an asset reuse the cached result."""
+        client = HeliusAPIClient("test-api-key")
+        
+        with patch.object(client, "_make_request", return_value={"id": "test-asset-123"}) as mock_request:
+            first = client.get_nft_metadata("test-asset-123")
+            first["id"] = "mutated"
+            second = client.get_nft_metadata("test-asset-123")
+        
+        assert second == {"id": "test-asset-123"}
+        mock_request.assert_called_once_with("getAsset", {"id": "test-asset-123"})
+    
+    @responses.activate
+    def test_make_request_sends_json_rpc_envelope(self):
+        """Test requests POST a JSON-RPC envelope and return its result."""
+        client = HeliusAPIClient("test-api-key")
+        responses.add(
+            responses.POST,
+            "https://mainnet.helius-rpc.com/?api-key=test-api-key",
+            json={"jsonrpc": "2.0", "id": 1, "result": {"slot": 42}},
+            status=200
+        )
+        
+        result = client._make_request("getSlot", [])
+        
+        assert result == {"slot": 42}
+        body = json.loads(responses.calls[0].request.body)
+        assert body["jsonrpc"] == "2.0"
+        assert body["method"] == "getSlot"
+        assert body["id"] == 1
+        assert responses.calls[0].request.headers["Content-Type"] == "application/json"
+    
+    @responses.activate
+    def test_iter_assets_by_owner_streams_items(self):
+        """Test owner assets are decoded and yielded one item at a time."""
+        client = HeliusAPIClient("test-api-key")
+        responses.add(
+            responses.POST,
+            "https://mainnet.helius-rpc.com/?api-key=test-api-key",
+            json={"jsonrpc": "2.0", "result": {"total": 2, "items": [
+                {"id": "a", "content": {"metadata": {"name": "NFT A"}}, "royalty": {"percent": 0.05}},
+                {"id": "b", "content": {"metadata": {"name": "NFT B"}}, "royalty": {"percent": 0}}
+            ]}},
+            status=200
+        )
+        
+        items = list(client.iter_assets_by_owner("9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"))
+        
+        assert [item["id"] for item in items] == ["a", "b"]
+        assert items[0]["content"]["metadata"]["name"] == "NFT A"
+        assert isinstance(items[0]["royalty"]["percent"], float)
+    
+    @responses.activate
+    def test_iter_assets_by_owner_rpc_error(self):
+        """Test a JSON-RPC error in a streamed response raises."""
+        client = HeliusAPIClient("test-api-key")
+        responses.add(
+            responses.POST,
+            "https://mainnet.helius-rpc.com/?api-key=test-api-key",
+            json={"jsonrpc": "2.0", "error": {"code": -32602, "message": "bad owner"}},
+            status=200
+        )
+        
+        with pytest.raises(HeliusAPIError, match="Invalid parameters: bad owner"):
+            list(client.iter_assets_by_owner("9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"))
+    
+    @responses.activate
+    @pytest.mark.parametrize("body,expected", [
+        ({"jsonrpc": "2.0", "error": "rate limited"}, "API error unknown: rate limited"),
+        ([1, 2], "Invalid JSON-RPC response from API"),
+        ({"jsonrpc": "2.0", "result": None}, "Invalid JSON-RPC response from API"),
+        ({"jsonrpc": "2.0"}, "Invalid JSON-RPC response from API"),
+        ({"jsonrpc": "2.0", "result": None, "error": {"code": -32602, "message": "bad owner"}},
+         "Invalid parameters: bad owner"),
+    ])
+    def test_iter_assets_by_owner_unexpected_body(self, body, expected):
+        """Test failed streamed responses raise instead of looking like an empty wallet."""
+        client = HeliusAPIClient("test-api-key")
+        responses.add(
+            responses.POST,
+            "https://mainnet.helius-rpc.com/?api-key=test-api-key",
+            json=body,
+            status=200
+        )
+        
+        with pytest.raises(HeliusAPIError, match=expected):
+            list(client.iter_assets_by_owner("9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"))
+    
+    def test_make_batch_request_orders_results_by_id(self):
+        """Test batch responses are matched back to their calls by id."""
+        client = HeliusAPIClient("test-api-key")
+        batch_response = [
+            {"jsonrpc": "2.0", "id": 2, "result": {"page": 2}},
+            {"jsonrpc": "2.0", "id": 1, "result": {"page": 1}}
+        ]
+        
+        with patch.object(client, "_post", return_value=batch_response) as mock_post:
+            results = client._make_batch_request([("searchAssets", {"page": 1}), ("searchAssets", {"page": 2})])
+        
+        assert results == [{"page": 1}, {"page": 2}]
+        payload = mock_post.call_args[0][0]
+        assert [call["id"] for call in payload] == [1, 2]
+    
+    def test_make_batch_request_call_error(self):
+        """Test an error on one batch call raises."""
+        client = HeliusAPIClient("test-api-key")
+        batch_response = [{"jsonrpc": "2.0", "id": 1, "error": {"code": -32602, "message": "bad page"}}]
+        
+        with patch.object(client, "_post", return_value=batch_response):
+            with pytest.raises(HeliusAPIError, match="Invalid parameters: bad page"):
+                client._make_batch_request([("searchAssets", {"page": 1})])
+    
+    def test_get_all_assets_by_owner_stops_at_short_page(self):
+        """Test page fetching merges items and stops at the first short page."""
+        client = HeliusAPIClient("test-api-key")
+        owner_address = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
+        
+        with patch.object(client, "_make_batch_request", return_value=[
+            {"items": [{"id": "a"}, {"id": "b"}]},
+            {"items": [{"id": "c"}]},
+            {"items": []}
+        ]) as mock_batch:
+            result = client.get_all_assets_by_owner(owner_address, max_pages=3, limit=2)
+        
+        assert result == {"total": 3, "items": [{"id": "a"}, {"id": "b"}, {"id": "c"}]}
+        calls = mock_batch.call_args[0][0]
+        assert [params["page"] for _, params in calls] == [1, 2, 3]
+    
+    def test_get_assets_and_metadata_batches_uncached_mints(self):
+        """Test metadata for owned mints is fetched in batches, skipping cached ones."""
+        client = HeliusAPIClient("test-api-key")
+        owner_address = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
+        client._cache_metadata("a", {"id": "a", "cached": True})
+        
+        listing = {"items": [{"id": "a"}, {"id": "b"}, {"id": "c"}, {"id": "d"}]}
+        with patch.object(client, "get_nfts_by_owner", return_value=listing), \
+             patch.object(client, "_make_batch_request",
+                          side_effect=lambda calls: [{"id": params["id"]} for _, params in calls]) as mock_batch:
+            result = client.get_assets_and_metadata(owner_address, batch_size=2)
+        
+        assert list(result) == ["a", "b", "c", "d"]
+        assert result["a"] == {"id": "a", "cached": True}
+        assert result["d"] == {"id": "d"}
+        assert [[params["id"] for _, params in call.args[0]] for call in mock_batch.call_args_list] == [["b", "c"], ["d"]]
+    
+    @responses.activate
+    def test_get_token_metadata_batch_chunks_mints(self):
+        """Test mints are posted to the token-metadata endpoint in chunks."""
+        client = HeliusAPIClient("test-api-key")
+        client.TOKEN_METADATA_BATCH_SIZE = 2
+        mints = ["9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWW" + c for c in "MNP"]
+        url = "https://api.helius.xyz/v0/token-metadata?api-key=test-api-key"
+        responses.add(responses.POST, url, json=[{"account": mints[0]}, {"account": mints[1]}])
+        responses.add(responses.POST, url, json=[{"account": mints[2]}])
+        
+        result = client.get_token_metadata_batch(mints)
+        
+        assert [entry["account"] for entry in result] == mints
+        bodies = [json.loads(call.request.body) for call in responses.calls]
+        assert [body["mintAccounts"] for body in bodies] == [mints[:2], mints[2:]]
+        assert all(body["includeOffChain"] for body in bodies)
+    
+    def test_get_token_metadata_batch_invalid_mint(self):
+        """Test an invalid mint is rejected before any request."""
+        client = HeliusAPIClient("test-api-key")
+        
+        with pytest.raises(HeliusAPIError, match="Invalid asset ID format"):
+            client.get_token_metadata_batch(["not-a-mint"])
+    
     @responses.activate
     def test_search_assets_success(self):
         """Test successful asset search."""
@@ -197,6 +395,50 @@ class TestHeliusAPIClient:
         
         assert client.check_api_connectivity() is False
     
+    @pytest.mark.parametrize("code,expected", [
+        (-32603, "Internal server error: boom"),
+        (-32601, "Method not found: boom"),
+        (-32000, "API error -32000: boom"),
+    ])
+    def test_check_rpc_error_messages(self, code, expected):
+        """Test JSON-RPC error codes map to descriptive messages."""
+        with pytest.raises(HeliusAPIError, match=expected):
+            HeliusAPIClient._check_rpc_error({"error": {"code": code, "message": "boom"}})
+    
+    @pytest.mark.parametrize("body,expected", [
+        ([{"result": {}}], "Invalid JSON-RPC response from API"),
+        ("rate limited", "Invalid JSON-RPC response from API"),
+        ({"error": "rate limited"}, "API error unknown: rate limited"),
+    ])
+    def test_make_request_unexpected_body(self, body, expected):
+        """Test well-formed but unexpected JSON bodies raise HeliusAPIError."""
+        client = HeliusAPIClient("test-api-key")
+        
+        with patch.object(client, "_post", return_value=body):
+            with pytest.raises(HeliusAPIError, match=expected):
+                client._make_request("getSlot", [])
+    
+    def test_make_batch_request_non_object_element(self):
+        """Test a batch response element that is not an object raises HeliusAPIError."""
+        client = HeliusAPIClient("test-api-key")
+        
+        with patch.object(client, "_post", return_value=[{"jsonrpc": "2.0", "id": 1, "result": {}}, "oops"]):
+            with pytest.raises(HeliusAPIError, match="Invalid batch response from API"):
+                client._make_batch_request([("searchAssets", {"page": 1}), ("searchAssets", {"page": 2})])
+    
+    def test_check_api_connectivity_reuses_recent_success(self):
+        """Test a recent successful check is reused without another RPC."""
+        client = HeliusAPIClient("test-api-key")
+        
+        with patch.object(client, "_make_request", return_value=123) as mock_request:
+            assert client.check_api_connectivity() is True
+            assert client.check_api_connectivity() is True
+            
+            client._last_ok_at -= HeliusAPIClient.CONNECTIVITY_CACHE_TTL
+            assert client.check_api_connectivity() is True
+        
+        assert mock_request.call_count == 2
+    
     @responses.activate
     def test_make_request_http_error(self):
         """Test HTTP error handling."""
@@ -230,8 +472,38 @@ class TestHeliusAPIClient:
         """Test timeout error handling."""
         client = HeliusAPIClient("test-api-key", timeout=1)
         
-        with patch('requests.Session.get') as mock_get:
-            mock_get.side_effect = Exception("timeout")
+        with patch('requests.Session.post') as mock_post:
+            mock_post.side_effect = requests.exceptions.Timeout("timeout")
             
-            with pytest.raises(HeliusAPIError, match="Unexpected error"):
-                client.get_nfts_by_owner("test-wallet-123") 
\ No newline at end of file
+            with pytest.raises(HeliusAPIError, match="Request timeout after 1 seconds"):
+                client.get_nfts_by_owner("test-wallet-123")
+    
+    @responses.activate
+    def test_make_request_rate_limit_retry_after(self):
+        """Test a 429 surfaces the server's Retry-After delay."""
+        client = HeliusAPIClient("test-api-key")
+        responses.add(
+            responses.POST,
+            "https://mainnet.helius-rpc.com/?api-key=test-api-key",
+            status=429,
+            headers={"Retry-After": "7"}
+        )
+        
+        with pytest.raises(HeliusRateLimitError, match="Rate limit exceeded") as exc_info:
+            client.get_nfts_by_owner("test-wallet-123")
+        
+        assert exc_info.value.retry_after == 7.0
+    
+    @pytest.mark.parametrize("zone", ["GMT", "+0000", "-0000"])
+    def test_parse_retry_after_http_date_zones(self, zone):
+        """Test HTTP-date Retry-After values parse, including naive "-0000" dates."""
+        assert HeliusAPIClient._parse_retry_after(f"Wed, 21 Oct 2015 07:28:00 {zone}") == 0.0
+        assert HeliusAPIClient._parse_retry_after(f"Fri, 31 Dec 9999 23:59:59 {zone}") > 0
+    
+    def test_make_request_programming_error_not_masked(self):
+        """Test non-request errors propagate instead of being wrapped."""
+        client = HeliusAPIClient("test-api-key")
+        
+        with patch('requests.Session.post', side_effect=TypeError("bad argument")):
+            with pytest.raises(TypeError):
+                client.get_nfts_by_owner("test-wallet-123")
@@ -0,0 +1,457 @@
+"""
+Unit tests for the NFTProcessor metadata and download pipeline.
+"""
+import asyncio
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp
+import requests
+from aiohttp import web
+from urllib.parse import urlparse
+from unittest.mock import AsyncMock, Mock, patch
+from src.nft_processor import (
+    NFTProcessor, NFTProcessorError, _find_nested_string, _first_file_image_uri, _first_str_field,
+    _is_image_like_url, _loads_json, _safe_unlink
+)
+
+
+class TestNFTProcessorPipeline:
+    """Test cases for the metadata and download pipeline."""
+    
+    @pytest.fixture
+    def processor(self, monkeypatch, tmp_path):
+        """Create NFTProcessor backed by a temporary output directory."""
+        monkeypatch.setenv("HELIUS_API_KEY", "test-api-key")
+        return NFTProcessor("test-wallet", str(tmp_path / "nfts"), metadata_cache_dir=str(tmp_path / "metadata"))
+    
+    def test_process_wallet_runs_assets_concurrently(self, processor):
+        """Test assets are processed concurrently and tallied per outcome."""
+        assets = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+        processor.helius_client.get_nfts_by_owner = Mock(return_value={"items": assets})
+        in_flight = []
+        
+        async def process(session, asset):
+            in_flight.append(asset["id"])
+            await asyncio.sleep(0)
+            # Every asset has started before any of them finishes
+            assert len(in_flight) == len(assets)
+            if asset["id"] == "c":
+                raise NFTProcessorError("boom")
+            return asset["id"] == "a"
+        
+        with patch.object(processor, "_process_single_nft_async", side_effect=process):
+            results = processor.process_wallet()
+        
+        assert results["downloaded"] == 1
+        assert results["skipped"] == 1
+        assert results["failed"] == 1
+        assert results["errors"] == ["Failed to process NFT c: boom"]
+    
+    def test_process_wallet_inside_running_loop_points_to_async_api(self, processor):
+        """Test calling the sync entry point from a coroutine fails clearly instead of via asyncio.run."""
+        async def call_sync():
+            processor.process_wallet()
+        
+        with pytest.raises(NFTProcessorError, match="await process_wallet_async"):
+            asyncio.run(call_sync())
+    
+    def test_extract_image_url_async_falls_back_to_metadata(self, processor):
+        """Test off-chain metadata is fetched only when the asset has no inline image."""
+        asset = {"id": "a", "content": {"metadata": {"uri": "ipfs://QmHash"}}}
+        metadata = {"image": "https://example.com/a.png"}
+        
+        with patch.object(processor, "_fetch_metadata_async", new=AsyncMock(return_value=metadata)) as mock_fetch:
+            image_url = asyncio.run(processor._extract_image_url_async(Mock(), asset))
+        
+        assert image_url == "https://example.com/a.png"
+        mock_fetch.assert_awaited_once()
+    
+    def test_fetch_metadata_uses_pooled_session(self, processor):
+        """Test metadata is fetched through the processor's pooled session."""
+        adapter = processor._http.get_adapter("https://ipfs.io")
+        assert adapter._pool_maxsize == NFTProcessor.HTTP_POOL_MAXSIZE
+        assert adapter.max_retries.total == NFTProcessor.HTTP_MAX_RETRIES
+        # Raced gateway URLs are not retried; the race is the retry
+        for url in processor._metadata_urls("ipfs://QmHash"):
+            assert processor._http.get_adapter(url).max_retries.total == 0
+        
+        response = Mock()
+        response.content = b'{"image": "https://example.com/a.png"}'
+        with patch.object(processor._http, "get", return_value=response) as mock_get:
+            metadata = processor._fetch_metadata("https://example.com/a.json")
+        
+        assert metadata == {"image": "https://example.com/a.png"}
+        mock_get.assert_called_once_with("https://example.com/a.json", timeout=NFTProcessor.METADATA_TIMEOUT)
+    
+    def test_fetch_metadata_races_ipfs_gateways(self, processor):
+        """Test the fastest IPFS gateway wins and failing ones are tried last next time."""
+        def get_json(url, timeout):
+            if "dweb.link" in url:
+                # Answer after the failing gateways so their failures are recorded
+                time.sleep(0.05)
+                return {"image": "https://example.com/a.png"}
+            if "ipfs.io" in url:
+                time.sleep(0.2)
+                return {"image": "slow"}
+            raise requests.RequestException("gateway down")
+        
+        with patch.object(processor, "_get_metadata_json", side_effect=get_json):
+            metadata = processor._fetch_metadata("ipfs://QmHash")
+        
+        assert metadata == {"image": "https://example.com/a.png"}
+        ordered = processor._order_gateways(processor._metadata_urls("ipfs://QmHash"))
+        assert ordered.index("https://dweb.link/ipfs/QmHash") < ordered.index("https://cloudflare-ipfs.com/ipfs/QmHash")
+        assert processor._gateway_stats["cloudflare-ipfs.com"] == NFTProcessor.GATEWAY_RACE_TIMEOUT
+    
+    def test_gateway_circuit_breaker_skips_failing_gateway(self, processor):
+        """Test a gateway sits out races after repeated failures and rejoins on success."""
+        urls = processor._metadata_urls("ipfs://QmHash")
+        failing = "https://ipfs.io/ipfs/QmHash"
+        
+        for _ in range(NFTProcessor.GATEWAY_FAILURE_THRESHOLD - 1):
+            processor._record_gateway_latency(failing, None)
+        assert failing in processor._order_gateways(urls)
+        
+        processor._record_gateway_latency(failing, None)
+        assert failing not in processor._order_gateways(urls)
+        # Every gateway tripped still leaves something to try
+        assert processor._order_gateways([failing]) == [failing]
+        
+        processor._gateway_open_until.clear()
+        processor._record_gateway_latency(failing, 0.1)
+        assert "ipfs.io" not in processor._gateway_failures
+        assert failing in processor._order_gateways(urls)
+    
+    def test_fetch_metadata_async_races_ipfs_gateways(self, processor):
+        """Test the async race returns the first success and cancels slower gateways."""
+        cancelled = []
+        
+        async def get_json(session, url, timeout):
+            if "pinata" in url:
+                return {"image": "https://example.com/a.png"}
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+        
+        with patch.object(processor, "_get_metadata_json_async", side_effect=get_json):
+            metadata = asyncio.run(processor._fetch_metadata_async(Mock(), "ipfs://QmHash"))
+        
+        assert metadata == {"image": "https://example.com/a.png"}
+        assert len(cancelled) == 4
+
+    
+    def test_extract_image_url_is_cached_by_asset_id(self, processor):
+        """Test repeated extraction for an asset reuses the first result."""
+        asset = {"id": "a", "content": {"metadata": {"uri": "ipfs://QmHash"}}}
+        
+        with patch.object(processor, "_extract_image_url_from_metadata",
+                          return_value="https://example.com/a.png") as mock_extract:
+            assert processor._extract_image_url(asset) == "https://example.com/a.png"
+            assert processor._extract_image_url(asset) == "https://example.com/a.png"
+        
+        mock_extract.assert_called_once_with(asset)
+        assert processor._get_metadata_uri(asset) == "ipfs://QmHash"
+        assert processor._metadata_uri_cache == {"a": "ipfs://QmHash"}
+    
+    def test_bounded_put_is_safe_under_concurrent_writers(self, processor, monkeypatch):
+        """Test concurrent inserts from worker threads evict without errors and respect the bound."""
+        monkeypatch.setattr(NFTProcessor, "URL_CACHE_SIZE", 8)
+        
+        def fill(worker):
+            for i in range(2000):
+                processor._bounded_put(processor._metadata_uri_cache, f"{worker}-{i}", "ipfs://x")
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(fill, range(8)))
+        
+        assert len(processor._metadata_uri_cache) == 8
+    
+    def test_fetch_metadata_persists_across_processors(self, processor, tmp_path):
+        """Test fetched metadata is served from disk by a later processor."""
+        with patch.object(processor, "_request_metadata", return_value={"image": "https://example.com/a.png"}):
+            processor._fetch_metadata("ipfs://QmHash")
+        
+        later = NFTProcessor("test-wallet", str(tmp_path / "nfts"), metadata_cache_dir=str(tmp_path / "metadata"))
+        with patch.object(later, "_request_metadata") as mock_request:
+            assert later._fetch_metadata("ipfs://QmHash") == {"image": "https://example.com/a.png"}
+        
+        mock_request.assert_not_called()
+    
+    def test_fetch_metadata_remembers_failures_briefly(self, processor):
+        """Test an unresolvable URI is not re-requested until its failure entry expires."""
+        with patch.object(processor, "_request_metadata", return_value=None) as mock_request:
+            assert processor._fetch_metadata("ipfs://QmMissing") is None
+            assert processor._fetch_metadata("ipfs://QmMissing") is None
+        
+        mock_request.assert_called_once_with("ipfs://QmMissing")
+        assert processor._recently_failed("ipfs://QmMissing")
+        
+        processor._meta_cache.delete(("failed", "ipfs://QmMissing"))
+        with patch.object(processor, "_request_metadata", return_value={"image": "https://example.com/a.png"}):
+            assert processor._fetch_metadata("ipfs://QmMissing") == {"image": "https://example.com/a.png"}
+
+    
+    @pytest.mark.parametrize("external_url,expected", [
+        ("https://example.com/art/Piece.PNG?size=large", True),
+        ("https://arweave.net/abc123", True),
+        ("https://example.com/collection", False),
+    ])
+    def test_extract_inline_image_url_external_url_heuristics(self, processor, external_url, expected):
+        """Test external URLs are accepted by image extension or known image host."""
+        asset = {"id": "a", "content": {"metadata": {"external_url": external_url}}}
+        
+        assert (processor._extract_inline_image_url(asset) == external_url) is expected
+    
+    @pytest.mark.parametrize("body", [["https://example.com/a.png"], "https://example.com/a.png"])
+    def test_extract_image_from_metadata_ignores_non_object_bodies(self, processor, body):
+        """Test metadata served as a JSON list or string yields no image instead of raising."""
+        assert processor._extract_image_from_metadata(body) == ""
+        
+        asset = {"id": "a", "content": {"metadata": {"uri": "https://example.com/a.json"}}}
+        with patch.object(processor, "_fetch_metadata_async", new=AsyncMock(return_value=body)):
+            assert asyncio.run(processor._extract_image_url_async(Mock(), asset)) == ""
+    
+    def test_extract_image_from_metadata_matches_nested_keys_case_insensitively(self, processor):
+        """Test the recursive search finds image fields regardless of key case."""
+        metadata = {"name": "Test", "extra": {"media": {"IMAGEURL": "ipfs://QmImage"}}}
+        
+        assert processor._extract_image_from_metadata(metadata) == "ipfs://QmImage"
+    
+    def test_cleanup_orphaned_files_keeps_current_nfts(self, processor):
+        """Test only files not belonging to a current asset are removed."""
+        asset = {"id": "asset-1", "content": {"metadata": {"name": "Kept", "image": "https://example.com/a.png"}}}
+        kept = processor._asset_to_filename(asset)
+        output_dir = processor.file_manager.output_dir
+        (output_dir / kept).write_bytes(b"kept")
+        (output_dir / "orphan.png").write_bytes(b"orphan")
+        
+        assert processor.cleanup_orphaned_files({"items": [asset, {"id": "no-image"}]}) == 1
+        assert processor.file_manager.list_downloaded_files() == [kept]
+    
+    def test_cleanup_orphaned_files_keeps_files_of_failed_metadata(self, processor):
+        """Test a cached metadata failure leaves the asset's downloaded file in place."""
+        asset = {"id": "asset-1", "content": {"metadata": {"name": "Kept", "uri": "ipfs://QmDown"}}}
+        processor._cache_metadata("ipfs://QmDown", None)
+        output_dir = processor.file_manager.output_dir
+        kept = processor.file_manager._generate_safe_filename("Kept", "asset-1", "asset-1", "https://x.com/a.png")
+        (output_dir / kept).write_bytes(b"kept")
+        (output_dir / "orphan.png").write_bytes(b"orphan")
+        
+        with patch.object(processor, "_request_metadata") as mock_request:
+            assert processor.cleanup_orphaned_files({"items": [asset]}) == 1
+        
+        mock_request.assert_not_called()
+        assert processor.file_manager.list_downloaded_files() == [kept]
+    
+    def test_cleanup_orphaned_files_keeps_files_of_unresolved_assets(self, processor):
+        """Test gateway timeouts and resolution errors spare files instead of orphaning them."""
+        timed_out = {"id": "asset-1", "content": {"metadata": {"name": "Slow", "uri": "ipfs://QmSlow"}}}
+        broken = {"id": "asset-2", "content": {"metadata": {"name": "Broken", "uri": "ipfs://QmBroken"}}}
+        no_image = {"id": "asset-3", "content": {"metadata": {"name": "Gone"}}}
+        output_dir = processor.file_manager.output_dir
+        slow_file = processor.file_manager._generate_safe_filename("Slow", "asset-1", "asset-1", "https://x.com/a.gif")
+        broken_file = processor.file_manager._generate_safe_filename("Broken", "asset-2", "asset-2", "")
+        gone_file = processor.file_manager._generate_safe_filename("Gone", "asset-3", "asset-3", "")
+        for filename in (slow_file, broken_file, gone_file):
+            (output_dir / filename).write_bytes(b"image")
+        
+        extract_image_url = processor._extract_image_url
+        
+        def extract(asset):
+            if asset["id"] == "asset-2":
+                raise RuntimeError("boom")
+            return extract_image_url(asset)
+        
+        processor._meta_cache = None
+        with patch.object(processor, "_request_metadata", return_value=None), \
+                patch.object(processor, "_extract_image_url", side_effect=extract):
+            assert processor.cleanup_orphaned_files({"items": [timed_out, broken, no_image]}) == 1
+        
+        assert sorted(processor.file_manager.list_downloaded_files()) == sorted([slow_file, broken_file])
+    
+    def test_find_nested_string_respects_depth_and_order(self):
+        """Test the nested search returns the first match within max_depth levels."""
+        tree = {
+            "a": {"b": {"c": {"deep": "https://example.com/too-deep.png"}}},
+            "list": [{"first": "https://example.com/first.png"}],
+            "later": "https://example.com/later.png",
+        }
+        
+        assert _find_nested_string(tree, _is_image_like_url) == "https://example.com/first.png"
+        assert _find_nested_string(tree, _is_image_like_url, max_depth=1) == "https://example.com/later.png"
+        assert _find_nested_string({"a": {"b": {"c": {"deep": "https://x.com/a.png"}}}}, _is_image_like_url) is None
+    
+    def test_find_nested_string_handles_shared_and_cyclic_nodes(self):
+        """Test shared containers are rewalked only from shallower depths and cycles terminate."""
+        bundle = {"inner": {"image": "https://example.com/shared.png"}}
+        tree = {"deep": {"x": bundle}, "shallow": bundle}
+        assert _find_nested_string(tree, _is_image_like_url) == "https://example.com/shared.png"
+        
+        cyclic = {"name": "loop"}
+        cyclic["self"] = cyclic
+        assert _find_nested_string(cyclic, _is_image_like_url, max_depth=50) is None
+
+    
+    def test_inline_image_skips_metadata_refetch(self, processor):
+        """Test off-chain metadata is only fetched when no inline image exists."""
+        inline = {"id": "a", "content": {"links": {"image": "https://example.com/a.png"},
+                                         "metadata": {"uri": "ipfs://QmA"}}}
+        offchain = {"id": "b", "content": {"metadata": {"uri": "ipfs://QmB"}}}
+        
+        with patch.object(processor, "_fetch_metadata", return_value={"image": "https://example.com/b.png"}) as mock_fetch:
+            assert processor._extract_image_url(inline) == "https://example.com/a.png"
+            assert processor._extract_image_url(offchain) == "https://example.com/b.png"
+        
+        mock_fetch.assert_called_once_with("ipfs://QmB")
+        assert processor.get_processing_stats()["metadata_refetches"] == 1
+    
+    def test_get_failed_downloads_summary_classifies_errors(self, processor):
+        """Test failures are counted by error type, in keyword priority order, and by domain."""
+        processor._track_failed_download("A", "a", "https://img.example.com/a.png", "403 Forbidden: invalid json")
+        processor._track_failed_download("B", "b", "https://img.example.com/b.png", "Read TIMEOUT")
+        processor._track_failed_download("C", "c", "https://cdn.example.org/c.png", "something else")
+        
+        summary = processor.get_failed_downloads_summary()
+        
+        assert summary["error_counts"] == {"forbidden": 1, "timeout": 1, "unknown": 1}
+        assert summary["domain_counts"] == {"img.example.com": 2, "cdn.example.org": 1}
+    
+    def test_failed_downloads_report_uses_wall_clock_timestamps(self, processor):
+        """Test monotonic failure times are reported as epoch seconds."""
+        before = time.time()
+        processor._track_failed_download("A", "a", "https://img.example.com/a.png", "timeout")
+        after = time.time()
+        
+        report = processor.get_failed_downloads_report()
+        
+        assert len(report) == 1
+        assert before - 1 <= report[0]["timestamp"] <= after + 1
+    
+    def test_loads_json_falls_back_to_stdlib(self):
+        """Test bodies orjson rejects are still decoded by the stdlib parser."""
+        assert _loads_json(b'{"image": "ipfs://QmImage"}') == {"image": "ipfs://QmImage"}
+        assert _loads_json(b'\xef\xbb\xbf{"name": "NFT"}') == {"name": "NFT"}
+        
+        with pytest.raises(ValueError):
+            _loads_json(b"<html>not json</html>")
+    
+    def test_batch_shares_helius_client_and_session(self, monkeypatch, tmp_path):
+        """Test batch() reuses one client and session and reports per-wallet failures."""
+        monkeypatch.setenv("HELIUS_API_KEY", "test-api-key")
+        clients, sessions = set(), set()
+        
+        def get_nfts_by_owner(self, wallet_address):
+            clients.add(id(self))
+            if wallet_address == "bad-wallet":
+                raise NFTProcessorError("boom")
+            return {"items": []}
+        
+        original_init = NFTProcessor.__init__
+        
+        def tracking_init(self, *args, **kwargs):
+            original_init(self, *args, **kwargs)
+            sessions.add(id(self._http))
+        
+        with patch("src.nft_processor.HeliusAPIClient.get_nfts_by_owner", get_nfts_by_owner), \
+                patch.object(NFTProcessor, "__init__", tracking_init):
+            results = NFTProcessor.batch(["wallet-a", "wallet-b", "bad-wallet"], str(tmp_path / "nfts"),
+                                         metadata_cache_dir=None)
+        
+        assert results["wallet-a"]["total_nfts"] == 0
+        assert results["wallet-b"]["total_nfts"] == 0
+        assert "boom" in results["bad-wallet"]["error"]
+        assert len(clients) == 1
+        assert len(sessions) == 1
+    
+    def test_first_str_field_skips_empty_and_non_string_values(self):
+        """Test the first non-empty string field wins in priority order."""
+        metadata = {"image": "", "image_url": 42, "imageUrl": "https://example.com/a.png", "image_uri": "ipfs://x"}
+        
+        assert _first_str_field(metadata, ("image", "image_url", "imageUrl", "image_uri")) == "https://example.com/a.png"
+        assert _first_str_field(metadata, ("missing",)) is None
+        
+        # A precomputed field set gives the same priority-ordered result
+        fields = ("image_uri", "imageUrl")
+        assert _first_str_field(metadata, fields, frozenset(fields)) == "ipfs://x"
+        assert _first_str_field({"name": "x"}, fields, frozenset(fields)) is None
+        
+        # JSON lists and strings have no fields
+        assert _first_str_field(["image_uri"], fields, frozenset(fields)) is None
+        assert _first_str_field("image_uri", fields) is None
+    
+    def test_safe_unlink_reports_failures(self, tmp_path):
+        """Test unlink failures are returned instead of raised."""
+        existing = tmp_path / "orphan.png"
+        existing.write_bytes(b"orphan")
+        
+        assert _safe_unlink(str(existing)) == (str(existing), True, None)
+        assert not existing.exists()
+        
+        path, ok, error = _safe_unlink(str(tmp_path / "missing.png"))
+        assert not ok
+        assert error
+    
+    def test_first_file_image_uri_fast_path(self, processor):
+        """Test the first image file is used directly and other shapes fall back to the full scan."""
+        asset = {"content": {"files": [{"mime": "image/png", "uri": "https://example.com/a.png"}]}}
+        assert _first_file_image_uri(asset) == "https://example.com/a.png"
+        
+        fallback = {"content": {"files": [{"mime": "video/mp4", "uri": "https://example.com/a.mp4"},
+                                          {"mime": "IMAGE/JPEG", "uri": "https://example.com/b.jpg"}]}}
+        assert _first_file_image_uri(fallback) is None
+        assert _first_file_image_uri({"content": {"files": []}}) is None
+        assert processor._extract_inline_image_url(fallback) == "https://example.com/b.jpg"
+    
+    def test_prefetch_metadata_seeds_cache_from_helius_batch(self, processor):
+        """Test off-chain metadata resolved by Helius is cached and skips gateway fetches."""
+        mint = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
+        asset = {"id": mint, "content": {"metadata": {"uri": "ipfs://QmMeta"}}}
+        inline = {"id": "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWN",
+                  "content": {"links": {"image": "https://example.com/inline.png"}}}
+        processor.helius_client.get_token_metadata_batch = Mock(return_value=[
+            {"account": mint, "offChainMetadata": {"metadata": {"image": "https://example.com/a.png"}}}
+        ])
+        
+        asyncio.run(processor._prefetch_metadata([asset, inline]))
+        
+        processor.helius_client.get_token_metadata_batch.assert_called_once_with([mint])
+        with patch.object(processor, "_request_metadata") as mock_request:
+            assert processor._extract_image_url(asset) == "https://example.com/a.png"
+        mock_request.assert_not_called()
+    
+    def test_rate_limited_gateway_backs_off_and_ranks_lower(self, processor):
+        """Test a 429 honours Retry-After and pushes the gateway down the race order."""
+        hits = []
+        
+        async def handler(request):
+            hits.append(request.path)
+            return web.Response(status=429, headers={"Retry-After": "30"})
+        
+        async def run():
+            app = web.Application()
+            app.router.add_get("/meta.json", handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            url = f"http://127.0.0.1:{runner.addresses[0][1]}/meta.json"
+            try:
+                async with aiohttp.ClientSession() as session:
+                    assert await processor._race_metadata_urls_async(session, [url]) is None
+                    # Still backing off: fails fast without another request
+                    with pytest.raises(aiohttp.ClientError, match="rate limited"):
+                        await processor._get_metadata_json_async(session, url, 5)
+            finally:
+                await runner.cleanup()
+            return url
+        
+        url = asyncio.run(run())
+        
+        assert len(hits) == 1
+        # The 429 counts once towards the gateway's stats and circuit breaker
+        assert processor._gateway_failures[urlparse(url).netloc] == 1
+        assert processor._gateway_stats[urlparse(url).netloc] == NFTProcessor.GATEWAY_RACE_TIMEOUT
+        assert processor._order_gateways([url, "https://ipfs.io/ipfs/x"])[-1] == url
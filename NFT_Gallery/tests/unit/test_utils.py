@@ -1,6 +1,8 @@
 """
 Unit tests for utility functions.
 """
+import hashlib
+import logging.handlers
 import pytest
 import os
 import sys
@@ -8,6 +10,7 @@ import tempfile
 import shutil
 from pathlib import Path
 from unittest.mock import Mock, patch, mock_open
+from src import utils
 from src.utils import (
     setup_logging, validate_environment, format_file_size, get_system_info,
     create_backup_filename, is_valid_url, retry_on_failure, sanitize_filename,
@@ -25,6 +28,16 @@ class TestUtils:
         yield temp_dir
         shutil.rmtree(temp_dir, ignore_errors=True)
     
+    @pytest.fixture(autouse=True)
+    def clear_utils_caches(self, monkeypatch):
+        """Start each test without memoized environment or platform results."""
+        monkeypatch.setattr(utils, "_VALIDATION_CACHE", None)
+        monkeypatch.setattr(utils, "_LOGGING_CONFIG", None)
+        utils._platform_info.cache_clear()
+        yield
+        utils._platform_info.cache_clear()
+        utils._stop_log_listener()
+    
     def test_setup_logging_default(self):
         """Test logging setup with default parameters."""
         logger = setup_logging()
@@ -43,6 +56,27 @@ class TestUtils:
         assert len(logger.handlers) == 2  # Console and file handlers
         assert log_file.exists()
     
+    def test_setup_logging_file_writes_go_through_queue(self, temp_dir):
+        """Test file records are written by the queue listener and flushed on stop."""
+        log_file = Path(temp_dir) / "test.log"
+        logger = setup_logging(level="INFO", log_file=str(log_file))
+        
+        assert any(isinstance(handler, logging.handlers.QueueHandler) for handler in logger.handlers)
+        logger.info("queued %s", "message")
+        utils._stop_log_listener()
+        
+        assert "INFO - queued message" in log_file.read_text()
+    
+    def test_setup_logging_same_config_keeps_handlers(self, temp_dir):
+        """Test repeat calls with the same configuration don't rebuild handlers."""
+        log_file = str(Path(temp_dir) / "test.log")
+        logger = setup_logging(level="DEBUG", log_file=log_file)
+        handlers = list(logger.handlers)
+        
+        assert setup_logging(level="debug", log_file=log_file).handlers == handlers
+        assert setup_logging(level="DEBUG").handlers != handlers
+        assert len(logger.handlers) == 1
+    
     def test_setup_logging_custom_level(self):
         """Test logging setup with custom level."""
         logger = setup_logging(level="WARNING")
@@ -109,8 +143,13 @@ class TestUtils:
         assert format_file_size(1536) == "1.5 KB"
         assert format_file_size(1024 * 1024 + 512 * 1024) == "1.5 MB"
         
-        # Test large numbers (PB not supported in current implementation)
-        # assert format_file_size(1024 * 1024 * 1024 * 1024 * 1024) == "1.0 PB"
+        # Test large numbers, capped at PB
+        assert format_file_size(1024 * 1024 * 1024 * 1024 * 1024) == "1.0 PB"
+        assert format_file_size(1024 ** 6) == "1024.0 PB"
+        
+        # Test sizes just below a unit boundary
+        assert format_file_size(1023) == "1023.0 B"
+        assert format_file_size(1024 ** 5 - 1) == "1024.0 TB"
     
     @patch('platform.platform', return_value='macOS-15.5-arm64-arm-64bit')
     @patch('platform.architecture', return_value=('64bit', ''))
@@ -126,6 +165,47 @@ class TestUtils:
         assert "home_directory" in info
         assert "current_working_directory" in info
     
+    def test_get_system_info_refresh_requeries_cwd(self, temp_dir, monkeypatch):
+        """Test the working directory is cached unless a refresh is requested."""
+        # Restore the import-time values after the refresh below
+        monkeypatch.setattr(utils, "_HOME", utils._HOME)
+        monkeypatch.setattr(utils, "_CWD_AT_IMPORT", utils._CWD_AT_IMPORT)
+        cached = get_system_info()["current_working_directory"]
+        monkeypatch.chdir(temp_dir)
+        
+        assert get_system_info()["current_working_directory"] == cached
+        assert get_system_info(refresh=True)["current_working_directory"] == os.getcwd()
+    
+    def test_validate_environment_reuses_result_until_env_changes(self, temp_dir):
+        """Test the write probe runs once per environment unless forced."""
+        with patch.dict(os.environ, {'HELIUS_API_KEY': 'key', 'OUTPUT_DIR': temp_dir}), \
+                patch('pathlib.Path.mkdir') as mock_mkdir:
+            first = validate_environment()
+            first["errors"].append("mutated by caller")
+            assert validate_environment()["errors"] == []
+            assert mock_mkdir.call_count == 1
+            
+            validate_environment(force=True)
+            assert mock_mkdir.call_count == 2
+            
+            os.environ['HELIUS_API_KEY'] = 'other-key'
+            validate_environment()
+            assert mock_mkdir.call_count == 3
+    
+    def test_validate_environment_checks_write_access(self, temp_dir):
+        """Test an unwritable output directory is reported by the os.access check."""
+        with patch.dict(os.environ, {'HELIUS_API_KEY': 'key', 'OUTPUT_DIR': temp_dir}), \
+                patch('os.access', return_value=False) as mock_access:
+            results = validate_environment()
+            
+            assert results["valid"] is False
+            assert "Cannot write to output directory" in results["errors"][0]
+            mock_access.assert_called_once_with(Path(temp_dir), os.W_OK)
+            
+            # The deep check writes a real probe file instead
+            assert validate_environment(deep_check=True)["valid"] is True
+            assert not (Path(temp_dir) / ".test_write").exists()
+    
     def test_create_backup_filename(self):
         """Test backup filename creation."""
         # Test basic backup filename
@@ -158,6 +238,15 @@ class TestUtils:
         assert not is_valid_url("")
         assert not is_valid_url(None)
     
+    def test_is_valid_url_fast_path_matches_urlparse(self):
+        """Test the scheme fast path agrees with the full parse on edge cases."""
+        assert is_valid_url("ipfs://QmHash/metadata.json")
+        assert is_valid_url("ar://txid")
+        assert not is_valid_url("https://")
+        assert not is_valid_url("https:///path")
+        assert not is_valid_url("http://[::1")
+        assert is_valid_url("http://[::1]/x")
+    
     def test_retry_on_failure_success_first_try(self):
         """Test retry decorator with immediate success."""
         call_count = 0
@@ -205,6 +294,35 @@ class TestUtils:
         
         assert call_count == 3  # Initial call + 2 retries
     
+    def test_retry_on_failure_skips_non_retryable_errors(self):
+        """Test exceptions outside retry_on are raised without retrying."""
+        call_count = 0
+        
+        @retry_on_failure(max_retries=3, delay=0.1, retry_on=(ConnectionError,))
+        def test_function():
+            nonlocal call_count
+            call_count += 1
+            raise ValueError("not retryable")
+        
+        with patch('src.utils.time.sleep') as mock_sleep:
+            with pytest.raises(ValueError, match="not retryable"):
+                test_function()
+        
+        assert call_count == 1
+        mock_sleep.assert_not_called()
+    
+    def test_retry_on_failure_jitters_backoff(self):
+        """Test each wait is the exponential delay scaled by a 0.5-1.5 jitter."""
+        @retry_on_failure(max_retries=3, delay=1.0)
+        def test_function():
+            raise Exception("Persistent failure")
+        
+        with patch('src.utils.time.sleep') as mock_sleep, patch('src.utils.random.random', return_value=0.25):
+            with pytest.raises(Exception, match="Persistent failure"):
+                test_function()
+        
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.75, 1.5, 3.0]
+    
     def test_sanitize_filename(self):
         """Test filename sanitization."""
         # Test invalid characters
@@ -232,6 +350,15 @@ class TestUtils:
         sanitized = sanitize_filename('file\x00\x01name')
         assert sanitized == 'file__name'  # \x00 becomes _, \x01 becomes _
     
+    def test_sanitize_filename_fast_path(self):
+        """Test clean names are returned as-is while edge cases still get sanitized."""
+        clean = '3f2504e0-4f89-11d3-9a0c-0305e82c3301.png'
+        assert sanitize_filename(clean) is clean
+        
+        assert sanitize_filename('.hidden') == 'hidden'
+        assert sanitize_filename('name.') == 'name'
+        assert sanitize_filename('abcdefgh.png', max_length=8) == 'abcd.png'
+
     def test_calculate_file_hash_success(self, temp_dir):
         """Test file hash calculation."""
         # Create test file
@@ -243,6 +370,42 @@ class TestUtils:
         assert file_hash is not None
         assert len(file_hash) == 64  # SHA-256 hash length
     
+    def test_calculate_file_hash_matches_hashlib_for_large_file(self, temp_dir):
+        """Test hashing a file larger than one read chunk gives the standard digest."""
+        data = bytes(range(256)) * 8192  # 2 MiB
+        test_file = Path(temp_dir) / "large.bin"
+        test_file.write_bytes(data)
+        
+        assert calculate_file_hash(test_file) == hashlib.sha256(data).hexdigest()
+        assert calculate_file_hash(test_file, algorithm="md5") == hashlib.md5(data).hexdigest()
+        
+        # Above the memory-map limit the file is streamed instead
+        with patch('src.utils._MMAP_HASH_LIMIT', 1024):
+            assert calculate_file_hash(test_file) == hashlib.sha256(data).hexdigest()
+    
+    @pytest.mark.parametrize("algorithm", ["blake3", "xxh3"])
+    def test_calculate_file_hash_fast_dedup_backends(self, temp_dir, algorithm):
+        """Test the optional BLAKE3 and xxh3 backends match their libraries' digests."""
+        module = pytest.importorskip("blake3" if algorithm == "blake3" else "xxhash")
+        data = b"nft image bytes" * 100_000
+        test_file = Path(temp_dir) / "image.png"
+        test_file.write_bytes(data)
+        
+        expected = module.blake3(data).hexdigest() if algorithm == "blake3" else module.xxh3_64(data).hexdigest()
+        assert calculate_file_hash(test_file, algorithm=algorithm) == expected
+        
+        if algorithm == "xxh3":
+            # Streamed path for files above the memory-map limit
+            with patch('src.utils._MMAP_HASH_LIMIT', 1024):
+                assert calculate_file_hash(test_file, algorithm=algorithm) == expected
+    
+    def test_calculate_file_hash_empty_file(self, temp_dir):
+        """Test an empty file, which can't be memory-mapped, still hashes."""
+        test_file = Path(temp_dir) / "empty.bin"
+        test_file.write_bytes(b"")
+        
+        assert calculate_file_hash(test_file) == hashlib.sha256(b"").hexdigest()
+    
     def test_calculate_file_hash_nonexistent_file(self):
         """Test file hash calculation for non-existent file."""
         file_hash = calculate_file_hash(Path("nonexistent.txt"))